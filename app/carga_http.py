@@ -0,0 +1,261 @@
+"""
+Gerador de carga para a API HTTP (servidor_http.py)
+
+Simula vários terminais usando a API ao mesmo tempo: cada cliente é uma
+thread com sua própria conexão HTTP (keep-alive) que repete uma mistura de
+leituras e escritas. Ao final mostra a vazão e as latências por operação.
+
+Sem --url, sobe um servidor local em um banco temporário e mede contra ele,
+com um login próprio para a carga. Com --url, informe --email e --senha de
+um login existente: as escritas exigem uma sessão.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import secrets
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit, quote
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.connection_pool import ConnectionPool
+from bd.database import PERFIS_PRAGMA
+from bd.replica_memoria import ReplicaMemoria
+from dao.categoria_dao import CategoriaDAO
+from dao.login_dao import LoginDAO
+from dao.pessoa_dao import PessoaDAO
+from model.categoria import Categoria
+from model.Login import Login
+from model.pessoa import Pessoa
+from servidor_http import criarServidor
+
+
+class ClienteApi:
+    """Conexão HTTP persistente com a API"""
+
+    def __init__(self, host: str, porta: int, token: str | None = None):
+        self.conexao = http.client.HTTPConnection(host, porta, timeout=30)
+        self.token = token
+
+    def autenticar(self, email: str, senha: str):
+        """Abre uma sessão; as requisições seguintes levam o token"""
+        status, sessao = self.requisitar('POST', '/sessoes', {'email': email, 'senha': senha})
+        if status != 201:
+            raise RuntimeError(f"Falha ao autenticar {email}: {sessao}")
+        self.token = sessao['token']
+        return self.token
+
+    def requisitar(self, metodo: str, caminho: str, corpo=None):
+        dados = None if corpo is None else json.dumps(corpo).encode('utf-8')
+        cabecalhos = {'Content-Type': 'application/json'} if dados else {}
+        if self.token:
+            cabecalhos['Authorization'] = f"Bearer {self.token}"
+        self.conexao.request(metodo, caminho, body=dados, headers=cabecalhos)
+        resposta = self.conexao.getresponse()
+        conteudo = resposta.read()
+        return resposta.status, json.loads(conteudo) if conteudo else None
+
+    def fechar(self):
+        self.conexao.close()
+
+
+def criarLoginCarga(db):
+    """Cadastra, direto no banco local, a pessoa e o login que a carga usa para abrir a sessão"""
+    categoria = Categoria(id=None, nome="Carga")
+    CategoriaDAO(db).salvar(categoria)
+    email = "carga@escola.com"
+    pessoa = Pessoa(id=None, nome="Terminal de Carga", email=email, categoria=categoria)
+    PessoaDAO(db).salvar(pessoa)
+    senha = secrets.token_urlsafe(16)
+    LoginDAO(db).salvar(Login(id=None, email=email, senha=senha, usuario_id=pessoa.id))
+    return email, senha
+
+
+def popular(cliente: ClienteApi, pessoas: int, turmas: int):
+    """Cria os dados usados pela carga; retorna os ids criados"""
+    status, categoria = cliente.requisitar('POST', '/categorias', {'nome': f"Carga {time.time_ns()}"})
+    status, nivel = cliente.requisitar('POST', '/niveis', {'nome': f"Carga {time.time_ns()}"})
+
+    idsPessoas = []
+    for i in range(pessoas):
+        status, pessoa = cliente.requisitar('POST', '/pessoas', {
+            'nome': f"Aluno Carga {i}",
+            'email': f"carga{i}.{time.time_ns()}@escola.com",
+            'categoria_id': categoria['id'],
+        })
+        idsPessoas.append(pessoa['id'])
+
+    idsTurmas = []
+    for i in range(turmas):
+        status, turma = cliente.requisitar('POST', '/turmas', {
+            'horario': f"{8 + i % 12}:00",
+            'nivel_id': nivel['id'],
+            'professor': f"Professor Carga {i}",
+        })
+        idsTurmas.append(turma['id'])
+
+    return {'categoria': categoria['id'], 'nivel': nivel['id'], 'pessoas': idsPessoas, 'turmas': idsTurmas}
+
+
+def operacoes(dados: dict, proporcaoEscrita: float):
+    """Mistura de operações de um terminal: (nome, método, caminho, corpo)"""
+    def buscarPessoa():
+        return 'GET /pessoas/<id>', 'GET', f"/pessoas/{random.choice(dados['pessoas'])}", None
+
+    def listarPessoas():
+        return 'GET /pessoas', 'GET', "/pessoas?limite=20", None
+
+    def pesquisarPessoas():
+        return 'GET /pessoas?q=', 'GET', f"/pessoas?q={quote('carga ' + str(random.randint(0, 9)))}", None
+
+    def listarTurmas():
+        return 'GET /turmas', 'GET', "/turmas?limite=20", None
+
+    def buscarTurma():
+        return 'GET /turmas/<id>', 'GET', f"/turmas/{random.choice(dados['turmas'])}", None
+
+    def atualizarPessoa():
+        corpo = {'telefone': f"(11) 9{random.randint(0, 99999999):08d}"}
+        return 'PUT /pessoas/<id>', 'PUT', f"/pessoas/{random.choice(dados['pessoas'])}", corpo
+
+    def atualizarTurma():
+        corpo = {'horario': f"{random.randint(8, 21)}:00"}
+        return 'PUT /turmas/<id>', 'PUT', f"/turmas/{random.choice(dados['turmas'])}", corpo
+
+    leituras = [buscarPessoa, buscarPessoa, listarPessoas, pesquisarPessoas, listarTurmas, buscarTurma]
+    escritas = [atualizarPessoa, atualizarTurma]
+
+    def proxima():
+        grupo = escritas if random.random() < proporcaoEscrita else leituras
+        return random.choice(grupo)()
+
+    return proxima
+
+
+def executarCliente(host, porta, token, proxima, requisicoes, latencias, erros, lock):
+    cliente = ClienteApi(host, porta, token)
+    locais = {}
+    errosLocais = 0
+    try:
+        for _ in range(requisicoes):
+            nome, metodo, caminho, corpo = proxima()
+            inicio = time.perf_counter()
+            status, _ = cliente.requisitar(metodo, caminho, corpo)
+            locais.setdefault(nome, []).append(time.perf_counter() - inicio)
+            if status >= 400:
+                errosLocais += 1
+    finally:
+        cliente.fechar()
+
+    with lock:
+        for nome, valores in locais.items():
+            latencias.setdefault(nome, []).extend(valores)
+        erros[0] += errosLocais
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def medir(host, porta, email, senha, clientes, requisicoes, proporcaoEscrita, pessoas, turmas, aoPopular=None):
+    cliente = ClienteApi(host, porta)
+    try:
+        token = cliente.autenticar(email, senha)
+        dados = popular(cliente, pessoas, turmas)
+    finally:
+        cliente.fechar()
+    if aoPopular is not None:
+        aoPopular()
+
+    latencias = {}
+    erros = [0]
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=executarCliente,
+                         args=(host, porta, token, operacoes(dados, proporcaoEscrita), requisicoes,
+                               latencias, erros, lock))
+        for _ in range(clientes)
+    ]
+
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    total = clientes * requisicoes
+    print("=" * 72)
+    print(f"  CARGA: {clientes} terminais x {requisicoes} requisições "
+          f"({proporcaoEscrita:.0%} escritas)")
+    print("=" * 72)
+    print(f"{'Operação':<22} | {'Qtde':>6} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | {'média (ms)':>10}")
+    print("-" * 72)
+    for nome, valores in sorted(latencias.items()):
+        print(f"{nome:<22} | {len(valores):>6} | {percentil(valores, 0.50) * 1000:>9.2f} | "
+              f"{percentil(valores, 0.99) * 1000:>9.2f} | {statistics.mean(valores) * 1000:>10.2f}")
+    print("-" * 72)
+    print(f"Total: {total} requisições em {duracao:.2f}s = {total / duracao:.0f} req/s, {erros[0]} erro(s)")
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Gerador de carga para a API HTTP")
+    parser.add_argument('--url', default=None, help="API já em execução (ex.: http://127.0.0.1:8000)")
+    parser.add_argument('--email', default=None, help="login usado pela carga (obrigatório com --url)")
+    parser.add_argument('--senha', default=None, help="senha do login usado pela carga")
+    parser.add_argument('--clientes', type=int, default=8, help="terminais simultâneos")
+    parser.add_argument('--requisicoes', type=int, default=200, help="requisições por terminal")
+    parser.add_argument('--escritas', type=float, default=0.1, help="proporção de escritas (0 a 1)")
+    parser.add_argument('--pessoas', type=int, default=500, help="pessoas criadas antes da carga")
+    parser.add_argument('--turmas', type=int, default=50, help="turmas criadas antes da carga")
+    parser.add_argument('--conexoes', type=int, default=8, help="pool do servidor local")
+    parser.add_argument('--perfil', choices=list(PERFIS_PRAGMA), default='balanced',
+                        help="perfil de PRAGMA do servidor local")
+    parser.add_argument('--replica-segundos', type=float, default=None,
+                        help="servidor local lê as listagens de uma réplica em memória")
+    args = parser.parse_args()
+
+    if args.url:
+        if not args.email or not args.senha:
+            parser.error("--url exige --email e --senha de um login existente")
+        url = urlsplit(args.url)
+        medir(url.hostname, url.port or 80, args.email, args.senha, args.clientes, args.requisicoes,
+              args.escritas, args.pessoas, args.turmas)
+        return
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        pool = ConnectionPool(os.path.join(diretorio, 'carga.db'), tamanho=args.conexoes, perfil=args.perfil)
+        with pool.conexao():
+            pool.criarTabelas()
+            email, senha = criarLoginCarga(pool)
+        replica = None
+        if args.replica_segundos:
+            replica = ReplicaMemoria(pool.dbPath, intervalo=args.replica_segundos)
+        servidor = criarServidor(pool, porta=0, silencioso=True, replica=replica)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+        try:
+            host, porta = servidor.server_address[:2]
+            medir(host, porta, email, senha, args.clientes, args.requisicoes, args.escritas, args.pessoas, args.turmas,
+                  # A réplica já começa com os dados criados para a carga
+                  aoPopular=replica.atualizar if replica is not None else None)
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+            servidor.api.verificador.fechar()
+            if replica is not None:
+                replica.fechar()
+            pool.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -306,8 +306,9 @@ def main():
         # Limpar dados antigos
         limpar_banco(db)
         
-        # Criar dados de exemplo
-        dados = criar_dados_exemplo(db)
+        # Criar dados de exemplo em uma única transação (um commit só)
+        with db.transacao():
+            dados = criar_dados_exemplo(db)
         
         # Exibir resumo
         exibir_resumo(dados)
@@ -0,0 +1,144 @@
+"""
+Gerenciamento de sessões autenticadas com expiração (TTL)
+"""
+import sys
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from dao.sessao_dao import SessaoDAO
+from model.sessao import Sessao
+
+
+class GerenciadorSessoes:
+    """
+    Emite e valida tokens de sessão. Depois de um login bem-sucedido as ações
+    seguintes só apresentam o token: validarSessao() responde de um cache LRU
+    em memória e, se o token não estiver lá, faz uma única busca pela chave
+    primária da tabela sessao. Nenhum dos dois caminhos toca no hash da senha
+    nem na tabela pessoa.
+
+    Uma sessão fica no cache no máximo `revalidarApos` segundos sem ser lida
+    de novo do banco: sessões encerradas por outro processo (ex.: troca de
+    senha pela CLI) deixam de valer aqui depois desse intervalo.
+    """
+
+    def __init__(self, db: DatabaseConnection, ttl: float = 8 * 3600,
+                 capacidadeCache: int = 1024, intervaloVarredura: float = 60.0,
+                 revalidarApos: float = 5.0):
+        self.db = db
+        self.sessaoDao = SessaoDAO(db)
+        self.ttl = ttl
+        self.capacidadeCache = capacidadeCache
+        self.intervaloVarredura = intervaloVarredura
+        self.revalidarApos = revalidarApos
+        # token -> (Sessao, instante em que foi lida do banco)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._varredor = None
+
+    def _guardarNoCache(self, sessao: Sessao, lidaEm: float):
+        with self._lock:
+            self._cache[sessao.token] = (sessao, lidaEm)
+            self._cache.move_to_end(sessao.token)
+            while len(self._cache) > self.capacidadeCache:
+                self._cache.popitem(last=False)
+
+    def _removerDoCache(self, token: str):
+        with self._lock:
+            self._cache.pop(token, None)
+
+    def criarSessao(self, login):
+        """Cria uma sessão para um login já autenticado e retorna a Sessao com o token"""
+        agora = time.time()
+        sessao = Sessao(
+            token=secrets.token_urlsafe(32),
+            login_id=login.id,
+            usuario_id=login.usuario_id,
+            criada_em=agora,
+            expira_em=agora + self.ttl
+        )
+        self.sessaoDao.salvar(sessao)
+        self._guardarNoCache(sessao, agora)
+        return sessao
+
+    def validarSessao(self, token: str):
+        """Retorna a Sessao se o token for válido e não tiver expirado, senão None"""
+        agora = time.time()
+
+        sessao = None
+        with self._lock:
+            item = self._cache.get(token)
+            if item is not None and agora - item[1] < self.revalidarApos:
+                sessao = item[0]
+                self._cache.move_to_end(token)
+
+        if sessao is None:
+            sessao = self.sessaoDao.buscarPorToken(token)
+            if sessao is None:
+                self._removerDoCache(token)
+                return None
+            if not sessao.expirada(agora):
+                self._guardarNoCache(sessao, agora)
+
+        if sessao.expirada(agora):
+            self._removerDoCache(token)
+            return None
+        return sessao
+
+    def encerrarSessao(self, token: str):
+        """Logout: invalida o token no cache e no banco"""
+        self._removerDoCache(token)
+        return self.sessaoDao.deletar(token)
+
+    def encerrarSessoesDoLogin(self, loginId: int):
+        """Invalida todas as sessões de um login (troca de senha, remoção do login)"""
+        with self._lock:
+            for token in [t for t, (s, _) in self._cache.items() if s.login_id == loginId]:
+                del self._cache[token]
+        return self.sessaoDao.deletarPorLogin(loginId)
+
+    def varrerExpiradas(self, db: DatabaseConnection | None = None):
+        """Remove as sessões expiradas do cache e do banco; retorna quantas saíram do banco"""
+        agora = time.time()
+        with self._lock:
+            for token in [t for t, (s, _) in self._cache.items() if s.expirada(agora)]:
+                del self._cache[token]
+
+        sessaoDao = SessaoDAO(db) if db is not None else self.sessaoDao
+        return sessaoDao.deletarExpiradas(agora)
+
+    def iniciarVarredura(self):
+        """Inicia a thread que remove sessões expiradas a cada intervaloVarredura segundos"""
+        if self._varredor is not None:
+            return
+        self._parar.clear()
+        self._varredor = threading.Thread(target=self._executarVarredura, name='varredura-sessoes', daemon=True)
+        self._varredor.start()
+
+    def _executarVarredura(self):
+        # A thread usa uma conexão própria: a do DatabaseConnection principal
+        # só pode ser usada pela thread que a criou
+        db = DatabaseConnection(self.db.dbPath, perfil=self.db.perfil)
+        try:
+            while not self._parar.wait(self.intervaloVarredura):
+                try:
+                    self.varrerExpiradas(db)
+                except Exception as e:
+                    print(f"⚠️  Erro ao remover sessões expiradas: {e}")
+        finally:
+            db.fechar()
+
+    def parar(self):
+        """Encerra a thread de varredura"""
+        self._parar.set()
+        if self._varredor is not None:
+            self._varredor.join()
+            self._varredor = None
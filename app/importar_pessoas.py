@@ -0,0 +1,315 @@
+"""
+Importação em massa de pessoas a partir de arquivos CSV ou JSONL
+
+O arquivo é lido em fluxo e gravado em lotes: cada lote de `tamanhoLote`
+linhas válidas vira uma transação com executemany (PessoaDAO.salvarMuitos).
+A memória usada não depende do tamanho do arquivo. Linhas inválidas são
+relatadas com o número da linha e não interrompem a importação.
+
+Colunas: nome, email, categoria (nome da categoria), data_nascimento
+(AAAA-MM-DD, opcional) e telefone (opcional). No CSV a primeira linha é o
+cabeçalho; o separador (vírgula, ponto e vírgula ou tab) é detectado.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import string
+import sys
+import time
+from datetime import date
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection, PERFIS_PRAGMA, PERFIL_PADRAO, TAMANHO_LOTE_PADRAO
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+from model.pessoa import Pessoa, emailValido
+
+FORMATOS = ('csv', 'jsonl')
+
+# COLLATE NOCASE só ignora maiúsculas/minúsculas em letras ASCII
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class ErroLinha(Exception):
+    """Linha do arquivo rejeitada; a mensagem vai para o relatório"""
+
+
+def chaveEmail(email: str):
+    """Forma do email usada para detectar duplicados, igual à comparação do idx_pessoa_email_nocase"""
+    return email.translate(_NOCASE)
+
+
+def detectarFormato(caminho: str):
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extensao in ('.csv', '.txt'):
+        return 'csv'
+    raise ValueError(f"Formato não reconhecido para '{caminho}' (use .csv ou .jsonl)")
+
+
+def lerLinhas(arquivo, formato: str):
+    """Gera (número da linha, registro) lendo o arquivo aos poucos; registros ilegíveis vêm como ErroLinha"""
+    if formato == 'csv':
+        amostra = arquivo.read(8192)
+        arquivo.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+        except csv.Error:
+            dialeto = csv.excel
+        leitor = csv.DictReader(arquivo, dialect=dialeto)
+        for registro in leitor:
+            yield leitor.line_num, registro
+    else:
+        for numero, texto in enumerate(arquivo, start=1):
+            if not texto.strip():
+                continue
+            try:
+                registro = json.loads(texto)
+            except ValueError as e:
+                yield numero, ErroLinha(f"JSON inválido: {e}")
+                continue
+            if not isinstance(registro, dict):
+                yield numero, ErroLinha("Cada linha deve ser um objeto JSON")
+                continue
+            yield numero, registro
+
+
+class ResultadoImportacao:
+    """Totais de uma importação"""
+
+    def __init__(self):
+        self.lidas = 0
+        self.importadas = 0
+        self.rejeitadas = 0
+        self.lotes = 0
+        self.duracao = 0.0
+
+
+class ImportadorPessoas:
+    """
+    Valida e grava as pessoas de um arquivo. As categorias são resolvidas por
+    nome em mapas carregados uma vez: primeiro pelo nome exato e, se não
+    houver, sem diferenciar maiúsculas/minúsculas, desde que só uma
+    categoria combine (no banco "Aluno" e "aluno" podem ser categorias
+    diferentes).
+    Emails repetidos são rejeitados: dentro do lote por um conjunto e contra o
+    banco por uma consulta IN no índice de email; como cada lote é gravado
+    antes do próximo, repetições entre lotes do mesmo arquivo também são
+    encontradas pelo índice.
+
+    Com `indexarNoFim` o índice de busca (pessoa_fts) é apagado antes da
+    carga e reconstruído uma única vez no fim, em vez de indexar cada pessoa
+    pelo trigger; só para cargas sem outros usuários no banco, já que a busca
+    por nome/email fica indisponível durante a importação.
+    """
+
+    def __init__(self, db: DatabaseConnection, tamanhoLote: int = TAMANHO_LOTE_PADRAO, aoRejeitar=None,
+                 indexarNoFim: bool = False):
+        self.db = db
+        self.tamanhoLote = tamanhoLote
+        self.indexarNoFim = indexarNoFim
+        self.pessoaDao = PessoaDAO(db)
+        self.categoriaDao = CategoriaDAO(db)
+        # aoRejeitar(numeroLinha, mensagem); por padrão imprime a linha rejeitada
+        self.aoRejeitar = aoRejeitar or self.imprimirRejeicao
+        self.categorias = None
+        self.categoriasSemCaixa = None
+
+    @staticmethod
+    def imprimirRejeicao(numeroLinha: int, mensagem: str):
+        print(f"   ❌ Linha {numeroLinha}: {mensagem}")
+
+    def carregarCategorias(self):
+        self.categorias = {}
+        self.categoriasSemCaixa = {}
+        for categoria in self.categoriaDao.listarTodas():
+            self.categorias[categoria.nome] = categoria
+            self.categoriasSemCaixa.setdefault(categoria.nome.casefold(), []).append(categoria)
+
+    def resolverCategoria(self, nome: str):
+        """Categoria com o nome exato ou, na falta dela, a única que difere só em maiúsculas/minúsculas"""
+        categoria = self.categorias.get(nome)
+        if categoria is not None:
+            return categoria
+        candidatas = self.categoriasSemCaixa.get(nome.casefold(), [])
+        if len(candidatas) > 1:
+            nomes = ", ".join(f"'{c.nome}'" for c in candidatas)
+            raise ErroLinha(f"Categoria '{nome}' é ambígua (existem {nomes})")
+        if not candidatas:
+            raise ErroLinha(f"Categoria '{nome}' não encontrada")
+        return candidatas[0]
+
+    def importar(self, caminho: str, formato: str | None = None):
+        """Importa o arquivo inteiro; retorna um ResultadoImportacao"""
+        formato = formato or detectarFormato(caminho)
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconhecido: '{formato}' (opções: {', '.join(FORMATOS)})")
+
+        self.carregarCategorias()
+        resultado = ResultadoImportacao()
+        inicio = time.perf_counter()
+
+        if self.indexarNoFim:
+            with self.db.transacao():
+                self.db.removerIndiceBuscaPessoa()
+        try:
+            self.lerArquivo(caminho, formato, resultado)
+        finally:
+            if self.indexarNoFim:
+                # Recria o índice (também se a importação falhar) com um único rebuild
+                with self.db.transacao():
+                    self.db.criarIndiceBuscaPessoa()
+
+        resultado.duracao = time.perf_counter() - inicio
+        return resultado
+
+    def lerArquivo(self, caminho: str, formato: str, resultado: ResultadoImportacao):
+        # utf-8-sig aceita o BOM que as planilhas costumam gravar no início do CSV
+        with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+            lote = []
+            for numero, registro in lerLinhas(arquivo, formato):
+                resultado.lidas += 1
+                try:
+                    if isinstance(registro, ErroLinha):
+                        raise registro
+                    lote.append((numero, self.criarPessoa(registro)))
+                except ErroLinha as e:
+                    self.rejeitar(resultado, numero, str(e))
+                    continue
+
+                if len(lote) >= self.tamanhoLote:
+                    self.gravarLote(lote, resultado)
+                    lote = []
+            if lote:
+                self.gravarLote(lote, resultado)
+
+    def criarPessoa(self, registro: dict):
+        """Valida um registro e monta a Pessoa (ainda sem id)"""
+        def texto(nome):
+            valor = registro.get(nome)
+            if valor is None:
+                return None
+            valor = str(valor).strip()
+            return valor or None
+
+        nome = texto('nome')
+        if not nome:
+            raise ErroLinha("O nome não pode ser vazio")
+
+        email = texto('email')
+        if not email:
+            raise ErroLinha("O email não pode ser vazio")
+        if not emailValido(email):
+            raise ErroLinha(f"Email inválido: '{email}'")
+
+        nomeCategoria = texto('categoria')
+        if not nomeCategoria:
+            raise ErroLinha("A categoria não pode ser vazia")
+        categoria = self.resolverCategoria(nomeCategoria)
+
+        dataNascimento = texto('data_nascimento')
+        if dataNascimento:
+            try:
+                date.fromisoformat(dataNascimento)
+            except ValueError:
+                raise ErroLinha(f"Data de nascimento inválida: '{dataNascimento}' (use AAAA-MM-DD)")
+
+        return Pessoa(
+            id=None,
+            nome=nome,
+            email=email,
+            categoria=categoria,
+            data_nascimento=dataNascimento,
+            telefone=texto('telefone')
+        )
+
+    def gravarLote(self, lote, resultado: ResultadoImportacao):
+        """Descarta os emails repetidos e grava o restante do lote em uma transação"""
+        emUso = {chaveEmail(email) for email in self.pessoaDao.emailsEmUso(p.email for _, p in lote)}
+        vistos = set()
+        validas = []
+        for numero, pessoa in lote:
+            chave = chaveEmail(pessoa.email)
+            if chave in emUso:
+                self.rejeitar(resultado, numero, f"Já existe uma pessoa com o email '{pessoa.email}'")
+            elif chave in vistos:
+                self.rejeitar(resultado, numero, f"Email '{pessoa.email}' repetido no arquivo")
+            else:
+                vistos.add(chave)
+                validas.append((numero, pessoa))
+
+        if not validas:
+            return
+        try:
+            self.pessoaDao.salvarMuitos(p for _, p in validas)
+        except sqlite3.IntegrityError:
+            # Outra conexão gravou um dos emails depois da verificação:
+            # o lote foi desfeito e as linhas são gravadas uma a uma
+            self.gravarUmaAUma(validas, resultado)
+        else:
+            resultado.importadas += len(validas)
+        resultado.lotes += 1
+
+    def gravarUmaAUma(self, linhas, resultado: ResultadoImportacao):
+        with self.db.transacao():
+            for numero, pessoa in linhas:
+                pessoa.id = None
+                try:
+                    # Cada pessoa em um SAVEPOINT: uma falha desfaz só a própria linha
+                    with self.db.transacao():
+                        self.pessoaDao.salvar(pessoa)
+                except sqlite3.IntegrityError as e:
+                    pessoa.id = None
+                    self.rejeitar(resultado, numero, f"Violação de integridade: {e}")
+                else:
+                    resultado.importadas += 1
+
+    def rejeitar(self, resultado: ResultadoImportacao, numero: int, mensagem: str):
+        resultado.rejeitadas += 1
+        self.aoRejeitar(numero, mensagem)
+
+
+def imprimirResultado(resultado: ResultadoImportacao):
+    vazao = resultado.importadas / resultado.duracao if resultado.duracao else 0
+    print("\n" + "=" * 50)
+    print("  RESULTADO DA IMPORTAÇÃO")
+    print("=" * 50)
+    print(f"Linhas lidas:      {resultado.lidas}")
+    print(f"Pessoas gravadas:  {resultado.importadas} (em {resultado.lotes} lote(s))")
+    print(f"Linhas rejeitadas: {resultado.rejeitadas}")
+    print(f"Tempo:             {resultado.duracao:.2f}s ({vazao:.0f} pessoas/s)")
+    print("=" * 50)
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Importa pessoas de um arquivo CSV ou JSONL")
+    parser.add_argument('arquivo', help="arquivo .csv ou .jsonl")
+    parser.add_argument('--formato', choices=FORMATOS, default=None, help="padrão: pela extensão do arquivo")
+    parser.add_argument('--banco', default='exemplo_bd.db', help="arquivo do banco SQLite")
+    parser.add_argument('--lote', type=int, default=TAMANHO_LOTE_PADRAO, help="pessoas gravadas por transação")
+    parser.add_argument('--perfil', choices=list(PERFIS_PRAGMA), default=PERFIL_PADRAO,
+                        help="perfil de PRAGMA do SQLite (padrão: %(default)s)")
+    parser.add_argument('--silencioso', action='store_true', help="não lista as linhas rejeitadas")
+    parser.add_argument('--indexar-no-fim', action='store_true',
+                        help="reconstrói o índice de busca uma vez no fim (carga sem outros usuários)")
+    args = parser.parse_args()
+
+    db = DatabaseConnection(args.banco, perfil=args.perfil)
+    try:
+        db.conectar()
+        db.criarTabelas()
+        aoRejeitar = (lambda numero, mensagem: None) if args.silencioso else None
+        importador = ImportadorPessoas(db, args.lote, aoRejeitar, args.indexar_no_fim)
+        imprimirResultado(importador.importar(args.arquivo, args.formato))
+    finally:
+        db.fechar()
+
+
+if __name__ == "__main__":
+    main()
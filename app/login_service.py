@@ -11,15 +11,26 @@ from bd.database import DatabaseConnection
 from dao.login_dao import LoginDAO
 from dao.pessoa_dao import PessoaDAO
 from model.Login import Login
+from paginacao import navegarPaginas
+from verificador_senhas import VerificadorSenhas
+from gerenciador_sessoes import GerenciadorSessoes
 
 
 class LoginService:
 
-    def __init__(self, db: DatabaseConnection):
+    def __init__(self, db: DatabaseConnection, verificador: VerificadorSenhas | None = None,
+                 sessoes: GerenciadorSessoes | None = None):
         self.db = db
         self.loginDao = LoginDAO(db)
-        self.pessoaDao = PessoaDAO(db)
+        # Aqui só nome e email das pessoas são usados: a categoria fica preguiçosa
+        self.pessoaDao = PessoaDAO(db, relacoesPreguicosas=True)
         self.usuario_logado = None
+        self.sessao = None
+        # O KDF roda em um pool de workers, fora da thread que atende o usuário;
+        # um verificador recebido de fora é encerrado por quem o criou
+        self.verificadorProprio = verificador is None
+        self.verificador = verificador or VerificadorSenhas()
+        self.sessoes = sessoes or GerenciadorSessoes(db)
 
     def exibirMenu(self):
         """Exibe o menu principal de opções"""
@@ -32,38 +43,34 @@ class LoginService:
         print("4. Buscar login por email")
         print("5. Trocar senha")
         print("6. Deletar login")
+        print("7. Encerrar sessão (logout)")
         print("0. Sair")
         print("="*50)
 
     def listarPessoasDisponiveis(self):
-        """Lista todas as pessoas disponíveis para criar login"""
-        pessoas = self.pessoaDao.listarTodas()
-        if not pessoas:
-            print("⚠️  Nenhuma pessoa cadastrada. Cadastre uma pessoa primeiro!")
-            return None
-
-        # Filtrar pessoas que já têm login
-        pessoasSemLogin = []
-        for pessoa in pessoas:
-            loginExistente = self.loginDao.buscarPorUsuarioId(pessoa.id)
-            if not loginExistente:
-                pessoasSemLogin.append(pessoa)
+        """Lista as pessoas sem login, página a página, para criar login"""
+        temPessoas = navegarPaginas(self.pessoaDao, self.exibirPaginaPessoasSemLogin,
+                                    listarPagina=self.pessoaDao.listarPaginaSemLogin)
+        if temPessoas:
+            return True
 
-        if not pessoasSemLogin:
+        if not self.pessoaDao.listarPagina(limite=1):
+            print("⚠️  Nenhuma pessoa cadastrada. Cadastre uma pessoa primeiro!")
+        else:
             print("⚠️  Todas as pessoas já possuem login cadastrado!")
-            return None
+        return None
 
-        print("\nPessoas sem login:")
+    def exibirPaginaPessoasSemLogin(self, pessoas, numeroPagina):
+        """Exibe uma página das pessoas sem login"""
+        print(f"\nPessoas sem login (página {numeroPagina}):")
         print("-"*50)
-        for pessoa in pessoasSemLogin:
+        for pessoa in pessoas:
             print(f"  {pessoa.id}. {pessoa.nome} ({pessoa.email})")
         print("-"*50)
-        return pessoasSemLogin
 
     def selecionarPessoa(self):
         """Solicita ao usuário que selecione uma pessoa"""
-        pessoas = self.listarPessoasDisponiveis()
-        if not pessoas:
+        if not self.listarPessoasDisponiveis():
             return None
 
         try:
@@ -119,7 +126,8 @@ class LoginService:
                 id=None,
                 email=email,
                 senha=senha,
-                usuario_id=pessoa.id
+                usuario_id=pessoa.id,
+                gerar_hash=self.verificador.gerarHash
             )
 
             loginId = self.loginDao.salvar(login)
@@ -152,42 +160,67 @@ class LoginService:
                 print("❌ Email ou senha incorretos!")
                 return
 
-            if login.verificar_senha(senha):
+            if self.verificador.verificar(login, senha):
+                # Hash legado ou com custo antigo: regera com o algoritmo padrão
+                if login.precisa_rehash():
+                    login.atualizar_hash(senha, self.verificador.gerarHash)
+                    self.loginDao.salvar(login)
+
                 pessoa = self.pessoaDao.buscarPorId(login.usuario_id)
                 self.usuario_logado = pessoa
+                self.sessao = self.sessoes.criarSessao(login)
                 print(f"\n✅ Login realizado com sucesso!")
                 print(f"   Bem-vindo(a), {pessoa.nome}!")
+                print(f"   Token de sessão: {self.sessao.token}")
             else:
                 print("❌ Email ou senha incorretos!")
 
         except Exception as e:
             print(f"❌ Erro ao fazer login: {e}")
 
+    def fechar(self):
+        """Encerra o pool de workers do KDF, se foi criado por este serviço"""
+        if self.verificadorProprio:
+            self.verificador.fechar()
+
+    def validarSessao(self, token: str):
+        """Autentica uma ação pelo token de sessão, sem reler o login nem rodar o KDF"""
+        return self.sessoes.validarSessao(token)
+
+    def encerrarSessao(self):
+        """Encerra a sessão do usuário logado (logout)"""
+        if self.sessao is None:
+            print("⚠️  Nenhuma sessão ativa.")
+            return
+        self.sessoes.encerrarSessao(self.sessao.token)
+        self.sessao = None
+        self.usuario_logado = None
+        print("\n✅ Sessão encerrada.")
+
     def listarLogins(self):
         """Lista todos os logins cadastrados"""
         print("\n--- LISTAR TODOS OS LOGINS ---")
 
         try:
-            logins = self.loginDao.listarTodos()
-
-            if not logins:
+            if not navegarPaginas(self.loginDao, self.exibirPaginaLogins,
+                                  listarPagina=self.loginDao.listarPaginaComUsuario):
                 print("⚠️  Nenhum login cadastrado.")
-                return
 
-            print(f"\nTotal de logins: {len(logins)}")
-            print("\n" + "-"*80)
-            print(f"{'ID':<5} | {'Email':<30} | {'ID Usuário':<15}")
-            print("-"*80)
+        except Exception as e:
+            print(f"❌ Erro ao listar logins: {e}")
 
-            for login in logins:
-                pessoa = self.pessoaDao.buscarPorId(login.usuario_id)
-                nome_usuario = pessoa.nome if pessoa else "N/A"
-                print(f"{login.id:<5} | {login.email:<30} | {login.usuario_id:<15}")
+    def exibirPaginaLogins(self, logins, numeroPagina):
+        """Exibe uma página da listagem de logins (LoginResumo)"""
+        print(f"\nPágina {numeroPagina}")
+        print("\n" + "-"*80)
+        print(f"{'ID':<5} | {'Email':<30} | {'ID Usuário':<10} | {'Usuário':<25}")
+        print("-"*80)
 
-            print("-"*80)
+        for login in logins:
+            nome_usuario = login.usuario_nome or "N/A"
+            print(f"{login.id:<5} | {login.email[:29]:<30} | {login.usuario_id:<10} | {nome_usuario[:24]:<25}")
 
-        except Exception as e:
-            print(f"❌ Erro ao listar logins: {e}")
+        print("-"*80)
 
     def buscarPorEmail(self):
         """Solicita um email e busca o login correspondente"""
@@ -236,7 +269,7 @@ class LoginService:
                 print("❌ Email ou senha incorretos!")
                 return
 
-            if not login.verificar_senha(senhaAtual):
+            if not self.verificador.verificar(login, senhaAtual):
                 print("❌ Email ou senha incorretos!")
                 return
 
@@ -250,8 +283,10 @@ class LoginService:
                 print("❌ Erro: As senhas não coincidem!")
                 return
 
-            login.trocar_senha(novaSenha)
+            login.trocar_senha(novaSenha, self.verificador.gerarHash)
             self.loginDao.salvar(login)
+            # Tokens emitidos com a senha antiga deixam de valer
+            self.sessoes.encerrarSessoesDoLogin(login.id)
             print("\n✅ Senha alterada com sucesso!")
 
         except Exception as e:
@@ -286,6 +321,8 @@ class LoginService:
                 print("❌ Operação cancelada.")
                 return
 
+            # O banco remove as sessões em cascata; o cache é limpo aqui
+            self.sessoes.encerrarSessoesDoLogin(login.id)
             sucesso = self.loginDao.deletar(login)
 
             if sucesso:
@@ -318,6 +355,8 @@ class LoginService:
                     self.trocarSenha()
                 elif opcao == '6':
                     self.deletarLogin()
+                elif opcao == '7':
+                    self.encerrarSessao()
                 else:
                     print("❌ Opção inválida! Tente novamente.")
 
@@ -344,7 +383,10 @@ def main():
 
         # Criar e executar o serviço
         service = LoginService(db)
-        service.executar()
+        try:
+            service.executar()
+        finally:
+            service.fechar()
 
     except Exception as e:
         print(f"❌ Erro ao inicializar o sistema: {e}")
@@ -2,13 +2,15 @@
 Sistema principal de gerenciamento com menu unificado
 Permite ao usuário escolher entre gerenciar Categorias, Pessoas, Turmas e Logins
 """
+import argparse
 import sys
 import os
 
 # Adicionar o diretório pai ao path para permitir imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from bd.database import DatabaseConnection
+from bd.database import DatabaseConnection, PERFIS_PRAGMA, PERFIL_PADRAO
+from bd.rastreamento import LIMITE_LENTO_PADRAO_MS
 
 # Importar serviços
 from categoria_service import CategoriaService
@@ -16,15 +18,19 @@ from pessoa_service import PessoaService
 from turma_service import TurmaService
 from login_service import LoginService
 from nivel_service import NivelService
+from gerenciador_sessoes import GerenciadorSessoes
+from verificador_senhas import VerificadorSenhas
 
 class SistemaPrincipal:
     
-    def __init__(self, db: DatabaseConnection):
+    def __init__(self, db: DatabaseConnection, sessoes: GerenciadorSessoes | None = None,
+                 verificador: VerificadorSenhas | None = None):
         self.db = db
+        self.sessoes = sessoes or GerenciadorSessoes(db)
         self.categoriaService = CategoriaService(db)
         self.pessoaService = PessoaService(db)
         self.turmaService = TurmaService(db)
-        self.loginService = LoginService(db)
+        self.loginService = LoginService(db, verificador, sessoes=self.sessoes)
         self.nivelService = NivelService(db)
     
     def exibirMenuPrincipal(self):
@@ -47,6 +53,7 @@ class SistemaPrincipal:
         print("  ⚠️  ATENÇÃO: LIMPAR TODOS OS DADOS")
         print("="*50)
         print("Esta operação vai deletar TODOS os dados de:")
+        print("  - Sessões")
         print("  - Logins")
         print("  - Turmas")
         print("  - Pessoas")
@@ -124,7 +131,22 @@ class SistemaPrincipal:
 
 def main():
     """Função principal para executar o sistema"""
-    db = DatabaseConnection('exemplo_bd.db')
+    parser = argparse.ArgumentParser(description="Sistema de gerenciamento da escola de forró")
+    parser.add_argument('--perfil', choices=list(PERFIS_PRAGMA), default=PERFIL_PADRAO,
+                        help="perfil de PRAGMA do SQLite (padrão: %(default)s)")
+    parser.add_argument('--rastrear-sql', action='store_true',
+                        help="mede os comandos SQL e mostra um resumo ao sair")
+    parser.add_argument('--sql-lento-ms', type=float, default=LIMITE_LENTO_PADRAO_MS,
+                        help="limite do log de consultas lentas, em ms (padrão: %(default)s)")
+    parser.add_argument('--log-sql-lento', default=None,
+                        help="arquivo do log de consultas lentas (padrão: stderr)")
+    args = parser.parse_args()
+
+    db = DatabaseConnection('exemplo_bd.db', perfil=args.perfil)
+    if args.rastrear_sql:
+        db.ativarRastreamento(args.sql_lento_ms, args.log_sql_lento)
+    sessoes = None
+    verificador = None
     
     try:
         # Conectar ao banco
@@ -133,8 +155,15 @@ def main():
         # Garantir que as tabelas existam
         db.criarTabelas()
         
+        # Sessões expiradas são removidas em segundo plano
+        sessoes = GerenciadorSessoes(db)
+        sessoes.iniciarVarredura()
+        
+        # Pool de workers do KDF das senhas, encerrado junto com o sistema
+        verificador = VerificadorSenhas()
+
         # Criar e executar o sistema principal
-        sistema = SistemaPrincipal(db)
+        sistema = SistemaPrincipal(db, sessoes, verificador)
         sistema.executar()
     
     except Exception as e:
@@ -142,6 +171,10 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        if sessoes is not None:
+            sessoes.parar()
+        if verificador is not None:
+            verificador.fechar()
         db.fechar()
         print("✓ Conexão com banco de dados encerrada.")
 
@@ -0,0 +1,61 @@
+"""
+Navegação paginada (próxima / anterior) para as listagens dos serviços
+"""
+
+TAMANHO_PAGINA = 20
+
+
+def navegarPaginas(dao, exibirPagina, limite: int = TAMANHO_PAGINA, listarPagina=None):
+    """
+    Exibe as páginas de dao.listarPagina, deixando o usuário avançar ou voltar.
+
+    exibirPagina(itens, numeroPagina) imprime uma página. Cada navegação faz
+    uma única consulta por chave (keyset), então o custo não cresce com o
+    número da página. listarPagina permite usar outra listagem do DAO com a
+    mesma chave (ex.: dao.listarPaginaSemLogin). Retorna False se não houver
+    nenhum item.
+    """
+    if listarPagina is None:
+        listarPagina = dao.listarPagina
+
+    # Uma linha a mais indica se existe próxima página
+    pagina = listarPagina(limite=limite + 1)
+    if not pagina:
+        return False
+
+    temProxima = len(pagina) > limite
+    pagina = pagina[:limite]
+    numero = 1
+
+    while True:
+        exibirPagina(pagina, numero)
+
+        opcoes = []
+        if temProxima:
+            opcoes.append("[p] próxima")
+        if numero > 1:
+            opcoes.append("[a] anterior")
+        if not opcoes:
+            return True
+
+        escolha = input(f"{' | '.join(opcoes)} | [Enter] sair: ").strip().lower()
+
+        if escolha == 'p' and temProxima:
+            proxima = listarPagina(apos=dao.chavePagina(pagina[-1]), limite=limite + 1)
+            if not proxima:
+                temProxima = False
+                continue
+            temProxima = len(proxima) > limite
+            pagina = proxima[:limite]
+            numero += 1
+        elif escolha == 'a' and numero > 1:
+            anterior = listarPagina(antes=dao.chavePagina(pagina[0]), limite=limite)
+            if anterior:
+                pagina = anterior
+                temProxima = True
+                numero -= 1
+            else:
+                # Os registros anteriores foram removidos: já estamos no início
+                numero = 1
+        else:
+            return True
@@ -10,7 +10,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from bd.database import DatabaseConnection
 from dao.pessoa_dao import PessoaDAO
 from dao.categoria_dao import CategoriaDAO
-from model.pessoa import Pessoa
+from model.pessoa import Pessoa, emailValido
+from paginacao import navegarPaginas
+from importar_pessoas import ImportadorPessoas, imprimirResultado
 
 
 class PessoaService:
@@ -32,6 +34,7 @@ class PessoaService:
         print("5. Buscar pessoas por categoria")
         print("6. Atualizar pessoa")
         print("7. Deletar pessoa")
+        print("8. Importar pessoas de arquivo (CSV/JSONL)")
         print("0. Sair")
         print("="*50)
 
@@ -82,14 +85,15 @@ class PessoaService:
         if not email:
             print("❌ Erro: O email não pode ser vazio!")
             return
+        if not emailValido(email):
+            print(f"❌ Erro: Email inválido: '{email}'")
+            return
 
         # Verificar se já existe uma pessoa com esse email
-        pessoasExistentes = self.pessoaDao.buscarPorNome("")  # Buscar todas para verificar email
-        todasPessoas = self.pessoaDao.listarTodas()
-        for p in todasPessoas:
-            if p.email.lower() == email.lower():
-                print(f"❌ Erro: Já existe uma pessoa com o email '{email}' (ID: {p.id})")
-                return
+        pessoaExistenteId = self.pessoaDao.emailEmUso(email)
+        if pessoaExistenteId:
+            print(f"❌ Erro: Já existe uma pessoa com o email '{email}' (ID: {pessoaExistenteId})")
+            return
 
         # Selecionar categoria
         categoria = self.selecionarCategoria()
@@ -140,24 +144,23 @@ class PessoaService:
         print("\n--- LISTAR TODAS AS PESSOAS ---")
 
         try:
-            pessoas = self.pessoaDao.listarTodas()
-
-            if not pessoas:
+            if not navegarPaginas(self.pessoaDao, self.exibirPaginaPessoas):
                 print("⚠️  Nenhuma pessoa cadastrada.")
-                return
 
-            print(f"\nTotal de pessoas: {len(pessoas)}")
-            print("\n" + "-"*80)
-            print(f"{'ID':<5} | {'Nome':<25} | {'Email':<25} | {'Categoria':<15} | {'Status':<8}")
-            print("-"*80)
+        except Exception as e:
+            print(f"❌ Erro ao listar pessoas: {e}")
 
-            for pessoa in pessoas:
-                print(f"{pessoa.id:<5} | {pessoa.nome[:24]:<25} | {pessoa.email[:24]:<25} | {pessoa.categoria.nome[:14]:<15}")
+    def exibirPaginaPessoas(self, pessoas, numeroPagina):
+        """Exibe uma página da listagem de pessoas"""
+        print(f"\nPágina {numeroPagina}")
+        print("\n" + "-"*80)
+        print(f"{'ID':<5} | {'Nome':<25} | {'Email':<25} | {'Categoria':<15} | {'Status':<8}")
+        print("-"*80)
 
-            print("-"*80)
+        for pessoa in pessoas:
+            print(f"{pessoa.id:<5} | {pessoa.nome[:24]:<25} | {pessoa.email[:24]:<25} | {pessoa.categoria.nome[:14]:<15}")
 
-        except Exception as e:
-            print(f"❌ Erro ao listar pessoas: {e}")
+        print("-"*80)
 
     def buscarPorId(self):
         """Solicita um ID e busca a pessoa correspondente"""
@@ -184,14 +187,14 @@ class PessoaService:
         """Solicita um nome e busca pessoas correspondentes"""
         print("\n--- BUSCAR PESSOA POR NOME ---")
 
-        nome = input("Digite o nome (ou parte do nome) da pessoa: ").strip()
+        nome = input("Digite o nome ou email (ou o início de cada palavra) da pessoa: ").strip()
 
         if not nome:
             print("❌ Erro: O nome não pode ser vazio!")
             return
 
         try:
-            pessoas = self.pessoaDao.buscarPorNome(nome)
+            pessoas = self.pessoaDao.pesquisar(nome)
 
             if pessoas:
                 print(f"\n✅ {len(pessoas)} pessoa(s) encontrada(s):")
@@ -200,7 +203,7 @@ class PessoaService:
                     print(f"ID: {pessoa.id} | {pessoa.nome} | {pessoa.email} | {pessoa.categoria.nome}")
                 print("-"*80)
             else:
-                print(f"⚠️  Nenhuma pessoa encontrada com o nome contendo '{nome}'.")
+                print(f"⚠️  Nenhuma pessoa encontrada para '{nome}'.")
 
         except Exception as e:
             print(f"❌ Erro ao buscar pessoa: {e}")
@@ -265,12 +268,14 @@ class PessoaService:
             # Email
             novoEmail = input(f"Email [{pessoa.email}]: ").strip()
             if novoEmail:
+                if not emailValido(novoEmail):
+                    print(f"❌ Erro: Email inválido: '{novoEmail}'")
+                    return
                 # Verificar se já existe outra pessoa com esse email
-                todasPessoas = self.pessoaDao.listarTodas()
-                for p in todasPessoas:
-                    if p.id != pessoaId and p.email.lower() == novoEmail.lower():
-                        print(f"❌ Erro: Já existe outra pessoa com o email '{novoEmail}' (ID: {p.id})")
-                        return
+                outraPessoaId = self.pessoaDao.emailEmUso(novoEmail, excetoId=pessoaId)
+                if outraPessoaId:
+                    print(f"❌ Erro: Já existe outra pessoa com o email '{novoEmail}' (ID: {outraPessoaId})")
+                    return
                 pessoa.email = novoEmail
 
             # Categoria
@@ -339,6 +344,27 @@ class PessoaService:
         except Exception as e:
             print(f"❌ Erro ao deletar pessoa: {e}")
 
+    def importarPessoas(self):
+        """Importa várias pessoas de um arquivo CSV ou JSONL"""
+        print("\n--- IMPORTAR PESSOAS ---")
+        print("Colunas: nome, email, categoria (nome), data_nascimento (AAAA-MM-DD), telefone")
+
+        caminho = input("Digite o caminho do arquivo (.csv ou .jsonl): ").strip()
+        if not caminho:
+            print("❌ Erro: O caminho não pode ser vazio!")
+            return
+        if not os.path.isfile(caminho):
+            print(f"❌ Erro: Arquivo '{caminho}' não encontrado!")
+            return
+
+        try:
+            resultado = ImportadorPessoas(self.db).importar(caminho)
+            imprimirResultado(resultado)
+        except ValueError as e:
+            print(f"❌ Erro: {e}")
+        except Exception as e:
+            print(f"❌ Erro ao importar pessoas: {e}")
+
     def executar(self):
         """Método principal que executa o loop do menu"""
         try:
@@ -363,6 +389,8 @@ class PessoaService:
                     self.atualizarPessoa()
                 elif opcao == '7':
                     self.deletarPessoa()
+                elif opcao == '8':
+                    self.importarPessoas()
                 else:
                     print("❌ Opção inválida! Tente novamente.")
 
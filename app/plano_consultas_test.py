@@ -0,0 +1,210 @@
+"""
+Verificação dos planos de consulta dos DAOs
+Executa cada método dos DAOs em um banco temporário, captura o SQL gerado
+e roda EXPLAIN QUERY PLAN, falhando se alguma consulta fizer SCAN completo
+de uma tabela grande ou precisar de uma B-tree temporária para ordenar
+"""
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+from dao.turma_dao import TurmaDAO
+from dao.login_dao import LoginDAO
+from dao.nivel_dao import NivelDAO
+from dao.sessao_dao import SessaoDAO
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+from model.turma import Turma
+from model.nivel import Nivel
+from model.Login import Login
+from model.sessao import Sessao
+
+# Tabelas que crescem com o uso da escola; categoria e nivel são pequenas
+TABELAS_GRANDES = {'pessoa', 'turma', 'login', 'sessao'}
+
+
+def popular_banco(db):
+    """Cria alguns registros para que todas as consultas tenham dados"""
+    categoria = Categoria(id=None, nome="Aluno")
+    CategoriaDAO(db).salvar(categoria)
+    nivel = Nivel(id=None, nome="Básico")
+    NivelDAO(db).salvar(nivel)
+
+    pessoas = [
+        Pessoa(id=None, nome=f"Pessoa {i}", email=f"pessoa{i}@escola.com", categoria=categoria)
+        for i in range(20)
+    ]
+    PessoaDAO(db).salvarMuitos(pessoas)
+    TurmaDAO(db).salvarMuitos(
+        Turma(id=None, horario=f"{8 + i}:00", nivel=nivel, professor=f"Professor {i}")
+        for i in range(10)
+    )
+    LoginDAO(db).salvarMuitos(
+        Login(id=None, email=p.email, senha="senha", usuario_id=p.id) for p in pessoas[:5]
+    )
+    sessaoDao = SessaoDAO(db)
+    for i in range(5):
+        sessaoDao.salvar(Sessao(token=f"token{i}", login_id=i + 1, usuario_id=pessoas[i].id,
+                                criada_em=0.0, expira_em=float(i)))
+    return categoria, nivel, pessoas
+
+
+def consultas_dos_daos(db, categoria, nivel, pessoas):
+    """Lista (descrição, chamada) de cada acesso dos DAOs a ser verificado"""
+    categoriaDao = CategoriaDAO(db)
+    nivelDao = NivelDAO(db)
+    pessoaDao = PessoaDAO(db)
+    turmaDao = TurmaDAO(db)
+    pessoaDaoPreguicoso = PessoaDAO(db, relacoesPreguicosas=True)
+    turmaDaoPreguicoso = TurmaDAO(db, relacoesPreguicosas=True)
+    loginDao = LoginDAO(db)
+    sessaoDao = SessaoDAO(db)
+
+    pessoa = pessoas[0]
+    turma = turmaDao.buscarPorId(1)
+    login = loginDao.buscarPorId(1)
+
+    # PessoaDAO.buscarPorNome (LIKE '%x%' sem índice) não entra nesta lista:
+    # a busca de pessoas por nome usa PessoaDAO.pesquisar (FTS5)
+    return [
+        ("CategoriaDAO.buscarPorId", lambda: categoriaDao.buscarPorId(categoria.id)),
+        ("CategoriaDAO.buscarPorNome", lambda: categoriaDao.buscarPorNome(categoria.nome)),
+        ("CategoriaDAO.listarTodas", lambda: categoriaDao.listarTodas()),
+        ("CategoriaDAO.buscarPorIds", lambda: categoriaDao.buscarPorIds([categoria.id, categoria.id + 1])),
+        ("NivelDAO.buscarPorId", lambda: nivelDao.buscarPorId(nivel.id)),
+        ("NivelDAO.buscarPorNome", lambda: nivelDao.buscarPorNome(nivel.nome)),
+        ("NivelDAO.listarTodas", lambda: nivelDao.listarTodas()),
+        ("NivelDAO.buscarPorIds", lambda: nivelDao.buscarPorIds([nivel.id, nivel.id + 1])),
+        ("PessoaDAO.buscarPorId", lambda: pessoaDao.buscarPorId(pessoa.id)),
+        ("PessoaDAO.listarTodas", lambda: pessoaDao.listarTodas()),
+        ("PessoaDAO.iterarTodas", lambda: list(pessoaDao.iterarTodas())),
+        ("PessoaDAO.emailEmUso", lambda: pessoaDao.emailEmUso(pessoa.email.upper(), excetoId=pessoa.id)),
+        ("PessoaDAO.emailsEmUso", lambda: pessoaDao.emailsEmUso([pessoa.email.upper(), "nova@escola.com"])),
+        ("PessoaDAO.pesquisar", lambda: pessoaDao.pesquisar("pess")),
+        ("PessoaDAO.buscarPorCategoria", lambda: pessoaDao.buscarPorCategoria(categoria.id)),
+        ("PessoaDAO.iterarPorCategoria", lambda: list(pessoaDao.iterarPorCategoria(categoria.id))),
+        ("PessoaDAO.listarPagina", lambda: pessoaDao.listarPagina(limite=5)),
+        ("PessoaDAO.listarPagina(apos)", lambda: pessoaDao.listarPagina(apos=pessoaDao.chavePagina(pessoa), limite=5)),
+        ("PessoaDAO.listarPagina(antes)", lambda: pessoaDao.listarPagina(antes=pessoaDao.chavePagina(pessoa), limite=5)),
+        ("PessoaDAO.listarSemLogin", lambda: pessoaDao.listarSemLogin()),
+        ("PessoaDAO.iterarSemLogin", lambda: list(pessoaDao.iterarSemLogin())),
+        ("PessoaDAO.listarPaginaSemLogin(apos)",
+         lambda: pessoaDao.listarPaginaSemLogin(apos=pessoaDao.chavePagina(pessoa), limite=5)),
+        ("PessoaDAO.salvar (update)", lambda: pessoaDao.salvar(pessoa)),
+        ("PessoaDAO.listarPagina (preguiçoso)",
+         lambda: pessoaDaoPreguicoso.carregarCategorias(pessoaDaoPreguicoso.listarPagina(limite=5))),
+        ("PessoaDAO.pesquisar (preguiçoso)", lambda: pessoaDaoPreguicoso.pesquisar("pess")),
+        ("TurmaDAO.buscarPorId", lambda: turmaDao.buscarPorId(turma.id)),
+        ("TurmaDAO.listarTodas", lambda: turmaDao.listarTodas()),
+        ("TurmaDAO.iterarTodas", lambda: list(turmaDao.iterarTodas())),
+        ("TurmaDAO.buscarPorProfessor", lambda: turmaDao.buscarPorProfessor("fessor 1")),
+        ("TurmaDAO.iterarPorProfessor", lambda: list(turmaDao.iterarPorProfessor("fessor 1"))),
+        ("TurmaDAO.buscarPorNivel", lambda: turmaDao.buscarPorNivel(nivel.id)),
+        ("TurmaDAO.iterarPorNivel", lambda: list(turmaDao.iterarPorNivel(nivel.id))),
+        ("TurmaDAO.listarPagina", lambda: turmaDao.listarPagina(limite=5)),
+        ("TurmaDAO.listarPagina(apos)", lambda: turmaDao.listarPagina(apos=turmaDao.chavePagina(turma), limite=5)),
+        ("TurmaDAO.listarPagina(antes)", lambda: turmaDao.listarPagina(antes=turmaDao.chavePagina(turma), limite=5)),
+        ("TurmaDAO.salvar (update)", lambda: turmaDao.salvar(turma)),
+        ("TurmaDAO.listarPagina (preguiçoso)",
+         lambda: turmaDaoPreguicoso.carregarNiveis(turmaDaoPreguicoso.listarPagina(limite=5))),
+        ("TurmaDAO.buscarPorProfessor (preguiçoso)", lambda: turmaDaoPreguicoso.buscarPorProfessor("fessor 1")),
+        ("LoginDAO.buscarPorId", lambda: loginDao.buscarPorId(login.id)),
+        ("LoginDAO.buscarPorEmail", lambda: loginDao.buscarPorEmail(login.email)),
+        ("LoginDAO.buscarPorUsuarioId", lambda: loginDao.buscarPorUsuarioId(login.usuario_id)),
+        ("LoginDAO.emailExiste", lambda: loginDao.emailExiste(login.email)),
+        ("LoginDAO.listarTodos", lambda: loginDao.listarTodos()),
+        ("LoginDAO.iterarTodos", lambda: list(loginDao.iterarTodos())),
+        ("LoginDAO.listarPagina(apos)", lambda: loginDao.listarPagina(apos=loginDao.chavePagina(login), limite=5)),
+        ("LoginDAO.listarPagina(antes)", lambda: loginDao.listarPagina(antes=loginDao.chavePagina(login), limite=5)),
+        ("LoginDAO.listarComUsuario", lambda: loginDao.listarComUsuario()),
+        ("LoginDAO.listarPaginaComUsuario(apos)",
+         lambda: loginDao.listarPaginaComUsuario(apos=loginDao.chavePagina(login), limite=5)),
+        ("LoginDAO.salvar (update)", lambda: loginDao.salvar(login)),
+        ("SessaoDAO.buscarPorToken", lambda: sessaoDao.buscarPorToken("token0")),
+        ("SessaoDAO.deletar", lambda: sessaoDao.deletar("token0")),
+        ("SessaoDAO.deletarPorLogin", lambda: sessaoDao.deletarPorLogin(login.id)),
+        ("SessaoDAO.deletarExpiradas", lambda: sessaoDao.deletarExpiradas(2.0)),
+    ]
+
+
+def capturar_sql(db, chamada):
+    """Executa a chamada e retorna os comandos SQL que ela enviou ao banco"""
+    comandos = []
+    conn = db.conectar()
+    conn.set_trace_callback(comandos.append)
+    try:
+        chamada()
+    finally:
+        conn.set_trace_callback(None)
+    return [c for c in comandos if c.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE'))]
+
+
+def problemas_do_plano(db, sql):
+    """Retorna as linhas do plano que indicam SCAN de tabela grande ou ordenação temporária"""
+    cur = db.cursor()
+    cur.execute("EXPLAIN QUERY PLAN " + sql)
+    linhas = [row['detail'] for row in cur.fetchall()]
+
+    # Apelidos usados nas consultas (p, t) também contam como tabela grande
+    aliases = {'p': 'pessoa', 't': 'turma'}
+    problemas = []
+    for detalhe in linhas:
+        partes = detalhe.split()
+        if partes[0] == 'SCAN' and len(partes) > 1:
+            tabela = aliases.get(partes[1], partes[1])
+            if tabela in TABELAS_GRANDES and 'INDEX' not in detalhe:
+                problemas.append(detalhe)
+        if 'USE TEMP B-TREE' in detalhe:
+            problemas.append(detalhe)
+    return linhas, problemas
+
+
+def verificar_planos(db):
+    """Verifica o plano de cada consulta dos DAOs; retorna a quantidade de falhas"""
+    print("=" * 60)
+    print("  🔎 VERIFICANDO PLANOS DE CONSULTA DOS DAOs")
+    print("=" * 60)
+
+    categoria, nivel, pessoas = popular_banco(db)
+    falhas = 0
+
+    for descricao, chamada in consultas_dos_daos(db, categoria, nivel, pessoas):
+        for sql in capturar_sql(db, chamada):
+            linhas, problemas = problemas_do_plano(db, sql)
+            if problemas:
+                falhas += 1
+                print(f"\n❌ {descricao}")
+                print(f"   SQL: {' '.join(sql.split())}")
+                for detalhe in linhas:
+                    print(f"   plano: {detalhe}")
+            else:
+                print(f"✅ {descricao}: {' / '.join(linhas)}")
+
+    print("\n" + "=" * 60)
+    return falhas
+
+
+def main():
+    """Função principal"""
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseConnection(os.path.join(diretorio, 'planos.db'))
+        try:
+            db.conectar()
+            db.criarTabelas()
+            falhas = verificar_planos(db)
+        finally:
+            db.fechar()
+
+    if falhas:
+        print(f"❌ {falhas} consulta(s) com SCAN de tabela grande ou ordenação temporária")
+        sys.exit(1)
+    print("✅ Todas as consultas usam índices")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Teste do pool de conexões usado pelos DAOs fora de `with pool.conexao()`
+Várias threads (mais que o tamanho do pool) usam os DAOs direto no pool;
+ao terminarem, as conexões delas precisam voltar ao pool
+"""
+import sys
+import os
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.connection_pool import ConnectionPool
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+
+TAMANHO_POOL = 2
+THREADS = 8
+
+
+def popular(pool):
+    with pool.conexao():
+        pool.criarTabelas()
+        categoria = Categoria(id=None, nome="Aluno")
+        CategoriaDAO(pool).salvar(categoria)
+        pessoa = Pessoa(id=None, nome="Ana", email="ana@escola.com", categoria=categoria)
+        PessoaDAO(pool).salvar(pessoa)
+    return pessoa.id
+
+
+def main():
+    """Função principal"""
+    with tempfile.TemporaryDirectory() as diretorio:
+        pool = ConnectionPool(os.path.join(diretorio, 'pool.db'), tamanho=TAMANHO_POOL, timeout=5)
+        resultados = []
+        erros = []
+        try:
+            pessoaId = popular(pool)
+
+            def buscar():
+                # Sem `with pool.conexao()`: a conexão fica reservada até a thread terminar
+                try:
+                    resultados.append(PessoaDAO(pool).buscarPorId(pessoaId))
+                except Exception as e:
+                    erros.append(e)
+
+            # Em ondas do tamanho do pool, depois todas de uma vez
+            for _ in range(0, THREADS, TAMANHO_POOL):
+                threads = [threading.Thread(target=buscar) for _ in range(TAMANHO_POOL)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            threads = [threading.Thread(target=buscar) for _ in range(THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            # Todas as vagas precisam estar livres de novo: TAMANHO_POOL threads
+            # seguram uma conexão ao mesmo tempo
+            barreira = threading.Barrier(TAMANHO_POOL)
+
+            def reservar():
+                try:
+                    with pool.conexao():
+                        barreira.wait(timeout=5)
+                except Exception as e:
+                    erros.append(e)
+
+            threads = [threading.Thread(target=reservar) for _ in range(TAMANHO_POOL)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            ok = not erros and len(resultados) == THREADS * 2 and all(p and p.nome == "Ana" for p in resultados)
+        finally:
+            pool.fechar()
+
+    if ok:
+        print(f"✅ {THREADS * 2} threads em um pool de {TAMANHO_POOL} conexões, todas as vagas devolvidas")
+    else:
+        print(f"❌ Falhas: {erros or 'resultados incorretos'}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,734 @@
+"""
+API HTTP/JSON do sistema, para vários terminais ao mesmo tempo
+(recepção, quiosque, tablets dos professores)
+
+Cada requisição é atendida em uma thread própria (ThreadingHTTPServer) e usa
+uma conexão do ConnectionPool durante o atendimento. Só usa a biblioteca
+padrão.
+
+Rotas:
+    GET    /categorias                 POST /categorias
+    GET    /categorias/<id>            PUT/DELETE /categorias/<id>
+    GET    /niveis                     POST /niveis
+    GET    /niveis/<id>                PUT/DELETE /niveis/<id>
+    GET    /pessoas?q=&categoria_id=&apos=&antes=&limite=
+    POST   /pessoas                    GET/PUT/DELETE /pessoas/<id>
+    GET    /turmas?professor=&nivel_id=&apos=&antes=&limite=
+    POST   /turmas                     GET/PUT/DELETE /turmas/<id>
+    GET    /logins?apos=&antes=&limite=
+    POST   /logins                     GET/DELETE /logins/<id>
+    POST   /sessoes  {email, senha}    GET/DELETE /sessoes/<token>
+
+As listagens são paginadas por chave: a resposta traz "proxima" (ou null),
+que é passada em ?apos= para buscar a página seguinte.
+
+As rotas que alteram dados (exceto POST/DELETE /sessoes) e as de /logins
+exigem o token de uma sessão válida no cabeçalho
+"Authorization: Bearer <token>"; sem ele a resposta é 401. O primeiro login
+é cadastrado pela linha de comando (login_service.py).
+
+Com --replica-segundos, as listagens (GET sem <id>) são lidas de uma réplica
+em memória atualizada nesse intervalo; a resposta traz o cabeçalho
+X-Replica-Atualizada-Em com o instante (ISO 8601) dos dados.
+"""
+import argparse
+import base64
+import json
+import os
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.connection_pool import ConnectionPool
+from bd.database import PERFIS_PRAGMA
+from bd.rastreamento import LIMITE_LENTO_PADRAO_MS
+from bd.replica_memoria import ReplicaMemoria
+from dao.categoria_dao import CategoriaDAO
+from dao.login_dao import LoginDAO
+from dao.nivel_dao import NivelDAO
+from dao.pessoa_dao import PessoaDAO
+from dao.turma_dao import TurmaDAO
+from model.categoria import Categoria
+from model.nivel import Nivel
+from model.pessoa import Pessoa, emailValido
+from model.turma import Turma
+from model.Login import Login
+from gerenciador_sessoes import GerenciadorSessoes
+from verificador_senhas import VerificadorSenhas
+
+LIMITE_PAGINA_PADRAO = 50
+LIMITE_PAGINA_MAXIMO = 500
+# Maior corpo JSON aceito em POST/PUT, em bytes
+TAMANHO_CORPO_MAXIMO = 1024 * 1024
+
+
+class ErroApi(Exception):
+    """Erro que vira uma resposta JSON com o status informado"""
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+def categoriaParaDict(categoria):
+    return {'id': categoria.id, 'nome': categoria.nome}
+
+
+def nivelParaDict(nivel):
+    return {'id': nivel.id, 'nome': nivel.nome}
+
+
+def pessoaParaDict(pessoa):
+    return {
+        'id': pessoa.id,
+        'nome': pessoa.nome,
+        'email': pessoa.email,
+        'data_nascimento': pessoa.data_nascimento,
+        'telefone': pessoa.telefone,
+        'categoria': categoriaParaDict(pessoa.categoria),
+    }
+
+
+def turmaParaDict(turma):
+    return {
+        'id': turma.id,
+        'horario': turma.horario,
+        'professor': turma.professor,
+        'nivel': nivelParaDict(turma.nivel),
+    }
+
+
+def loginParaDict(login):
+    # Nunca expõe o hash nem o salt
+    return {'id': login.id, 'email': login.email, 'usuario_id': login.usuario_id}
+
+
+def resumoLoginParaDict(resumo):
+    return resumo._asdict()
+
+
+def sessaoParaDict(sessao):
+    return {
+        'token': sessao.token,
+        'login_id': sessao.login_id,
+        'usuario_id': sessao.usuario_id,
+        'expira_em': sessao.expira_em,
+    }
+
+
+def codificarChave(chave):
+    """Chave de paginação -> cursor opaco para a URL"""
+    return base64.urlsafe_b64encode(json.dumps(list(chave)).encode('utf-8')).decode('ascii')
+
+
+def decodificarChave(cursor):
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode('ascii'))))
+    except (ValueError, TypeError):
+        raise ErroApi(400, "Cursor de paginação inválido")
+
+
+class ApiEscola:
+    """Operações da API, independentes do transporte HTTP"""
+
+    def __init__(self, pool: ConnectionPool, sessoes: GerenciadorSessoes, verificador: VerificadorSenhas,
+                 replica: ReplicaMemoria | None = None):
+        self.pool = pool
+        self.sessoes = sessoes
+        self.verificador = verificador
+        self.categoriaDao = CategoriaDAO(pool)
+        self.nivelDao = NivelDAO(pool)
+        self.pessoaDao = PessoaDAO(pool)
+        self.turmaDao = TurmaDAO(pool)
+        self.loginDao = LoginDAO(pool)
+
+        # As listagens podem vir de uma réplica em memória, sem disputar o banco com as escritas
+        self.replica = replica
+        if replica is not None:
+            self.categoriaDaoLeitura = CategoriaDAO(replica)
+            self.nivelDaoLeitura = NivelDAO(replica)
+            self.pessoaDaoLeitura = PessoaDAO(replica)
+            self.turmaDaoLeitura = TurmaDAO(replica)
+            self.loginDaoLeitura = LoginDAO(replica)
+        else:
+            self.categoriaDaoLeitura = self.categoriaDao
+            self.nivelDaoLeitura = self.nivelDao
+            self.pessoaDaoLeitura = self.pessoaDao
+            self.turmaDaoLeitura = self.turmaDao
+            self.loginDaoLeitura = self.loginDao
+        self.listagens = {self.listarCategorias, self.listarNiveis, self.listarPessoas,
+                          self.listarTurmas, self.listarLogins}
+
+        # (método, padrão da rota, função); os grupos do padrão viram argumentos
+        self.rotas = [
+            ('GET', r'/categorias', self.listarCategorias),
+            ('POST', r'/categorias', self.criarCategoria),
+            ('GET', r'/categorias/(\d+)', self.buscarCategoria),
+            ('PUT', r'/categorias/(\d+)', self.atualizarCategoria),
+            ('DELETE', r'/categorias/(\d+)', self.deletarCategoria),
+            ('GET', r'/niveis', self.listarNiveis),
+            ('POST', r'/niveis', self.criarNivel),
+            ('GET', r'/niveis/(\d+)', self.buscarNivel),
+            ('PUT', r'/niveis/(\d+)', self.atualizarNivel),
+            ('DELETE', r'/niveis/(\d+)', self.deletarNivel),
+            ('GET', r'/pessoas', self.listarPessoas),
+            ('POST', r'/pessoas', self.criarPessoa),
+            ('GET', r'/pessoas/(\d+)', self.buscarPessoa),
+            ('PUT', r'/pessoas/(\d+)', self.atualizarPessoa),
+            ('DELETE', r'/pessoas/(\d+)', self.deletarPessoa),
+            ('GET', r'/turmas', self.listarTurmas),
+            ('POST', r'/turmas', self.criarTurma),
+            ('GET', r'/turmas/(\d+)', self.buscarTurma),
+            ('PUT', r'/turmas/(\d+)', self.atualizarTurma),
+            ('DELETE', r'/turmas/(\d+)', self.deletarTurma),
+            ('GET', r'/logins', self.listarLogins),
+            ('POST', r'/logins', self.criarLogin),
+            ('GET', r'/logins/(\d+)', self.buscarLogin),
+            ('DELETE', r'/logins/(\d+)', self.deletarLogin),
+            ('POST', r'/sessoes', self.criarSessao),
+            ('GET', r'/sessoes/([\w-]+)', self.validarSessao),
+            ('DELETE', r'/sessoes/([\w-]+)', self.encerrarSessao),
+        ]
+        self.rotas = [(metodo, re.compile(padrao + r'/?'), funcao) for metodo, padrao, funcao in self.rotas]
+
+        # Exigem sessão: tudo o que altera dados, menos entrar e sair, e os logins
+        self.protegidas = {funcao for metodo, _, funcao in self.rotas if metodo != 'GET'}
+        self.protegidas -= {self.criarSessao, self.encerrarSessao}
+        self.protegidas |= {self.listarLogins, self.buscarLogin}
+        # Pegam conexões do pool só pelo tempo necessário (ex.: não durante o hash da senha)
+        self.gerenciamConexao = {self.criarSessao, self.criarLogin}
+
+    def despachar(self, metodo: str, caminho: str, parametros: dict, corpo, token: str | None = None):
+        """
+        Encontra a rota, confere a sessão (`token`) se a rota exigir e executa
+        a operação com uma conexão do pool (ou na réplica, para as listagens);
+        retorna (status, dados, cabeçalhos extras)
+        """
+        caminhoConhecido = False
+        for metodoRota, padrao, funcao in self.rotas:
+            encontrado = padrao.fullmatch(caminho)
+            if not encontrado:
+                continue
+            caminhoConhecido = True
+            if metodoRota != metodo:
+                continue
+
+            if funcao in self.protegidas:
+                self.autenticar(token)
+
+            argumentos = [int(g) if g.isdigit() else g for g in encontrado.groups()]
+            if metodo in ('GET', 'DELETE'):
+                argumentos.append(parametros)
+            else:
+                argumentos.append(corpo)
+
+            if self.replica is not None and funcao in self.listagens:
+                # A consulta inteira lê a mesma cópia, e o cabeçalho traz o instante dela
+                with self.replica.leitura() as atualizadaEm:
+                    status, dados = funcao(*argumentos)
+                atualizadaEm = datetime.fromtimestamp(atualizadaEm).astimezone()
+                return status, dados, {'X-Replica-Atualizada-Em': atualizadaEm.isoformat(timespec='milliseconds')}
+
+            if funcao in self.gerenciamConexao:
+                return (*funcao(*argumentos), {})
+
+            with self.pool.conexao():
+                return (*funcao(*argumentos), {})
+
+        if caminhoConhecido:
+            raise ErroApi(405, f"Método {metodo} não permitido em {caminho}")
+        raise ErroApi(404, f"Rota não encontrada: {caminho}")
+
+    def autenticar(self, token: str | None):
+        """Retorna a Sessao do token; sem token ou com sessão inválida, erro 401"""
+        if not token:
+            raise ErroApi(401, "Autenticação necessária (Authorization: Bearer <token>)")
+        with self.pool.conexao():
+            sessao = self.sessoes.validarSessao(token)
+        if sessao is None:
+            raise ErroApi(401, "Sessão inexistente ou expirada")
+        return sessao
+
+    # ----- auxiliares -----
+
+    @staticmethod
+    def campo(corpo: dict, nome: str, obrigatorio: bool = True):
+        valor = corpo.get(nome)
+        if isinstance(valor, str):
+            valor = valor.strip()
+        if obrigatorio and valor in (None, ''):
+            raise ErroApi(400, f"O campo '{nome}' é obrigatório")
+        return valor
+
+    @staticmethod
+    def inteiro(valor, nome: str):
+        try:
+            return int(valor)
+        except (TypeError, ValueError):
+            raise ErroApi(400, f"O campo '{nome}' deve ser um número inteiro")
+
+    @staticmethod
+    def parametro(parametros: dict, nome: str):
+        valores = parametros.get(nome)
+        return valores[0] if valores else None
+
+    def limite(self, parametros: dict):
+        limite = self.parametro(parametros, 'limite')
+        if limite is None:
+            return LIMITE_PAGINA_PADRAO
+        limite = self.inteiro(limite, 'limite')
+        if not 1 <= limite <= LIMITE_PAGINA_MAXIMO:
+            raise ErroApi(400, f"O limite deve estar entre 1 e {LIMITE_PAGINA_MAXIMO}")
+        return limite
+
+    def pagina(self, dao, listarPagina, parametros: dict, paraDict):
+        """
+        Página por chave: busca uma linha a mais para saber se existe página
+        seguinte no sentido da busca (próxima com apos=, anterior com antes=)
+        """
+        apos = self.parametro(parametros, 'apos')
+        antes = self.parametro(parametros, 'antes')
+        limite = self.limite(parametros)
+
+        itens = listarPagina(
+            apos=decodificarChave(apos) if apos else None,
+            antes=decodificarChave(antes) if antes else None,
+            limite=limite + 1,
+        )
+        if antes:
+            # Voltando, a linha a mais é a primeira; a chave de antes= é a próxima
+            temAnterior = len(itens) > limite
+            temProxima = True
+            itens = itens[-limite:]
+        else:
+            temProxima = len(itens) > limite
+            temAnterior = bool(apos)
+            itens = itens[:limite]
+        return 200, {
+            'itens': [paraDict(item) for item in itens],
+            'proxima': codificarChave(dao.chavePagina(itens[-1])) if itens and temProxima else None,
+            'anterior': codificarChave(dao.chavePagina(itens[0])) if itens and temAnterior else None,
+        }
+
+    @staticmethod
+    def encontrado(entidade, descricao: str, id):
+        if entidade is None:
+            raise ErroApi(404, f"{descricao} com ID {id} não encontrado(a)")
+        return entidade
+
+    # ----- categorias -----
+
+    def listarCategorias(self, parametros):
+        return 200, [categoriaParaDict(c) for c in self.categoriaDaoLeitura.listarTodas()]
+
+    def buscarCategoria(self, id, parametros):
+        return 200, categoriaParaDict(self.encontrado(self.categoriaDao.buscarPorId(id), "Categoria", id))
+
+    def criarCategoria(self, corpo):
+        nome = self.campo(corpo, 'nome')
+        existente = self.categoriaDao.buscarPorNome(nome)
+        if existente:
+            raise ErroApi(409, f"Já existe uma categoria com o nome '{nome}' (ID: {existente.id})")
+        categoria = Categoria(id=None, nome=nome)
+        self.categoriaDao.salvar(categoria)
+        return 201, categoriaParaDict(categoria)
+
+    def atualizarCategoria(self, id, corpo):
+        categoria = self.encontrado(self.categoriaDao.buscarPorId(id), "Categoria", id)
+        nome = self.campo(corpo, 'nome')
+        existente = self.categoriaDao.buscarPorNome(nome)
+        if existente and existente.id != id:
+            raise ErroApi(409, f"Já existe outra categoria com o nome '{nome}' (ID: {existente.id})")
+        categoria.nome = nome
+        self.categoriaDao.salvar(categoria)
+        return 200, categoriaParaDict(categoria)
+
+    def deletarCategoria(self, id, parametros):
+        categoria = self.encontrado(self.categoriaDao.buscarPorId(id), "Categoria", id)
+        self.categoriaDao.deletar(categoria)
+        return 204, None
+
+    # ----- níveis -----
+
+    def listarNiveis(self, parametros):
+        return 200, [nivelParaDict(n) for n in self.nivelDaoLeitura.listarTodas()]
+
+    def buscarNivel(self, id, parametros):
+        return 200, nivelParaDict(self.encontrado(self.nivelDao.buscarPorId(id), "Nível", id))
+
+    def criarNivel(self, corpo):
+        nome = self.campo(corpo, 'nome')
+        existente = self.nivelDao.buscarPorNome(nome)
+        if existente:
+            raise ErroApi(409, f"Já existe um nivel com o nome '{nome}' (ID: {existente.id})")
+        nivel = Nivel(id=None, nome=nome)
+        self.nivelDao.salvar(nivel)
+        return 201, nivelParaDict(nivel)
+
+    def atualizarNivel(self, id, corpo):
+        nivel = self.encontrado(self.nivelDao.buscarPorId(id), "Nível", id)
+        nome = self.campo(corpo, 'nome')
+        existente = self.nivelDao.buscarPorNome(nome)
+        if existente and existente.id != id:
+            raise ErroApi(409, f"Já existe outro nivel com o nome '{nome}' (ID: {existente.id})")
+        nivel.nome = nome
+        self.nivelDao.salvar(nivel)
+        return 200, nivelParaDict(nivel)
+
+    def deletarNivel(self, id, parametros):
+        nivel = self.encontrado(self.nivelDao.buscarPorId(id), "Nível", id)
+        self.nivelDao.deletar(nivel)
+        return 204, None
+
+    # ----- pessoas -----
+
+    def listarPessoas(self, parametros):
+        termo = self.parametro(parametros, 'q')
+        if termo:
+            pessoas = self.pessoaDaoLeitura.pesquisar(termo, self.limite(parametros))
+            return 200, {'itens': [pessoaParaDict(p) for p in pessoas]}
+
+        categoriaId = self.parametro(parametros, 'categoria_id')
+        if categoriaId:
+            categoriaId = self.inteiro(categoriaId, 'categoria_id')
+            return 200, {'itens': [pessoaParaDict(p) for p in self.pessoaDaoLeitura.buscarPorCategoria(categoriaId)]}
+
+        return self.pagina(self.pessoaDaoLeitura, self.pessoaDaoLeitura.listarPagina, parametros, pessoaParaDict)
+
+    def buscarPessoa(self, id, parametros):
+        return 200, pessoaParaDict(self.encontrado(self.pessoaDao.buscarPorId(id), "Pessoa", id))
+
+    def obterCategoria(self, corpo):
+        categoriaId = self.inteiro(self.campo(corpo, 'categoria_id'), 'categoria_id')
+        categoria = self.categoriaDao.buscarPorId(categoriaId)
+        if not categoria:
+            raise ErroApi(400, f"Categoria com ID {categoriaId} não encontrada")
+        return categoria
+
+    def emailPessoa(self, corpo):
+        email = self.campo(corpo, 'email')
+        if not emailValido(email):
+            raise ErroApi(400, f"Email inválido: '{email}'")
+        return email
+
+    def criarPessoa(self, corpo):
+        nome = self.campo(corpo, 'nome')
+        email = self.emailPessoa(corpo)
+        categoria = self.obterCategoria(corpo)
+
+        pessoaExistenteId = self.pessoaDao.emailEmUso(email)
+        if pessoaExistenteId is not None:
+            raise ErroApi(409, f"Já existe uma pessoa com o email '{email}' (ID: {pessoaExistenteId})")
+
+        pessoa = Pessoa(
+            id=None,
+            nome=nome,
+            email=email,
+            categoria=categoria,
+            data_nascimento=self.campo(corpo, 'data_nascimento', obrigatorio=False),
+            telefone=self.campo(corpo, 'telefone', obrigatorio=False)
+        )
+        self.pessoaDao.salvar(pessoa)
+        return 201, pessoaParaDict(pessoa)
+
+    def atualizarPessoa(self, id, corpo):
+        pessoa = self.encontrado(self.pessoaDao.buscarPorId(id), "Pessoa", id)
+
+        if 'nome' in corpo:
+            pessoa.nome = self.campo(corpo, 'nome')
+        if 'email' in corpo:
+            email = self.emailPessoa(corpo)
+            outraPessoaId = self.pessoaDao.emailEmUso(email, excetoId=id)
+            if outraPessoaId is not None:
+                raise ErroApi(409, f"Já existe outra pessoa com o email '{email}' (ID: {outraPessoaId})")
+            pessoa.email = email
+        if 'categoria_id' in corpo:
+            pessoa.categoria = self.obterCategoria(corpo)
+        if 'data_nascimento' in corpo:
+            pessoa.data_nascimento = self.campo(corpo, 'data_nascimento', obrigatorio=False)
+        if 'telefone' in corpo:
+            pessoa.telefone = self.campo(corpo, 'telefone', obrigatorio=False)
+
+        self.pessoaDao.salvar(pessoa)
+        return 200, pessoaParaDict(pessoa)
+
+    def deletarPessoa(self, id, parametros):
+        pessoa = self.encontrado(self.pessoaDao.buscarPorId(id), "Pessoa", id)
+        self.pessoaDao.deletar(pessoa)
+        return 204, None
+
+    # ----- turmas -----
+
+    def listarTurmas(self, parametros):
+        professor = self.parametro(parametros, 'professor')
+        if professor:
+            return 200, {'itens': [turmaParaDict(t) for t in self.turmaDaoLeitura.buscarPorProfessor(professor)]}
+
+        nivelId = self.parametro(parametros, 'nivel_id')
+        if nivelId:
+            nivelId = self.inteiro(nivelId, 'nivel_id')
+            return 200, {'itens': [turmaParaDict(t) for t in self.turmaDaoLeitura.buscarPorNivel(nivelId)]}
+
+        return self.pagina(self.turmaDaoLeitura, self.turmaDaoLeitura.listarPagina, parametros, turmaParaDict)
+
+    def buscarTurma(self, id, parametros):
+        return 200, turmaParaDict(self.encontrado(self.turmaDao.buscarPorId(id), "Turma", id))
+
+    def obterNivel(self, corpo):
+        nivelId = self.inteiro(self.campo(corpo, 'nivel_id'), 'nivel_id')
+        nivel = self.nivelDao.buscarPorId(nivelId)
+        if not nivel:
+            raise ErroApi(400, f"Nível com ID {nivelId} não encontrado")
+        return nivel
+
+    def criarTurma(self, corpo):
+        turma = Turma(
+            id=None,
+            horario=self.campo(corpo, 'horario'),
+            nivel=self.obterNivel(corpo),
+            professor=self.campo(corpo, 'professor')
+        )
+        self.turmaDao.salvar(turma)
+        return 201, turmaParaDict(turma)
+
+    def atualizarTurma(self, id, corpo):
+        turma = self.encontrado(self.turmaDao.buscarPorId(id), "Turma", id)
+        if 'horario' in corpo:
+            turma.horario = self.campo(corpo, 'horario')
+        if 'professor' in corpo:
+            turma.professor = self.campo(corpo, 'professor')
+        if 'nivel_id' in corpo:
+            turma.nivel = self.obterNivel(corpo)
+        self.turmaDao.salvar(turma)
+        return 200, turmaParaDict(turma)
+
+    def deletarTurma(self, id, parametros):
+        turma = self.encontrado(self.turmaDao.buscarPorId(id), "Turma", id)
+        self.turmaDao.deletar(turma)
+        return 204, None
+
+    # ----- logins e sessões -----
+
+    def listarLogins(self, parametros):
+        return self.pagina(self.loginDaoLeitura, self.loginDaoLeitura.listarPaginaComUsuario,
+                           parametros, resumoLoginParaDict)
+
+    def buscarLogin(self, id, parametros):
+        return 200, loginParaDict(self.encontrado(self.loginDao.buscarPorId(id), "Login", id))
+
+    def criarLogin(self, corpo):
+        usuarioId = self.inteiro(self.campo(corpo, 'usuario_id'), 'usuario_id')
+        senha = self.campo(corpo, 'senha')
+
+        with self.pool.conexao():
+            pessoa = self.pessoaDao.buscarPorId(usuarioId)
+            if not pessoa:
+                raise ErroApi(400, f"Pessoa com ID {usuarioId} não encontrada")
+            if self.loginDao.buscarPorUsuarioId(usuarioId):
+                raise ErroApi(409, "Esta pessoa já possui um login cadastrado")
+
+            email = self.campo(corpo, 'email', obrigatorio=False) or pessoa.email
+            if self.loginDao.emailExiste(email):
+                raise ErroApi(409, f"Já existe um login com o email '{email}'")
+
+        # O hash é gerado no pool do verificador, sem segurar uma conexão;
+        # um cadastro concorrente com o mesmo email esbarra no UNIQUE (409)
+        login = Login(id=None, email=email, senha=senha, usuario_id=usuarioId,
+                      gerar_hash=self.verificador.gerarHash)
+        with self.pool.conexao():
+            self.loginDao.salvar(login)
+        return 201, loginParaDict(login)
+
+    def deletarLogin(self, id, parametros):
+        login = self.encontrado(self.loginDao.buscarPorId(id), "Login", id)
+        self.sessoes.encerrarSessoesDoLogin(login.id)
+        self.loginDao.deletar(login)
+        return 204, None
+
+    def criarSessao(self, corpo):
+        """Autentica por email e senha e devolve um token de sessão"""
+        email = self.campo(corpo, 'email')
+        senha = self.campo(corpo, 'senha')
+
+        with self.pool.conexao():
+            login = self.loginDao.buscarPorEmail(email)
+        # O hash da senha é calculado sem segurar uma conexão do pool
+        if not login or not self.verificador.verificar(login, senha):
+            raise ErroApi(401, "Email ou senha incorretos")
+        rehash = login.precisa_rehash()
+        if rehash:
+            login.atualizar_hash(senha, self.verificador.gerarHash)
+
+        with self.pool.conexao():
+            if rehash:
+                self.loginDao.salvar(login)
+            return 201, sessaoParaDict(self.sessoes.criarSessao(login))
+
+    def validarSessao(self, token, parametros):
+        sessao = self.sessoes.validarSessao(token)
+        if sessao is None:
+            raise ErroApi(404, "Sessão inexistente ou expirada")
+        return 200, sessaoParaDict(sessao)
+
+    def encerrarSessao(self, token, parametros):
+        self.sessoes.encerrarSessao(token)
+        return 204, None
+
+
+class ManipuladorApi(BaseHTTPRequestHandler):
+    """Traduz as requisições HTTP para ApiEscola.despachar"""
+    # HTTP/1.1 mantém a conexão aberta entre requisições do mesmo terminal
+    protocol_version = 'HTTP/1.1'
+    # Cabeçalho e corpo saem em escritas separadas; com o Nagle ligado a
+    # resposta esperaria o ACK atrasado do cliente (~40 ms) em keep-alive
+    disable_nagle_algorithm = True
+    api: ApiEscola = None
+    silencioso = False
+
+    def lerCorpo(self):
+        try:
+            tamanho = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            tamanho = -1
+        if not 0 <= tamanho <= TAMANHO_CORPO_MAXIMO:
+            # O corpo não é lido, então a conexão não pode ser reaproveitada
+            self.close_connection = True
+            if tamanho < 0:
+                raise ErroApi(400, "Cabeçalho Content-Length inválido")
+            raise ErroApi(413, f"Corpo da requisição maior que {TAMANHO_CORPO_MAXIMO} bytes")
+        if not tamanho:
+            return {}
+        try:
+            corpo = json.loads(self.rfile.read(tamanho))
+        except ValueError:
+            raise ErroApi(400, "Corpo da requisição não é um JSON válido")
+        if not isinstance(corpo, dict):
+            raise ErroApi(400, "O corpo da requisição deve ser um objeto JSON")
+        return corpo
+
+    def lerToken(self):
+        """Token do cabeçalho Authorization: Bearer <token>, ou None"""
+        tipo, _, token = (self.headers.get('Authorization') or '').partition(' ')
+        if tipo.lower() != 'bearer':
+            return None
+        return token.strip() or None
+
+    def responder(self, status: int, dados, cabecalhos: dict | None = None):
+        corpo = b'' if dados is None else json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def atender(self, metodo: str):
+        url = urlsplit(self.path)
+        cabecalhos = {}
+        try:
+            corpo = self.lerCorpo() if metodo in ('POST', 'PUT') else None
+            status, dados, cabecalhos = self.api.despachar(metodo, url.path, parse_qs(url.query), corpo,
+                                                           self.lerToken())
+        except ErroApi as e:
+            status, dados = e.status, {'erro': e.mensagem}
+            if status == 401:
+                cabecalhos = {'WWW-Authenticate': 'Bearer'}
+        except sqlite3.IntegrityError as e:
+            status, dados = 409, {'erro': f"Violação de integridade: {e}"}
+        except TimeoutError:
+            # Todas as conexões do pool ocupadas além do timeout
+            status, dados = 503, {'erro': "Servidor ocupado, tente novamente"}
+        except Exception as e:
+            status, dados = 500, {'erro': f"Erro inesperado: {e}"}
+        self.responder(status, dados, cabecalhos)
+
+    def do_GET(self):
+        self.atender('GET')
+
+    def do_POST(self):
+        self.atender('POST')
+
+    def do_PUT(self):
+        self.atender('PUT')
+
+    def do_DELETE(self):
+        self.atender('DELETE')
+
+    def log_message(self, format, *args):
+        if not self.silencioso:
+            super().log_message(format, *args)
+
+
+def criarServidor(pool: ConnectionPool, host: str = '127.0.0.1', porta: int = 8000,
+                  sessoes: GerenciadorSessoes | None = None,
+                  verificador: VerificadorSenhas | None = None, silencioso: bool = False,
+                  replica: ReplicaMemoria | None = None):
+    """Cria o servidor (sem iniciá-lo); porta 0 escolhe uma porta livre"""
+    api = ApiEscola(pool, sessoes or GerenciadorSessoes(pool), verificador or VerificadorSenhas(), replica)
+    manipulador = type('ManipuladorEscola', (ManipuladorApi,), {'api': api, 'silencioso': silencioso})
+    servidor = ThreadingHTTPServer((host, porta), manipulador)
+    servidor.daemon_threads = True
+    servidor.api = api
+    return servidor
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="API HTTP/JSON da escola de forró")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    parser.add_argument('--banco', default='exemplo_bd.db', help="arquivo do banco SQLite")
+    parser.add_argument('--conexoes', type=int, default=8, help="tamanho do pool de conexões")
+    # WAL deixa as leituras concorrentes seguirem enquanto uma escrita acontece
+    parser.add_argument('--perfil', choices=list(PERFIS_PRAGMA), default='balanced',
+                        help="perfil de PRAGMA do SQLite (padrão: %(default)s)")
+    parser.add_argument('--silencioso', action='store_true', help="não registra cada requisição")
+    parser.add_argument('--rastrear-sql', action='store_true',
+                        help="mede os comandos SQL e mostra um resumo ao encerrar")
+    parser.add_argument('--sql-lento-ms', type=float, default=LIMITE_LENTO_PADRAO_MS,
+                        help="limite do log de consultas lentas, em ms (padrão: %(default)s)")
+    parser.add_argument('--log-sql-lento', default=None,
+                        help="arquivo do log de consultas lentas (padrão: stderr)")
+    parser.add_argument('--replica-segundos', type=float, default=None,
+                        help="lê as listagens de uma réplica em memória atualizada a cada N segundos")
+    args = parser.parse_args()
+
+    pool = ConnectionPool(args.banco, tamanho=args.conexoes, perfil=args.perfil)
+    if args.rastrear_sql:
+        pool.ativarRastreamento(args.sql_lento_ms, args.log_sql_lento)
+    with pool.conexao():
+        pool.criarTabelas()
+
+    sessoes = GerenciadorSessoes(pool)
+    sessoes.iniciarVarredura()
+    verificador = VerificadorSenhas()
+    replica = ReplicaMemoria(args.banco, intervalo=args.replica_segundos) if args.replica_segundos else None
+    servidor = criarServidor(pool, args.host, args.porta, sessoes, verificador, args.silencioso, replica)
+
+    print(f"🌐 API ouvindo em http://{args.host}:{servidor.server_address[1]} (Ctrl+C para encerrar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Encerrando o servidor...")
+    finally:
+        servidor.server_close()
+        sessoes.parar()
+        verificador.fechar()
+        if replica is not None:
+            replica.fechar()
+        pool.fechar()
+        print("✓ Conexões com banco de dados encerradas.")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from dao.turma_dao import TurmaDAO
 from dao.pessoa_dao import PessoaDAO
 from dao.nivel_dao import NivelDAO
 from model.turma import Turma
+from paginacao import navegarPaginas
 
 
 class TurmaService:
@@ -19,7 +20,8 @@ class TurmaService:
     def __init__(self, db: DatabaseConnection):
         self.db = db
         self.turmaDao = TurmaDAO(db)
-        self.pessoaDao = PessoaDAO(db)
+        # As pessoas só aparecem como candidatas a professor (nome e email)
+        self.pessoaDao = PessoaDAO(db, relacoesPreguicosas=True)
         self.nivelDao = NivelDAO(db)
 
     def exibirMenu(self):
@@ -147,24 +149,23 @@ class TurmaService:
         print("\n--- LISTAR TODAS AS TURMAS ---")
 
         try:
-            turmas = self.turmaDao.listarTodas()
-
-            if not turmas:
+            if not navegarPaginas(self.turmaDao, self.exibirPaginaTurmas):
                 print("⚠️  Nenhuma turma cadastrada.")
-                return
 
-            print(f"\nTotal de turmas: {len(turmas)}")
-            print("\n" + "-"*90)
-            print(f"{'ID':<5} | {'Horário':<15} | {'Nível':<20} | {'Professor':<30}")
-            print("-"*90)
+        except Exception as e:
+            print(f"❌ Erro ao listar turmas: {e}")
 
-            for turma in turmas:
-                print(f"{turma.id:<5} | {turma.horario:<15} | {turma.nivel.nome:<20} | {turma.professor[:29]:<30}")
+    def exibirPaginaTurmas(self, turmas, numeroPagina):
+        """Exibe uma página da listagem de turmas"""
+        print(f"\nPágina {numeroPagina}")
+        print("\n" + "-"*90)
+        print(f"{'ID':<5} | {'Horário':<15} | {'Nível':<20} | {'Professor':<30}")
+        print("-"*90)
 
-            print("-"*90)
+        for turma in turmas:
+            print(f"{turma.id:<5} | {turma.horario:<15} | {turma.nivel.nome:<20} | {turma.professor[:29]:<30}")
 
-        except Exception as e:
-            print(f"❌ Erro ao listar turmas: {e}")
+        print("-"*90)
 
     def buscarPorId(self):
         """Solicita um ID e busca a turma correspondente"""
@@ -0,0 +1,56 @@
+"""
+Pool de workers para gerar e verificar hashes de senha fora da thread que atende o usuário
+"""
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.senha_hasher import verificarSenha, obterHasherPadrao
+
+
+def _gerarHash(hasher, senha, salt):
+    return hasher.gerar(senha, salt)
+
+
+class VerificadorSenhas:
+    """
+    Executa o KDF (scrypt/PBKDF2) em um pool de workers. O hashlib libera o GIL
+    durante o cálculo, então um pool de threads já usa todos os núcleos;
+    usarProcessos=True troca por um pool de processos.
+    """
+
+    def __init__(self, maxWorkers: int | None = None, usarProcessos: bool = False):
+        maxWorkers = maxWorkers or os.cpu_count() or 1
+        if usarProcessos:
+            self.executor = ProcessPoolExecutor(max_workers=maxWorkers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='verificador-senhas')
+
+    def verificarAsync(self, login, senha: str):
+        """Agenda a verificação e retorna um Future[bool]"""
+        return self.executor.submit(verificarSenha, login.senha, login.salt, senha)
+
+    def verificar(self, login, senha: str):
+        """Verifica a senha no pool e espera o resultado"""
+        return self.verificarAsync(login, senha).result()
+
+    def gerarHashAsync(self, senha: str, salt: bytes):
+        """Agenda a geração de um hash com o algoritmo padrão e retorna um Future[str]"""
+        return self.executor.submit(_gerarHash, obterHasherPadrao(), senha, salt)
+
+    def gerarHash(self, senha: str, salt: bytes):
+        """Gera o hash no pool e espera o resultado (ver Login.gerar_hash_senha)"""
+        return self.gerarHashAsync(senha, salt).result()
+
+    def fechar(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
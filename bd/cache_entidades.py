@@ -0,0 +1,122 @@
+"""
+Cache de linhas compartilhado pelo processo para tabelas pequenas e de
+leitura frequente (categoria, nivel)
+
+Todas as DAOs de uma tabela no mesmo arquivo de banco usam o mesmo
+CacheEntidades, então uma busca repetida não vai ao banco. Não é um mapa de
+identidade: o cache guarda as linhas lidas (tuplas, imutáveis) e a DAO monta
+um objeto novo a cada busca, que pode ser alterado e salvo normalmente sem
+afetar o das outras threads. As escritas feitas pelas DAOs invalidam o cache da tabela depois do
+COMMIT. Commits de outras conexões (outro processo, outra thread do pool)
+são percebidos por PRAGMA data_version, verificado por conexão no máximo a
+cada `intervaloVerificacao` segundos.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CAPACIDADE_PADRAO = 1024
+INTERVALO_VERIFICACAO_PADRAO = 1.0
+
+# Conexões acompanhadas por cache; acima disso as referências são refeitas
+_MAXIMO_CONEXOES = 64
+
+
+class CacheEntidades:
+    """
+    LRU de linhas por chave (ex.: ('id', 3), ('nome', 'Aluno')).
+
+    `geracao` muda a cada invalidação: quem leu do banco guarda o resultado
+    com a geração lida antes da consulta, e a linha é descartada se o cache
+    foi invalidado no meio do caminho. Dentro de uma transação o cache não é
+    usado: a conexão pode ver alterações ainda não commitadas.
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_PADRAO,
+                 intervaloVerificacao: float = INTERVALO_VERIFICACAO_PADRAO):
+        self.capacidade = capacidade
+        self.intervaloVerificacao = intervaloVerificacao
+        self.geracao = 0
+        self.acertos = 0
+        self.faltas = 0
+        self._itens = OrderedDict()
+        # conexão -> (data_version, instante da última verificação)
+        self._versoes = {}
+        self._lock = threading.Lock()
+
+    def obter(self, db, chave):
+        """Linha guardada em `chave` ou None"""
+        conn = db.conectar()
+        if conn.in_transaction:
+            return None
+        with self._lock:
+            self._verificarVersao(conn)
+            linha = self._itens.get(chave)
+            if linha is None:
+                self.faltas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return linha
+
+    def guardar(self, db, chave, linha: tuple, geracao: int):
+        """Guarda uma linha lida do banco, se o cache não foi invalidado desde `geracao`"""
+        if db.conectar().in_transaction:
+            return
+        with self._lock:
+            if geracao != self.geracao:
+                return
+            self._itens[chave] = linha
+            self._itens.move_to_end(chave)
+            if len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def invalidar(self):
+        with self._lock:
+            self._limpar()
+
+    def _limpar(self):
+        self._itens.clear()
+        self.geracao += 1
+
+    def _verificarVersao(self, conn):
+        agora = time.monotonic()
+        registro = self._versoes.get(conn)
+        if registro is not None and agora - registro[1] < self.intervaloVerificacao:
+            return
+
+        versao = conn.execute("PRAGMA data_version;").fetchone()[0]
+        if registro is None or registro[0] != versao:
+            # Conexão ainda sem referência ou commit de outra conexão desde a última verificação
+            self._limpar()
+            if registro is None and len(self._versoes) >= _MAXIMO_CONEXOES:
+                self._versoes.clear()
+        self._versoes[conn] = (versao, agora)
+
+
+_caches = {}
+_lockCaches = threading.Lock()
+
+
+def cacheDaTabela(db, tabela: str):
+    """Cache compartilhado de `tabela` no banco de `db`; None para bancos em memória"""
+    if db.dbPath == ':memory:':
+        return None
+    chave = (os.path.abspath(db.dbPath), tabela)
+    with _lockCaches:
+        cache = _caches.get(chave)
+        if cache is None:
+            cache = _caches[chave] = CacheEntidades()
+        return cache
+
+
+def invalidarCaches(dbPath: str):
+    """Invalida os caches de todas as tabelas de um banco (ex.: após limparDados)"""
+    if dbPath == ':memory:':
+        return
+    caminho = os.path.abspath(dbPath)
+    with _lockCaches:
+        caches = [cache for (arquivo, _), cache in _caches.items() if arquivo == caminho]
+    for cache in caches:
+        cache.invalidar()
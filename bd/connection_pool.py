@@ -0,0 +1,219 @@
+"""
+Pool de conexões thread-safe com o banco de dados SQLite
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from bd.database import DatabaseConnection, PERFIL_PADRAO
+
+
+class _ReservaThread:
+    """
+    Guardada no threading.local da thread que reservou uma conexão. Se a
+    thread terminar sem devolvê-la (DAO usado fora de `with pool.conexao()`),
+    o local é descartado e __del__ devolve a conexão ao pool.
+    """
+    __slots__ = ('pool', 'conn')
+
+    def __init__(self, pool, conn):
+        self.pool = pool
+        self.conn = conn
+
+    def __del__(self):
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            self.pool._liberar(conn)
+
+
+class ConnectionPool(DatabaseConnection):
+    """
+    Mantém até `tamanho` conexões abertas e entrega uma por thread.
+
+    Pode ser passado aos DAOs no lugar de um DatabaseConnection: cursor()
+    usa a conexão reservada para a thread atual. O uso recomendado é
+    dentro de `with pool.conexao():`, que devolve a conexão ao pool no fim
+    do bloco. Fora de um bloco, a conexão fica presa à thread até
+    devolverConexao() ou até a thread terminar.
+    """
+
+    def __init__(self, dbPath: str = 'exemplo_bd.db', tamanho: int = 5, timeout: float = 30.0,
+                 perfil: str = PERFIL_PADRAO):
+        super().__init__(dbPath, perfil)
+        if tamanho < 1:
+            raise ValueError("O tamanho do pool deve ser pelo menos 1")
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self._livres = queue.LifoQueue()
+        self._vagas = threading.BoundedSemaphore(tamanho)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._abertas = set()
+        self._fechado = False
+
+    def _novaConexao(self):
+        # check_same_thread=False: a conexão pode ser usada por threads
+        # diferentes ao longo da vida, mas nunca por duas ao mesmo tempo
+        conn = self.abrirConexao(check_same_thread=False)
+        with self._lock:
+            self._abertas.add(conn)
+        return conn
+
+    def _descartar(self, conn):
+        with self._lock:
+            self._abertas.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _conexaoSaudavel(self, conn):
+        """Verifica se a conexão ainda responde antes de entregá-la"""
+        try:
+            conn.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _retirarConexao(self):
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                return self._novaConexao()
+
+            if self._conexaoSaudavel(conn):
+                return conn
+            self._descartar(conn)
+
+    def obterConexao(self):
+        """Reserva uma conexão para a thread atual (reentrante)"""
+        local = self._local
+        if getattr(local, 'conn', None) is not None:
+            local.contagem += 1
+            return local.conn
+
+        if self._fechado:
+            raise sqlite3.ProgrammingError("O pool de conexões está fechado")
+        if not self._vagas.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Nenhuma conexão livre no pool após {self.timeout}s")
+
+        try:
+            conn = self._retirarConexao()
+        except Exception:
+            self._vagas.release()
+            raise
+
+        local.conn = conn
+        local.contagem = 1
+        local.reserva = _ReservaThread(self, conn)
+        return conn
+
+    def devolverConexao(self):
+        """Libera a conexão reservada pela thread atual"""
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            return
+
+        local.contagem -= 1
+        if local.contagem > 0:
+            return
+        local.conn = None
+        local.reserva.conn = None
+        local.reserva = None
+        self._liberar(conn)
+
+    def _liberar(self, conn):
+        """Devolve uma conexão à fila de livres e libera a vaga"""
+        # Uma transação esquecida aberta não pode vazar para o próximo usuário
+        self._niveisTransacao.pop(conn, None)
+        self._aposCommit.pop(conn, None)
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._descartar(conn)
+            conn = None
+
+        if conn is not None:
+            if self._fechado:
+                self._descartar(conn)
+            else:
+                self._livres.put(conn)
+        self._vagas.release()
+
+    @contextmanager
+    def conexao(self):
+        """Context manager que reserva uma conexão durante o bloco"""
+        conn = self.obterConexao()
+        try:
+            yield conn
+        finally:
+            self.devolverConexao()
+
+    def definirPerfil(self, perfil: str):
+        """Troca o perfil; conexões livres são descartadas e reabertas com o novo perfil"""
+        self.perfil = self.validarPerfil(perfil)
+
+        local = self._local
+        if getattr(local, 'conn', None) is not None:
+            self.aplicarPerfil(local.conn)
+
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(conn)
+
+    @contextmanager
+    def transacao(self):
+        """Unidade de trabalho que mantém a conexão da thread reservada até o fim"""
+        with self.conexao():
+            with super().transacao() as conn:
+                yield conn
+
+    def conectar(self):
+        local = self._local
+        if getattr(local, 'conn', None) is not None:
+            return local.conn
+        return self.obterConexao()
+
+    def cursor(self, tuplas: bool = False):
+        """Retorna um cursor da conexão reservada para a thread atual"""
+        return self.novoCursor(self.conectar(), tuplas)
+
+    def fechar(self):
+        """Fecha as conexões livres; as que estão em uso são fechadas ao serem devolvidas"""
+        self._fechado = True
+
+        local = self._local
+        if getattr(local, 'conn', None) is not None:
+            local.contagem = 1
+            self.devolverConexao()
+
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(conn)
+
+        self.imprimirResumoRastreamento()
+
+    def ativarRastreamento(self, *args, **kwargs):
+        """Como em DatabaseConnection, valendo também para as conexões já abertas do pool"""
+        rastreador = super().ativarRastreamento(*args, **kwargs)
+        with self._lock:
+            for conn in self._abertas:
+                rastreador.instrumentar(conn)
+        return rastreador
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+        return False
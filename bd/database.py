@@ -2,31 +2,227 @@
 Classe para gerenciar conexão com o banco de dados SQLite
 """
 import sqlite3
+import sys
+from contextlib import contextmanager
+
+from bd.cache_entidades import invalidarCaches
+from bd.rastreamento import RastreadorSql, CursorRastreado, LIMITE_LENTO_PADRAO_MS
+
+# Perfis de PRAGMA aplicados a cada conexão aberta
+#   durable:   fsync a cada commit, mantendo o journal_mode atual do arquivo
+#   balanced:  WAL (leitores não bloqueiam o escritor) e fsync apenas nos checkpoints
+#   bulk-load: WAL sem fsync, cache grande e temporários em memória, para cargas em massa
+PERFIS_PRAGMA = {
+    'durable': {
+        'synchronous': 'FULL',
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+    },
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -262144,     # 256 MiB (valor negativo = KiB)
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456,    # 256 MiB
+    },
+}
+
+PERFIL_PADRAO = 'durable'
+
+# Quantidade de linhas lidas por fetchmany nos métodos iterar* dos DAOs
+TAMANHO_LOTE_PADRAO = 500
 
 class DatabaseConnection:
-    def __init__(self, dbPath: str = 'exemplo_bd.db'):
+    def __init__(self, dbPath: str = 'exemplo_bd.db', perfil: str = PERFIL_PADRAO):
         self.dbPath = dbPath
         self.conn = None
+        self.perfil = self.validarPerfil(perfil)
+        # Profundidade de transacao() aberta em cada conexão
+        self._niveisTransacao = {}
+        # Funções a executar depois do COMMIT da transação aberta em cada conexão
+        self._aposCommit = {}
+        # Estatísticas de SQL; None enquanto o rastreamento estiver desligado
+        self.rastreador = None
+
+    @staticmethod
+    def validarPerfil(perfil: str):
+        if perfil not in PERFIS_PRAGMA:
+            opcoes = ", ".join(PERFIS_PRAGMA)
+            raise ValueError(f"Perfil de banco desconhecido: '{perfil}' (opções: {opcoes})")
+        return perfil
+
+    def aplicarPerfil(self, conn):
+        """Aplica os PRAGMAs do perfil atual em uma conexão"""
+        for pragma, valor in PERFIS_PRAGMA[self.perfil].items():
+            if pragma == 'journal_mode':
+                self.aplicarJournalMode(conn, valor)
+            else:
+                conn.execute(f"PRAGMA {pragma} = {valor}")
+
+    def aplicarJournalMode(self, conn, modo: str):
+        """
+        Troca o journal_mode só quando ele difere do atual: a troca precisa de
+        acesso exclusivo ao arquivo e falharia com outras conexões abertas
+        """
+        atual = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if atual.upper() == modo.upper():
+            return
+        try:
+            conn.execute(f"PRAGMA journal_mode = {modo}")
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Não foi possível mudar o journal_mode de {atual} para {modo}: {e}", file=sys.stderr)
+
+    def definirPerfil(self, perfil: str):
+        """Troca o perfil de PRAGMA, aplicando-o também à conexão já aberta"""
+        self.perfil = self.validarPerfil(perfil)
+        if self.conn is not None:
+            self.aplicarPerfil(self.conn)
+
+    def abrirConexao(self, caminho: str | None = None, **kwargs):
+        """
+        Abre uma nova conexão sqlite3 já configurada (row_factory, foreign keys
+        e perfil) com `caminho`, ou com dbPath
+        """
+        # isolation_level=None ativa autocommit (cada operação é commitada automaticamente);
+        # para agrupar operações use transacao()
+        conn = sqlite3.connect(caminho or self.dbPath, isolation_level=None, **kwargs)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        self.aplicarPerfil(conn)
+        if self.rastreador is not None:
+            self.rastreador.instrumentar(conn)
+        return conn
+
+    def ativarRastreamento(self, limiteLentoMs: float = LIMITE_LENTO_PADRAO_MS, arquivoLento: str | None = None):
+        """
+        Passa a medir cada comando SQL (contagem, tempo, linhas, método de DAO
+        de origem). Comandos acima de limiteLentoMs vão para o log de lentas
+        (arquivoLento, ou stderr). O resumo é impresso em fechar().
+        """
+        self.rastreador = RastreadorSql(limiteLentoMs, arquivoLento)
+        if self.conn is not None:
+            self.rastreador.instrumentar(self.conn)
+        return self.rastreador
+
+    def novoCursor(self, conn, tuplas: bool = False):
+        """Cursor da conexão; com rastreamento ativo, um CursorRastreado"""
+        if self.rastreador is None:
+            cur = conn.cursor()
+        else:
+            cur = conn.cursor(CursorRastreado)
+            cur.rastreador = self.rastreador
+        if tuplas:
+            cur.row_factory = None
+        return cur
+
+    def imprimirResumoRastreamento(self):
+        if self.rastreador is not None:
+            self.rastreador.imprimirResumo()
 
     def conectar(self):
         if self.conn is None:
-            # isolation_level=None ativa autocommit (cada operação é commitada automaticamente)
-            self.conn = sqlite3.connect(self.dbPath, isolation_level=None)
-            self.conn.row_factory = sqlite3.Row
-            self.conn.execute("PRAGMA foreign_keys = ON")
+            self.conn = self.abrirConexao()
         return self.conn
 
+    @contextmanager
+    def transacao(self):
+        """
+        Unidade de trabalho: tudo o que os DAOs fizerem dentro do bloco é
+        commitado de uma vez no final. Blocos aninhados viram SAVEPOINTs.
+        Uma exceção desfaz o bloco em que ocorreu e segue propagando,
+        desfazendo também os blocos externos que não a tratarem.
+        """
+        conn = self.conectar()
+        nivel = self._niveisTransacao.get(conn, 0)
+
+        if nivel == 0:
+            # IMMEDIATE reserva a escrita logo no início e evita SQLITE_BUSY
+            # ao promover uma leitura para escrita com outras conexões ativas
+            conn.execute("BEGIN IMMEDIATE;")
+        else:
+            conn.execute(f"SAVEPOINT sp_{nivel};")
+        self._niveisTransacao[conn] = nivel + 1
+
+        try:
+            yield conn
+        except BaseException:
+            self._desfazer(conn, nivel)
+            raise
+        else:
+            try:
+                if nivel == 0:
+                    conn.execute("COMMIT;")
+                else:
+                    conn.execute(f"RELEASE sp_{nivel};")
+            except BaseException:
+                # Ex.: COMMIT com o banco bloqueado; a transação continua aberta
+                self._desfazer(conn, nivel)
+                raise
+        finally:
+            if nivel == 0:
+                self._niveisTransacao.pop(conn, None)
+                funcoes = self._aposCommit.pop(conn, ())
+            else:
+                self._niveisTransacao[conn] = nivel
+                funcoes = ()
+
+        # Só chega aqui sem exceção, ou seja, depois do COMMIT
+        for funcao in funcoes:
+            funcao()
+
+    def _desfazer(self, conn, nivel: int):
+        """
+        Desfaz o bloco de transacao() no `nivel`. Uma falha aqui só é avisada:
+        a exceção que levou ao rollback é a que deve seguir propagando.
+        """
+        try:
+            if nivel == 0:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK;")
+            else:
+                conn.execute(f"ROLLBACK TO sp_{nivel};")
+                conn.execute(f"RELEASE sp_{nivel};")
+        except sqlite3.Error as e:
+            print(f"⚠️  Falha ao desfazer a transação: {e}", file=sys.stderr)
+
+    def aposCommit(self, funcao):
+        """
+        Executa `funcao` depois do COMMIT da transacao() aberta nesta conexão,
+        ou já, se não houver uma. Se a transação for desfeita, não executa.
+        """
+        conn = self.conectar()
+        if self._niveisTransacao.get(conn, 0) == 0:
+            funcao()
+        else:
+            self._aposCommit.setdefault(conn, []).append(funcao)
+
+    def idsInseridos(self, quantidade: int):
+        """
+        Retorna os IDs gerados pelo último executemany de INSERT nesta conexão.
+        Dentro de uma transação o SQLite atribui os IDs de AUTOINCREMENT em
+        sequência, então eles terminam em last_insert_rowid().
+        """
+        ultimoId = self.cursor().execute("SELECT last_insert_rowid();").fetchone()[0]
+        return range(ultimoId - quantidade + 1, ultimoId + 1)
+
     def fechar(self):
         """Fecha a conexão com o banco de dados"""
         if self.conn:
             self.conn.close()
             self.conn = None
+        self.imprimirResumoRastreamento()
 
-    def cursor(self):
-        """Retorna um cursor para executar queries"""
+    def cursor(self, tuplas: bool = False):
+        """
+        Retorna um cursor para executar queries. As linhas vêm como sqlite3.Row;
+        com tuplas=True vêm como tuplas simples, mais baratas para os DAOs
+        que convertem resultados grandes com um Mapeador.
+        """
         if self.conn is None:
             self.conectar()
-        return self.conn.cursor()
+        return self.novoCursor(self.conn, tuplas)
 
     def criarTabelas(self):
         cur = self.cursor()
@@ -44,7 +240,7 @@ class DatabaseConnection:
         CREATE TABLE IF NOT EXISTS pessoa(
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 nome TEXT NOT NULL,
-                email VARCHAR(100) UNIQUE,
+                email VARCHAR(100),
                 data_nascimento VARCHAR(20),
                 telefone VARCHAR(20),
                 categoria_id INTEGER NOT NULL,
@@ -83,12 +279,196 @@ class DatabaseConnection:
         );
         """)
 
+        # Tabela sessao (SHA-256 dos tokens de sessão; apagados junto com o login)
+        self.descartarSessoesAntigas()
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS sessao(
+                token_hash TEXT PRIMARY KEY,
+                login_id INTEGER NOT NULL,
+                usuario_id INTEGER NOT NULL,
+                criada_em REAL NOT NULL,
+                expira_em REAL NOT NULL,
+                FOREIGN KEY (login_id) REFERENCES login(id) ON DELETE CASCADE
+        ) WITHOUT ROWID;
+        """)
+
+        self.criarIndices()
+        self.criarIndiceBuscaPessoa()
+        self.criarIndiceBuscaProfessor()
+
+    def descartarSessoesAntigas(self):
+        """
+        Bancos antigos guardavam o token da sessão em texto puro (coluna token).
+        Sessões são descartáveis: a tabela é apagada e recriada, e os usuários
+        só precisam entrar de novo
+        """
+        cur = self.cursor()
+        cur.execute("SELECT 1 FROM pragma_table_info('sessao') WHERE name = 'token';")
+        if cur.fetchone() is not None:
+            print("⚠️  Tabela sessao no formato antigo (token em texto puro): sessões encerradas")
+            cur.execute("DROP TABLE sessao;")
+
+    def criarIndices(self):
+        """Cria os índices secundários usados pelas consultas dos DAOs"""
+        cur = self.cursor()
+
+        # PessoaDAO: listagens e paginação em ORDER BY nome, id
+        # (o id é o rowid, que todo índice já carrega no final)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_pessoa_nome ON pessoa(nome);")
+
+        # PessoaDAO.emailEmUso: email único sem diferenciar maiúsculas/minúsculas
+        self.verificarEmailsDuplicados()
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pessoa_email_nocase ON pessoa(email COLLATE NOCASE);")
+
+        # PessoaDAO.buscarPorCategoria: filtro por categoria já ordenado por nome
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_pessoa_categoria_nome ON pessoa(categoria_id, nome);")
+
+        # TurmaDAO: buscarPorNivel e listagens em ORDER BY nivel_id, horario, id
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_turma_nivel_horario ON turma(nivel_id, horario);")
+
+        # LoginDAO.buscarPorUsuarioId (login.email já é UNIQUE e tem índice próprio)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_login_usuario_id ON login(usuario_id);")
+
+        # Sessões: varredura das expiradas e remoção em cascata pelo login
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sessao_expira_em ON sessao(expira_em);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_sessao_login_id ON sessao(login_id);")
+
+    def verificarEmailsDuplicados(self):
+        """
+        Antes de criar idx_pessoa_email_nocase em um banco antigo: emails que só
+        diferem em maiúsculas/minúsculas impediriam o índice, então são listados
+        em um erro para serem corrigidos à mão
+        """
+        cur = self.cursor()
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_pessoa_email_nocase';")
+        if cur.fetchone() is not None:
+            return
+
+        cur.execute("""
+            SELECT lower(email), group_concat(id, ', ')
+            FROM (SELECT id, email FROM pessoa WHERE email IS NOT NULL ORDER BY id)
+            GROUP BY lower(email) HAVING count(*) > 1
+            ORDER BY lower(email);
+        """)
+        duplicados = cur.fetchall()
+        if duplicados:
+            linhas = "\n".join(f"   {email} (IDs: {ids})" for email, ids in duplicados)
+            raise sqlite3.IntegrityError(
+                "Não é possível criar o índice único de email: há pessoas com o mesmo email "
+                f"(sem diferenciar maiúsculas/minúsculas):\n{linhas}"
+            )
+
+    def criarIndiceBuscaPessoa(self):
+        """
+        Cria o índice FTS5 de nome/email das pessoas e os triggers que o
+        mantêm sincronizado com a tabela pessoa (usado por PessoaDAO.pesquisar)
+        """
+        cur = self.cursor()
+        cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'pessoa_fts';")
+        jaExistia = cur.fetchone() is not None
+
+        # Tabela de conteúdo externo: o texto fica só em pessoa, o FTS guarda o índice.
+        # remove_diacritics faz "joao" encontrar "João"
+        cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS pessoa_fts USING fts5(
+                nome,
+                email,
+                content='pessoa',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+        );
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS pessoa_fts_insert AFTER INSERT ON pessoa BEGIN
+                INSERT INTO pessoa_fts (rowid, nome, email) VALUES (new.id, new.nome, new.email);
+        END;
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS pessoa_fts_delete AFTER DELETE ON pessoa BEGIN
+                INSERT INTO pessoa_fts (pessoa_fts, rowid, nome, email)
+                VALUES ('delete', old.id, old.nome, old.email);
+        END;
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS pessoa_fts_update AFTER UPDATE OF nome, email ON pessoa BEGIN
+                INSERT INTO pessoa_fts (pessoa_fts, rowid, nome, email)
+                VALUES ('delete', old.id, old.nome, old.email);
+                INSERT INTO pessoa_fts (rowid, nome, email) VALUES (new.id, new.nome, new.email);
+        END;
+        """)
+
+        # Bancos criados antes do índice já têm pessoas: indexa todas uma vez
+        if not jaExistia:
+            cur.execute("INSERT INTO pessoa_fts (pessoa_fts) VALUES ('rebuild');")
+
+    def removerIndiceBuscaPessoa(self):
+        """
+        Apaga pessoa_fts e seus triggers, para cargas em massa sem indexar linha
+        a linha; criarIndiceBuscaPessoa() os recria e indexa todas as pessoas
+        de uma vez (rebuild). Enquanto isso PessoaDAO.pesquisar não funciona.
+        """
+        cur = self.cursor()
+        for trigger in ('pessoa_fts_insert', 'pessoa_fts_delete', 'pessoa_fts_update'):
+            cur.execute(f"DROP TRIGGER IF EXISTS {trigger};")
+        cur.execute("DROP TABLE IF EXISTS pessoa_fts;")
+
+    def criarIndiceBuscaProfessor(self):
+        """
+        Cria o índice de trigramas de turma.professor e os triggers que o mantêm
+        sincronizado (usado por TurmaDAO.buscarPorProfessor)
+        """
+        cur = self.cursor()
+        cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'turma_professor_fts';")
+        jaExistia = cur.fetchone() is not None
+
+        # O tokenizer trigram permite que LIKE '%x%' (3+ caracteres) use o índice
+        cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS turma_professor_fts USING fts5(
+                professor,
+                content='turma',
+                content_rowid='id',
+                tokenize='trigram'
+        );
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS turma_professor_fts_insert AFTER INSERT ON turma BEGIN
+                INSERT INTO turma_professor_fts (rowid, professor) VALUES (new.id, new.professor);
+        END;
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS turma_professor_fts_delete AFTER DELETE ON turma BEGIN
+                INSERT INTO turma_professor_fts (turma_professor_fts, rowid, professor)
+                VALUES ('delete', old.id, old.professor);
+        END;
+        """)
+
+        cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS turma_professor_fts_update AFTER UPDATE OF professor ON turma BEGIN
+                INSERT INTO turma_professor_fts (turma_professor_fts, rowid, professor)
+                VALUES ('delete', old.id, old.professor);
+                INSERT INTO turma_professor_fts (rowid, professor) VALUES (new.id, new.professor);
+        END;
+        """)
+
+        if not jaExistia:
+            cur.execute("INSERT INTO turma_professor_fts (turma_professor_fts) VALUES ('rebuild');")
+
     def limparDados(self):
         """Remove todos os dados das tabelas"""
-        cur = self.cursor()
-        cur.execute("DELETE FROM login;")
-        cur.execute("DELETE FROM turma;")
-        cur.execute("DELETE FROM pessoa;")
-        cur.execute("DELETE FROM categoria;")
-        cur.execute("DELETE FROM nivel;")
-        cur.execute("DELETE FROM sqlite_sequence WHERE name IN ('pessoa', 'categoria', 'turma', 'login', 'nivel');")
\ No newline at end of file
+        with self.transacao():
+            cur = self.cursor()
+            cur.execute("DELETE FROM sessao;")
+            cur.execute("DELETE FROM login;")
+            cur.execute("DELETE FROM turma;")
+            cur.execute("DELETE FROM pessoa;")
+            cur.execute("DELETE FROM categoria;")
+            cur.execute("DELETE FROM nivel;")
+            cur.execute("DELETE FROM sqlite_sequence WHERE name IN ('pessoa', 'categoria', 'turma', 'login', 'nivel');")
+
+        # As escritas desta conexão não mudam o data_version que ela mesma enxerga
+        invalidarCaches(self.dbPath)
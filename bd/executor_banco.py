@@ -0,0 +1,64 @@
+"""
+Executor que roda as operações de banco fora do event loop do asyncio
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from bd.connection_pool import ConnectionPool
+from bd.database import PERFIL_PADRAO
+
+class ExecutorBanco:
+    """
+    Pool de threads dedicado ao SQLite, com uma conexão por worker.
+
+    As chamadas ao sqlite3 bloqueiam a thread; aqui elas rodam nos workers e
+    o event loop só aguarda o resultado. O número de workers limita quantos
+    comandos ficam em andamento ao mesmo tempo; as demais chamadas esperam
+    na fila do executor, sem ocupar o loop. Os DAOs recebem `pool`, que
+    entrega a cada worker a sua própria conexão.
+    """
+
+    def __init__(self, dbPath: str = 'exemplo_bd.db', maxWorkers: int = 4, perfil: str = PERFIL_PADRAO):
+        # Uma vaga no pool por worker: nenhum worker espera por conexão
+        self.pool = ConnectionPool(dbPath, tamanho=maxWorkers, perfil=perfil)
+        self._executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='banco')
+
+    def _executarComConexao(self, funcao, *args, **kwargs):
+        with self.pool.conexao():
+            return funcao(*args, **kwargs)
+
+    def _executarEmTransacao(self, funcao, *args, **kwargs):
+        with self.pool.transacao():
+            return funcao(*args, **kwargs)
+
+    async def executar(self, funcao, *args, **kwargs):
+        """Roda funcao(*args, **kwargs) em um worker e aguarda o resultado"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(self._executarComConexao, funcao, *args, **kwargs)
+        )
+
+    async def executarEmTransacao(self, funcao, *args, **kwargs):
+        """Como executar(), mas tudo o que a função fizer é commitado de uma vez"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(self._executarEmTransacao, funcao, *args, **kwargs)
+        )
+
+    def criarTabelas(self):
+        with self.pool.conexao():
+            self.pool.criarTabelas()
+
+    def fechar(self):
+        """Aguarda as operações em andamento e fecha as conexões"""
+        self._executor.shutdown(wait=True)
+        self.pool.fechar()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # shutdown(wait=True) bloqueia: roda fora do loop
+        await asyncio.to_thread(self.fechar)
+        return False
@@ -0,0 +1,246 @@
+"""
+Rastreamento opcional do SQL executado (contagem, latência, linhas e log de consultas lentas)
+
+Ativado com DatabaseConnection.ativarRastreamento(). Os cursores criados por
+DatabaseConnection.cursor() passam a ser CursorRastreado, que mede o tempo de
+execute/executemany e das leituras (fetch*), conta as linhas devolvidas e
+descobre qual método de DAO fez a chamada. Os comandos que não passam por
+esses cursores (BEGIN/COMMIT de transacao(), PRAGMAs) são contados pelo
+set_trace_callback da conexão, sem tempo.
+"""
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+LIMITE_LENTO_PADRAO_MS = 100.0
+
+_LITERAL_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_LITERAL_NUMERO = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_LISTA_PARAMETROS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACOS = re.compile(r"\s+")
+
+
+def normalizarSql(sql: str):
+    """Agrupa comandos iguais: literais viram ?, listas IN (?, ?, ...) viram (?...), espaços são unificados"""
+    sql = _LITERAL_TEXTO.sub('?', sql)
+    sql = _LITERAL_NUMERO.sub('?', sql)
+    sql = _LISTA_PARAMETROS.sub('(?...)', sql)
+    return _ESPACOS.sub(' ', sql).strip().rstrip(';').strip()
+
+
+# Métodos de infraestrutura do pacote bd que não contam como origem de um comando
+_METODOS_INTERNOS = {
+    'cursor', 'novoCursor', 'conectar', 'abrirConexao', 'aplicarPerfil', 'aplicarJournalMode', 'transacao', '_desfazer',
+    'conexao', 'obterConexao', 'devolverConexao', 'idsInseridos',
+}
+
+
+def origemDaChamada():
+    """
+    'ClasseDAO.metodo' mais próximo na pilha. Sem DAO na pilha, o primeiro
+    método do pacote bd que não seja infraestrutura (ex.:
+    'DatabaseConnection.criarTabelas') ou 'modulo.funcao' de quem chamou.
+    """
+    frame = sys._getframe(1)
+    externo = None
+    while frame is not None:
+        modulo = frame.f_globals.get('__name__', '')
+        funcao = frame.f_code.co_name
+        instancia = frame.f_locals.get('self')
+        if modulo.startswith('dao.') and instancia is not None:
+            return f"{type(instancia).__name__}.{funcao}"
+        if externo is None and not modulo.startswith(('bd.rastreamento', 'sqlite3', 'contextlib')):
+            if not modulo.startswith('bd.'):
+                externo = f"{modulo}.{funcao}"
+            elif instancia is not None and funcao not in _METODOS_INTERNOS:
+                externo = f"{type(instancia).__name__}.{funcao}"
+        frame = frame.f_back
+    return externo or '?'
+
+
+class EstatisticaSql:
+    """Totais de um comando normalizado chamado de uma origem"""
+    __slots__ = ('sql', 'origem', 'execucoes', 'tempoTotal', 'tempoMaximo', 'linhas')
+
+    def __init__(self, sql: str, origem: str):
+        self.sql = sql
+        self.origem = origem
+        self.execucoes = 0
+        self.tempoTotal = 0.0
+        self.tempoMaximo = 0.0
+        self.linhas = 0
+
+
+class RastreadorSql:
+    """Acumula as estatísticas por (SQL normalizado, origem) e grava o log de consultas lentas"""
+
+    def __init__(self, limiteLentoMs: float = LIMITE_LENTO_PADRAO_MS, arquivoLento: str | None = None):
+        self.limiteLento = limiteLentoMs / 1000
+        self.arquivoLento = arquivoLento
+        self.estatisticas = {}
+        self._lock = threading.Lock()
+        # Marca a thread que está dentro de um CursorRastreado, para o
+        # trace callback não contar de novo o mesmo comando
+        self._local = threading.local()
+
+    def instrumentar(self, conn: sqlite3.Connection):
+        """Conta pelo trace callback os comandos que não passam por um CursorRastreado"""
+        conn.set_trace_callback(self._aoRastrear)
+
+    def _aoRastrear(self, sql: str):
+        if getattr(self._local, 'emCursor', False):
+            return
+        self.registrar(sql, origemDaChamada(), None, 0)
+
+    def _estatistica(self, sql: str, origem: str):
+        chave = (normalizarSql(sql), origem)
+        estatistica = self.estatisticas.get(chave)
+        if estatistica is None:
+            estatistica = self.estatisticas[chave] = EstatisticaSql(*chave)
+        return estatistica
+
+    def registrar(self, sql: str, origem: str, duracao: float | None, linhas: int):
+        """Registra uma execução concluída (duracao None = não medida)"""
+        with self._lock:
+            estatistica = self._estatistica(sql, origem)
+            estatistica.execucoes += 1
+            estatistica.linhas += linhas
+            if duracao is not None:
+                estatistica.tempoTotal += duracao
+                estatistica.tempoMaximo = max(estatistica.tempoMaximo, duracao)
+
+        if duracao is not None and duracao >= self.limiteLento:
+            self.registrarLenta(sql, origem, duracao, linhas)
+
+    def registrarLenta(self, sql: str, origem: str, duracao: float, linhas: int):
+        linha = (f"{datetime.now().isoformat(timespec='milliseconds')} {duracao * 1000:.1f}ms "
+                 f"linhas={linhas} origem={origem} sql={_ESPACOS.sub(' ', sql).strip()}")
+        if self.arquivoLento:
+            with self._lock, open(self.arquivoLento, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(linha + "\n")
+        else:
+            print(f"🐢 SQL lento: {linha}", file=sys.stderr)
+
+    def resumo(self):
+        """Estatísticas ordenadas pelo tempo total (as mais caras primeiro)"""
+        with self._lock:
+            return sorted(self.estatisticas.values(), key=lambda e: (e.tempoTotal, e.execucoes), reverse=True)
+
+    def imprimirResumo(self, limite: int = 20):
+        estatisticas = self.resumo()
+        if not estatisticas:
+            return
+
+        print("\n" + "=" * 120)
+        print("  RESUMO DO SQL EXECUTADO")
+        print("=" * 120)
+        print(f"{'Execs':>7} | {'Total (ms)':>10} | {'Máx (ms)':>9} | {'Linhas':>8} | {'Origem':<38} | SQL")
+        print("-" * 120)
+        for e in estatisticas[:limite]:
+            print(f"{e.execucoes:>7} | {e.tempoTotal * 1000:>10.2f} | {e.tempoMaximo * 1000:>9.2f} | "
+                  f"{e.linhas:>8} | {e.origem[:38]:<38} | {e.sql[:60]}")
+        if len(estatisticas) > limite:
+            print(f"... mais {len(estatisticas) - limite} comando(s)")
+        print("-" * 120)
+
+
+class CursorRastreado(sqlite3.Cursor):
+    """
+    Cursor que mede cada execução. Como o SQLite produz as linhas sob demanda,
+    o tempo das leituras entra na mesma execução; ela é registrada quando o
+    resultado termina, no próximo execute ou em close().
+    """
+    rastreador: RastreadorSql = None
+
+    def _iniciar(self, sql: str):
+        self._finalizar()
+        self._sql = sql
+        self._origem = origemDaChamada()
+        self._duracao = 0.0
+        self._linhas = 0
+
+    def _finalizar(self):
+        if getattr(self, '_sql', None) is None:
+            return
+        self.rastreador.registrar(self._sql, self._origem, self._duracao, self._linhas)
+        self._sql = None
+
+    def _medir(self, metodo, *args):
+        local = self.rastreador._local
+        local.emCursor = True
+        inicio = time.perf_counter()
+        try:
+            return metodo(*args)
+        finally:
+            self._duracao += time.perf_counter() - inicio
+            local.emCursor = False
+
+    def execute(self, sql, parametros=()):
+        self._iniciar(sql)
+        try:
+            self._medir(super().execute, sql, parametros)
+        finally:
+            if self.description is None:
+                self._finalizar()
+        return self
+
+    def executemany(self, sql, sequencia):
+        self._iniciar(sql)
+        try:
+            self._medir(super().executemany, sql, sequencia)
+        finally:
+            self._finalizar()
+        return self
+
+    def executescript(self, script):
+        self._iniciar(script)
+        try:
+            self._medir(super().executescript, script)
+        finally:
+            self._finalizar()
+        return self
+
+    def fetchone(self):
+        row = self._medir(super().fetchone)
+        if row is None:
+            self._finalizar()
+        else:
+            self._contar(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._medir(super().fetchmany, self.arraysize if size is None else size)
+        self._contar(len(rows))
+        if not rows:
+            self._finalizar()
+        return rows
+
+    def fetchall(self):
+        rows = self._medir(super().fetchall)
+        self._contar(len(rows))
+        self._finalizar()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._medir(super().__next__)
+        except StopIteration:
+            self._finalizar()
+            raise
+        self._contar(1)
+        return row
+
+    def _contar(self, quantidade: int):
+        if getattr(self, '_sql', None) is not None:
+            self._linhas += quantidade
+
+    def close(self):
+        self._finalizar()
+        super().close()
+
+    def __del__(self):
+        # Cursores abandonados no meio do resultado (ex.: fetchone de um único registro)
+        self._finalizar()
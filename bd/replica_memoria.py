@@ -0,0 +1,182 @@
+"""
+Réplica somente leitura de um banco em disco, mantida em memória
+"""
+import itertools
+import os
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from urllib.parse import quote
+
+from bd.database import DatabaseConnection
+
+# Nomes dos bancos em memória valem para o processo inteiro
+_numerosCopia = itertools.count(1)
+
+
+class _Copia:
+    """Uma cópia publicada: URI do banco em memória, instante e a conexão que o mantém vivo"""
+    __slots__ = ('uri', 'atualizadaEm', 'ancora')
+
+    def __init__(self, uri, atualizadaEm, ancora):
+        self.uri = uri
+        self.atualizadaEm = atualizadaEm
+        self.ancora = ancora
+
+
+class _LeitorThread:
+    """
+    Conexão de leitura de uma thread, guardada no threading.local. Quando a
+    thread passa para outra cópia ou termina, a conexão deixa de ser
+    referenciada e o sqlite3 a fecha assim que o último cursor aberto nela
+    (ex.: um iterar* ainda em andamento) for descartado.
+    """
+    __slots__ = ('conn', 'copia', 'fixada', '__weakref__')
+
+    def __init__(self, conn, copia):
+        self.conn = conn
+        self.copia = copia
+        # Profundidade de leitura() aberta na thread
+        self.fixada = 0
+
+    def fechar(self):
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            conn.close()
+
+
+class ReplicaMemoria(DatabaseConnection):
+    """
+    Cópia do banco `origem` em um banco em memória de cache compartilhado
+    (file:...?mode=memory&cache=shared), feita com a API de backup do SQLite.
+    Pode ser passada aos DAOs no lugar de um DatabaseConnection para
+    relatórios e listagens: as leituras não disputam locks com as escritas do
+    banco em disco, mas veem os dados do momento da última cópia
+    (`atualizadaEm`, segundos desde a época).
+
+    A cópia é refeita em atualizar() ou, com `intervalo`, por uma thread em
+    segundo plano. Cada atualização grava um banco em memória novo, com nome
+    próprio, e só então o publica. Cada thread lê por uma conexão própria;
+    dentro de `with replica.leitura()` ela fica presa à mesma cópia até o fim
+    do bloco, e fora dele cada consulta usa a cópia mais nova.
+    """
+
+    def __init__(self, origem: str = 'exemplo_bd.db', intervalo: float | None = None):
+        super().__init__(':memory:')
+        self.origem = origem
+        self._atual = None
+        self._local = threading.local()
+        self._leitores = weakref.WeakSet()
+        self._lockAtualizacao = threading.Lock()
+        # Protege a troca da cópia publicada e a abertura de conexões com ela
+        self._lockPublicacao = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self.atualizar()
+        if intervalo:
+            self.iniciarAtualizacao(intervalo)
+
+    @property
+    def atualizadaEm(self):
+        """Instante da cópia mais nova (as leituras fixadas podem estar em uma anterior)"""
+        return self._atual.atualizadaEm
+
+    def atualizar(self):
+        """Copia o banco de origem agora; retorna o novo instante de atualização"""
+        with self._lockAtualizacao:
+            # A cópia vale pelo menos a partir do instante em que começou
+            inicio = time.time()
+            uri = f"file:replica-{os.getpid()}-{next(_numerosCopia)}?mode=memory&cache=shared"
+            # mode=ro: a origem nunca é criada nem alterada pela réplica
+            fonte = sqlite3.connect(f"file:{quote(os.path.abspath(self.origem))}?mode=ro", uri=True)
+            try:
+                ancora = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                try:
+                    fonte.backup(ancora)
+                except BaseException:
+                    ancora.close()
+                    raise
+            finally:
+                fonte.close()
+
+            with self._lockPublicacao:
+                anterior, self._atual = self._atual, _Copia(uri, inicio, ancora)
+                # As leituras em andamento usam conexões próprias, que mantêm a
+                # cópia anterior viva até a thread passar para a nova
+                if anterior is not None:
+                    anterior.ancora.close()
+            return inicio
+
+    def idade(self):
+        """Segundos desde o início da última cópia"""
+        return time.time() - self.atualizadaEm
+
+    def _leitor(self):
+        """Leitor da thread atual, passando para a cópia mais nova fora de leitura()"""
+        leitor = getattr(self._local, 'leitor', None)
+        if leitor is not None and (leitor.fixada or leitor.copia is self._atual):
+            return leitor
+
+        with self._lockPublicacao:
+            copia = self._atual
+            conn = self.abrirConexao(copia.uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON;")
+        novo = _LeitorThread(conn, copia)
+        self._leitores.add(novo)
+        self._local.leitor = novo
+        return novo
+
+    @contextmanager
+    def leitura(self):
+        """
+        Fixa a thread em uma cópia durante o bloco, para todas as consultas
+        verem os mesmos dados; retorna o instante dessa cópia
+        """
+        leitor = self._leitor()
+        leitor.fixada += 1
+        try:
+            yield leitor.copia.atualizadaEm
+        finally:
+            leitor.fixada -= 1
+
+    def conectar(self):
+        return self._leitor().conn
+
+    def cursor(self, tuplas: bool = False):
+        """Retorna um cursor da conexão de leitura da thread atual"""
+        return self.novoCursor(self.conectar(), tuplas)
+
+    def iniciarAtualizacao(self, intervalo: float):
+        """Refaz a cópia a cada `intervalo` segundos em uma thread daemon"""
+        if self._thread is not None:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._atualizarPeriodicamente, args=(intervalo,),
+                                        name="replica-memoria", daemon=True)
+        self._thread.start()
+
+    def _atualizarPeriodicamente(self, intervalo: float):
+        while not self._parar.wait(intervalo):
+            try:
+                self.atualizar()
+            except sqlite3.Error as e:
+                # Mantém a cópia anterior; a idade mostra que ela está ficando velha
+                print(f"⚠️  Falha ao atualizar a réplica em memória: {e}", file=sys.stderr)
+
+    def parar(self):
+        """Encerra a atualização periódica"""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def fechar(self):
+        self.parar()
+        for leitor in list(self._leitores):
+            leitor.fechar()
+        with self._lockPublicacao:
+            self._atual.ancora.close()
+        super().fechar()
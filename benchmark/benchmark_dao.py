@@ -0,0 +1,353 @@
+"""
+Micro-benchmark dos métodos dos DAOs sobre bancos sintéticos em várias escalas
+
+Gera um banco com N pessoas (e turmas, logins e categorias em proporções de
+uma escola real), mede cada método dos DAOs e grava ops/s e latências
+p50/p99 em JSON, para comparar resultados entre commits:
+
+    python benchmark/benchmark_dao.py --escala 100k --saida antes.json
+    python benchmark/benchmark_dao.py --escala 100k --comparar antes.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection, PERFIS_PRAGMA
+from dao.categoria_dao import CategoriaDAO
+from dao.login_dao import LoginDAO
+from dao.nivel_dao import NivelDAO
+from dao.pessoa_dao import PessoaDAO
+from dao.turma_dao import TurmaDAO
+from model.categoria import Categoria
+from model.Login import Login
+from model.nivel import Nivel
+from model.pessoa import Pessoa
+from model.senha_hasher import Pbkdf2Hasher, definirHasherPadrao
+from model.turma import Turma
+
+ESCALAS = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Proporções do banco sintético em relação ao número de pessoas
+PESSOAS_POR_TURMA = 20
+PROPORCAO_LOGINS = 0.3
+CATEGORIAS = ["Aluno", "Professor", "Monitor", "Secretaria"]
+NIVEIS = ["Iniciante", "Básico", "Intermediário", "Avançado", "Profissional"]
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Heitor", "Íris", "João",
+         "Karina", "Lucas", "Marina", "Nando", "Olívia", "Paulo", "Quitéria", "Rafael", "Sara", "Tiago"]
+SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Lima", "Pereira", "Costa", "Rodrigues",
+              "Almeida", "Nascimento", "Araújo", "Ferreira", "Gonçalves", "Lacerda", "Barbosa"]
+
+TAMANHO_CARGA = 10_000
+
+
+def parseEscala(valor: str):
+    valor = valor.lower()
+    if valor in ESCALAS:
+        return ESCALAS[valor]
+    try:
+        return int(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"escala inválida: '{valor}' (use {', '.join(ESCALAS)} ou um número)")
+
+
+def nomeSintetico(i: int):
+    return f"{NOMES[i % len(NOMES)]} {SOBRENOMES[(i // len(NOMES)) % len(SOBRENOMES)]} {i}"
+
+
+def emailSintetico(i: int):
+    return f"pessoa{i}@escola.com"
+
+
+def gerarBanco(db, quantidadePessoas: int):
+    """Popula o banco em lotes; retorna o resumo do conjunto de dados"""
+    categorias = [Categoria(id=None, nome=nome) for nome in CATEGORIAS]
+    CategoriaDAO(db).salvarMuitos(categorias)
+    niveis = [Nivel(id=None, nome=nome) for nome in NIVEIS]
+    NivelDAO(db).salvarMuitos(niveis)
+
+    pessoaDao = PessoaDAO(db)
+    for inicio in range(0, quantidadePessoas, TAMANHO_CARGA):
+        fim = min(inicio + TAMANHO_CARGA, quantidadePessoas)
+        pessoaDao.salvarMuitos(
+            Pessoa(id=None, nome=nomeSintetico(i), email=emailSintetico(i),
+                   categoria=categorias[i % len(categorias)], telefone=f"(11) 9{i:08d}")
+            for i in range(inicio, fim)
+        )
+
+    quantidadeTurmas = max(1, quantidadePessoas // PESSOAS_POR_TURMA)
+    turmaDao = TurmaDAO(db)
+    for inicio in range(0, quantidadeTurmas, TAMANHO_CARGA):
+        fim = min(inicio + TAMANHO_CARGA, quantidadeTurmas)
+        turmaDao.salvarMuitos(
+            Turma(id=None, horario=f"{8 + i % 14}:{(i % 2) * 30:02d}", nivel=niveis[i % len(niveis)],
+                  professor=nomeSintetico(i * 7 + 3))
+            for i in range(inicio, fim)
+        )
+
+    # Os ids das pessoas são sequenciais a partir de 1; login para as primeiras
+    quantidadeLogins = int(quantidadePessoas * PROPORCAO_LOGINS)
+    loginDao = LoginDAO(db)
+    for inicio in range(0, quantidadeLogins, TAMANHO_CARGA):
+        fim = min(inicio + TAMANHO_CARGA, quantidadeLogins)
+        loginDao.salvarMuitos(
+            Login(id=None, email=emailSintetico(i), senha=f"senha{i}", usuario_id=i + 1)
+            for i in range(inicio, fim)
+        )
+
+    return {
+        'pessoas': quantidadePessoas,
+        'turmas': quantidadeTurmas,
+        'logins': quantidadeLogins,
+        'categorias': len(categorias),
+        'niveis': len(niveis),
+    }
+
+
+def percentil(ordenados, p):
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def medir(funcao, argumentos, tempoMaximo: float):
+    """Chama funcao(*args) para cada item de argumentos; para antes se passar de tempoMaximo"""
+    latencias = []
+    inicioTotal = time.perf_counter()
+    for args in argumentos:
+        inicio = time.perf_counter()
+        funcao(*args)
+        fim = time.perf_counter()
+        latencias.append(fim - inicio)
+        if fim - inicioTotal > tempoMaximo:
+            break
+
+    total = sum(latencias)
+    latencias.sort()
+    return {
+        'execucoes': len(latencias),
+        'ops_s': len(latencias) / total if total else None,
+        'media_ms': statistics.mean(latencias) * 1000,
+        'p50_ms': percentil(latencias, 0.50) * 1000,
+        'p99_ms': percentil(latencias, 0.99) * 1000,
+    }
+
+
+def casos(db, dados: dict, repeticoes: int, repeticoesVarredura: int, semente: int):
+    """
+    Lista (nome, função, argumentos) de cada método medido. Consultas pontuais
+    rodam `repeticoes` vezes; as que percorrem boa parte de uma tabela
+    (listarTodas, buscarPorCategoria, LIKE...) rodam `repeticoesVarredura` vezes.
+    """
+    aleatorio = random.Random(semente)
+    categoriaDao = CategoriaDAO(db)
+    nivelDao = NivelDAO(db)
+    pessoaDao = PessoaDAO(db)
+    turmaDao = TurmaDAO(db)
+    loginDao = LoginDAO(db)
+
+    nPessoas, nTurmas, nLogins = dados['pessoas'], dados['turmas'], dados['logins']
+    categorias = categoriaDao.listarTodas()
+    niveis = nivelDao.listarTodas()
+
+    def idPessoa():
+        return aleatorio.randint(1, nPessoas)
+
+    def vezes(gerar, quantidade=repeticoes):
+        return [gerar() for _ in range(quantidade)]
+
+    # Objetos carregados antes da medição para os UPDATEs
+    pessoasAlvo = [pessoaDao.buscarPorId(idPessoa()) for _ in range(min(repeticoes, 200))]
+    turmasAlvo = [turmaDao.buscarPorId(aleatorio.randint(1, nTurmas)) for _ in range(min(repeticoes, 200))]
+    loginsAlvo = [loginDao.buscarPorId(aleatorio.randint(1, nLogins)) for _ in range(min(repeticoes, 200))] if nLogins else []
+
+    novasPessoas = []
+
+    def novaPessoa():
+        i = len(novasPessoas)
+        pessoa = Pessoa(id=None, nome=f"Nova Pessoa {i}", email=f"nova{i}@bench.com",
+                        categoria=aleatorio.choice(categorias))
+        novasPessoas.append(pessoa)
+        return pessoa
+
+    lista = [
+        ("CategoriaDAO.buscarPorId", categoriaDao.buscarPorId, vezes(lambda: (aleatorio.choice(categorias).id,))),
+        ("CategoriaDAO.buscarPorNome", categoriaDao.buscarPorNome, vezes(lambda: (aleatorio.choice(categorias).nome,))),
+        ("CategoriaDAO.listarTodas", categoriaDao.listarTodas, vezes(tuple)),
+        ("CategoriaDAO.salvar (update)", categoriaDao.salvar, vezes(lambda: (aleatorio.choice(categorias),))),
+        ("NivelDAO.buscarPorId", nivelDao.buscarPorId, vezes(lambda: (aleatorio.choice(niveis).id,))),
+        ("NivelDAO.buscarPorNome", nivelDao.buscarPorNome, vezes(lambda: (aleatorio.choice(niveis).nome,))),
+        ("NivelDAO.listarTodas", nivelDao.listarTodas, vezes(tuple)),
+
+        ("PessoaDAO.buscarPorId", pessoaDao.buscarPorId, vezes(lambda: (idPessoa(),))),
+        ("PessoaDAO.buscarPorNome", pessoaDao.buscarPorNome,
+         vezes(lambda: (f"{aleatorio.choice(SOBRENOMES)} {idPessoa()}",), repeticoesVarredura)),
+        ("PessoaDAO.pesquisar", pessoaDao.pesquisar, vezes(lambda: (f"{aleatorio.choice(NOMES)} {idPessoa()}",))),
+        ("PessoaDAO.emailEmUso", pessoaDao.emailEmUso, vezes(lambda: (emailSintetico(idPessoa() - 1).upper(),))),
+        ("PessoaDAO.listarPagina", pessoaDao.listarPagina,
+         vezes(lambda: ((nomeSintetico(idPessoa() - 1), 0), None, 50))),
+        ("PessoaDAO.listarPaginaSemLogin", pessoaDao.listarPaginaSemLogin,
+         vezes(lambda: ((nomeSintetico(idPessoa() - 1), 0), None, 50))),
+        ("PessoaDAO.buscarPorCategoria", pessoaDao.buscarPorCategoria,
+         vezes(lambda: (aleatorio.choice(categorias).id,), repeticoesVarredura)),
+        ("PessoaDAO.listarTodas", pessoaDao.listarTodas, vezes(tuple, repeticoesVarredura)),
+        ("PessoaDAO.listarSemLogin", pessoaDao.listarSemLogin, vezes(tuple, repeticoesVarredura)),
+        ("PessoaDAO.salvar (insert)", pessoaDao.salvar, vezes(lambda: (novaPessoa(),))),
+        ("PessoaDAO.salvar (update)", pessoaDao.salvar, vezes(lambda: (aleatorio.choice(pessoasAlvo),))),
+        ("PessoaDAO.salvarMuitos (100)", pessoaDao.salvarMuitos,
+         vezes(lambda: ([novaPessoa() for _ in range(100)],), max(1, repeticoes // 100))),
+
+        ("TurmaDAO.buscarPorId", turmaDao.buscarPorId, vezes(lambda: (aleatorio.randint(1, nTurmas),))),
+        ("TurmaDAO.buscarPorProfessor", turmaDao.buscarPorProfessor,
+         vezes(lambda: (nomeSintetico(aleatorio.randint(0, nTurmas - 1) * 7 + 3),))),
+        ("TurmaDAO.buscarPorNivel", turmaDao.buscarPorNivel,
+         vezes(lambda: (aleatorio.choice(niveis).id,), repeticoesVarredura)),
+        ("TurmaDAO.listarPagina", turmaDao.listarPagina,
+         vezes(lambda: ((aleatorio.choice(niveis).id, "12:00", 0), None, 50))),
+        ("TurmaDAO.listarTodas", turmaDao.listarTodas, vezes(tuple, repeticoesVarredura)),
+        ("TurmaDAO.salvar (update)", turmaDao.salvar, vezes(lambda: (aleatorio.choice(turmasAlvo),))),
+    ]
+
+    if nLogins:
+        lista += [
+            ("LoginDAO.buscarPorId", loginDao.buscarPorId, vezes(lambda: (aleatorio.randint(1, nLogins),))),
+            ("LoginDAO.buscarPorEmail", loginDao.buscarPorEmail,
+             vezes(lambda: (emailSintetico(aleatorio.randint(0, nLogins - 1)),))),
+            ("LoginDAO.buscarPorUsuarioId", loginDao.buscarPorUsuarioId,
+             vezes(lambda: (aleatorio.randint(1, nLogins),))),
+            ("LoginDAO.emailExiste", loginDao.emailExiste, vezes(lambda: (emailSintetico(idPessoa() - 1),))),
+            ("LoginDAO.listarPaginaComUsuario", loginDao.listarPaginaComUsuario,
+             vezes(lambda: ((emailSintetico(aleatorio.randint(0, nLogins - 1)),), None, 50))),
+            ("LoginDAO.listarTodos", loginDao.listarTodos, vezes(tuple, repeticoesVarredura)),
+            ("LoginDAO.listarComUsuario", loginDao.listarComUsuario, vezes(tuple, repeticoesVarredura)),
+            ("LoginDAO.salvar (update)", loginDao.salvar, vezes(lambda: (aleatorio.choice(loginsAlvo),))),
+        ]
+
+    # deletar por último: remove as pessoas inseridas pelos casos acima
+    # (gerador avaliado só na medição, depois dos inserts)
+    lista.append(("PessoaDAO.deletar", pessoaDao.deletar, ((p,) for p in novasPessoas if p.id is not None)))
+    return lista
+
+
+def versaoCodigo():
+    """Commit atual do repositório, se houver git disponível"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar(args):
+    with tempfile.TemporaryDirectory(dir=args.diretorio) as diretorio:
+        # A carga inicial usa o perfil bulk-load; a medição, o perfil pedido
+        db = DatabaseConnection(os.path.join(diretorio, 'bench_dao.db'), perfil='bulk-load')
+        try:
+            db.conectar()
+            db.criarTabelas()
+
+            print(f"⏳ Gerando banco com {args.escala} pessoas...")
+            inicio = time.perf_counter()
+            dados = gerarBanco(db, args.escala)
+            db.cursor().execute("ANALYZE;")
+            tempoCarga = time.perf_counter() - inicio
+            print(f"✓ Banco gerado em {tempoCarga:.1f}s: {dados}")
+
+            db.definirPerfil(args.perfil)
+            resultados = {}
+            for nome, funcao, argumentos in casos(db, dados, args.repeticoes, args.repeticoesVarredura, args.semente):
+                resultado = medir(funcao, argumentos, args.tempoMaximo)
+                resultados[nome] = resultado
+                print(f"{nome:<36} | {resultado['execucoes']:>6} | {resultado['ops_s'] or 0:>11.0f} | "
+                      f"{resultado['p50_ms']:>9.3f} | {resultado['p99_ms']:>9.3f}")
+        finally:
+            db.fechar()
+
+    return {
+        'meta': {
+            'commit': versaoCodigo(),
+            'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'plataforma': platform.platform(),
+            'perfil': args.perfil,
+            'repeticoes': args.repeticoes,
+            'repeticoes_varredura': args.repeticoesVarredura,
+            'semente': args.semente,
+        },
+        'dados': dados,
+        'carga_s': tempoCarga,
+        'resultados': resultados,
+    }
+
+
+def comparar(atual: dict, arquivoBase: str):
+    """Mostra a variação de ops/s e p99 em relação a um resultado anterior"""
+    with open(arquivoBase, encoding='utf-8') as arquivo:
+        base = json.load(arquivo)
+
+    print("\n" + "=" * 80)
+    print(f"  COMPARAÇÃO com {arquivoBase} (commit {base['meta'].get('commit')})")
+    print("=" * 80)
+    print(f"{'Método':<36} | {'ops/s base':>11} | {'ops/s atual':>11} | {'Δ ops/s':>8} | {'Δ p99':>8}")
+    print("-" * 80)
+    for nome, resultado in atual['resultados'].items():
+        anterior = base['resultados'].get(nome)
+        if not anterior or not anterior['ops_s'] or not resultado['ops_s']:
+            continue
+        deltaOps = resultado['ops_s'] / anterior['ops_s'] - 1
+        deltaP99 = resultado['p99_ms'] / anterior['p99_ms'] - 1 if anterior['p99_ms'] else 0
+        print(f"{nome:<36} | {anterior['ops_s']:>11.0f} | {resultado['ops_s']:>11.0f} | "
+              f"{deltaOps:>+8.0%} | {deltaP99:>+8.0%}")
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Micro-benchmark dos DAOs em bancos sintéticos")
+    parser.add_argument('--escala', type=parseEscala, default=ESCALAS['1k'],
+                        help=f"pessoas no banco: {', '.join(ESCALAS)} ou um número (padrão: 1k)")
+    parser.add_argument('--repeticoes', type=int, default=1000, help="execuções das consultas pontuais")
+    parser.add_argument('--repeticoes-varredura', dest='repeticoesVarredura', type=int, default=5,
+                        help="execuções das consultas que percorrem a tabela")
+    parser.add_argument('--tempo-maximo', dest='tempoMaximo', type=float, default=10.0,
+                        help="segundos máximos por método")
+    parser.add_argument('--perfil', choices=list(PERFIS_PRAGMA), default='durable',
+                        help="perfil de PRAGMA durante a medição")
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--saida', default=None, help="arquivo JSON com os resultados")
+    parser.add_argument('--comparar', default=None, help="JSON de uma execução anterior para comparação")
+    parser.add_argument('--diretorio', default=None, help="diretório do banco temporário")
+    args = parser.parse_args()
+
+    # Os logins sintéticos não medem o KDF: uma iteração só para gerar o hash
+    definirHasherPadrao(Pbkdf2Hasher(iteracoes=1))
+
+    print("=" * 80)
+    print(f"  BENCHMARK DOS DAOs - {args.escala} pessoas, perfil '{args.perfil}'")
+    print("=" * 80)
+    print(f"{'Método':<36} | {'Execs':>6} | {'ops/s':>11} | {'p50 (ms)':>9} | {'p99 (ms)':>9}")
+    print("-" * 80)
+
+    resultado = executar(args)
+
+    saida = args.saida or f"benchmark_dao_{args.escala}.json"
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados gravados em {saida}")
+
+    if args.comparar:
+        comparar(resultado, args.comparar)
+
+
+if __name__ == "__main__":
+    main()
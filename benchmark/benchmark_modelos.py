@@ -0,0 +1,190 @@
+"""
+Benchmark da materialização de objetos do modelo (memória e velocidade)
+
+Compara o formato anterior dos modelos (properties sobre atributos privados
+em um __dict__, criados a partir de sqlite3.Row pelo nome da coluna) com o
+atual (__slots__ preenchidos pelo Mapeador a partir de tuplas), listando
+todas as pessoas de um banco sintético.
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from dao.pessoa_dao import PessoaDAO
+
+
+class CategoriaAntiga:
+    """Categoria como era antes dos __slots__"""
+
+    def __init__(self, id, nome):
+        self.__id = id
+        self.__nome = nome
+
+    @property
+    def id(self):
+        return self.__id
+
+    @property
+    def nome(self):
+        return self.__nome
+
+
+class PessoaAntiga:
+    """Pessoa como era antes dos __slots__"""
+
+    def __init__(self, id, nome, categoria, email, data_nascimento=None, telefone=None):
+        self.__id = id
+        self.__nome = nome
+        self.__email = email
+        self.__data_nascimento = data_nascimento
+        self.__telefone = telefone
+        self.__categoria = categoria
+
+    @property
+    def id(self):
+        return self.__id
+
+    @property
+    def nome(self):
+        return self.__nome
+
+    @property
+    def email(self):
+        return self.__email
+
+    @property
+    def data_nascimento(self):
+        return self.__data_nascimento
+
+    @property
+    def telefone(self):
+        return self.__telefone
+
+    @property
+    def categoria(self):
+        return self.__categoria
+
+
+def criarAntigas(rows):
+    """Conversão anterior: colunas lidas pelo nome em sqlite3.Row, passando pelo __init__"""
+    categorias = {}
+    resultado = []
+    for row in rows:
+        categoriaId = row['categoria_id']
+        categoria = categorias.get(categoriaId)
+        if categoria is None:
+            categoria = categorias[categoriaId] = CategoriaAntiga(categoriaId, row['categoria_nome'])
+        resultado.append(PessoaAntiga(
+            id=row['id'],
+            nome=row['nome'],
+            email=row['email'],
+            data_nascimento=row['data_nascimento'],
+            telefone=row['telefone'],
+            categoria=categoria
+        ))
+    return resultado
+
+
+def gerarBanco(dbPath, linhas):
+    db = DatabaseConnection(dbPath, perfil='bulk-load')
+    try:
+        db.conectar()
+        db.criarTabelas()
+        with db.transacao():
+            cur = db.cursor()
+            cur.executemany("INSERT INTO categoria (nome) VALUES (?);",
+                            [(f"Categoria {i}",) for i in range(5)])
+            cur.executemany(
+                "INSERT INTO pessoa (nome, email, data_nascimento, telefone, categoria_id) VALUES (?, ?, ?, ?, ?);",
+                ((f"Aluno {i:07d}", f"aluno{i}@bench.com", "2000-01-01", "(11) 90000-0000", i % 5 + 1)
+                 for i in range(linhas)))
+    finally:
+        db.fechar()
+
+
+def lerRows(db, tuplas):
+    cur = db.cursor(tuplas=tuplas)
+    cur.execute(PessoaDAO.SELECT_COM_CATEGORIA + " ORDER BY p.nome;")
+    return cur.fetchall()
+
+
+def medirMemoria(db, formato):
+    """Bytes por pessoa materializada (só os objetos, sem as linhas lidas do banco)"""
+    rows = lerRows(db, tuplas=(formato == 'atual'))
+    criar = criarAntigas if formato == 'antes' else PessoaDAO.MAPEADOR.criarTodos
+    gc.collect()
+    tracemalloc.start()
+    objetos = criar(rows)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    quantidade = len(objetos)
+    del objetos, rows
+    return memoria / quantidade
+
+
+def medirListagem(db, formato, repeticoes):
+    """Melhor tempo (s) de listar todas as pessoas: consulta, leitura e criação dos objetos"""
+    pessoaDao = PessoaDAO(db)
+    melhor = None
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        if formato == 'antes':
+            objetos = criarAntigas(lerRows(db, tuplas=False))
+        else:
+            objetos = pessoaDao.listarTodas()
+        duracao = time.perf_counter() - inicio
+        del objetos
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    return melhor
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Memória e velocidade da criação dos objetos do modelo")
+    parser.add_argument('--linhas', type=int, default=1_000_000, help="pessoas no banco sintético")
+    parser.add_argument('--repeticoes', type=int, default=3, help="execuções da listagem por formato")
+    parser.add_argument('--diretorio', default=None, help="diretório do banco temporário")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.diretorio) as diretorio:
+        dbPath = os.path.join(diretorio, 'modelos.db')
+        print(f"Gerando {args.linhas} pessoas...")
+        gerarBanco(dbPath, args.linhas)
+
+        db = DatabaseConnection(dbPath, perfil='balanced')
+        try:
+            db.conectar()
+            resultados = {}
+            for formato in ('antes', 'atual'):
+                bytesPorObjeto = medirMemoria(db, formato)
+                duracao = medirListagem(db, formato, args.repeticoes)
+                resultados[formato] = (bytesPorObjeto, duracao)
+        finally:
+            db.fechar()
+
+    print("=" * 64)
+    print(f"  MATERIALIZAÇÃO DE {args.linhas} PESSOAS (PessoaDAO.listarTodas)")
+    print("=" * 64)
+    print(f"{'Formato':<8} | {'Bytes/objeto':>12} | {'Tempo (s)':>10} | {'Objetos/s':>12}")
+    print("-" * 64)
+    for formato, (bytesPorObjeto, duracao) in resultados.items():
+        print(f"{formato:<8} | {bytesPorObjeto:>12.0f} | {duracao:>10.3f} | {args.linhas / duracao:>12.0f}")
+    print("-" * 64)
+
+    memoriaAntes, tempoAntes = resultados['antes']
+    memoriaAtual, tempoAtual = resultados['atual']
+    print(f"Memória por objeto: {1 - memoriaAtual / memoriaAntes:.0%} menor; "
+          f"listagem {tempoAntes / tempoAtual:.2f}x mais rápida")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark de escrita na tabela pessoa para cada perfil de PRAGMA
+Cada inserção roda em autocommit, como nos serviços interativos
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection, PERFIS_PRAGMA
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+
+
+def medir_perfil(perfil, quantidade, diretorio):
+    """Insere `quantidade` pessoas com o perfil informado e retorna inserções/s"""
+    dbPath = os.path.join(diretorio, f"bench_{perfil}.db")
+    db = DatabaseConnection(dbPath, perfil=perfil)
+
+    try:
+        db.conectar()
+        db.criarTabelas()
+
+        categoria = Categoria(id=None, nome="Aluno")
+        CategoriaDAO(db).salvar(categoria)
+        pessoaDao = PessoaDAO(db)
+
+        inicio = time.perf_counter()
+        for i in range(quantidade):
+            pessoa = Pessoa(
+                id=None,
+                nome=f"Aluno {i}",
+                email=f"aluno{i}@bench.com",
+                categoria=categoria,
+                telefone="(11) 90000-0000"
+            )
+            pessoaDao.salvar(pessoa)
+        duracao = time.perf_counter() - inicio
+    finally:
+        db.fechar()
+
+    return quantidade / duracao, duracao
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Vazão de escrita na tabela pessoa por perfil de PRAGMA")
+    parser.add_argument('--quantidade', type=int, default=2000, help="pessoas inseridas por perfil")
+    parser.add_argument('--perfis', nargs='+', choices=list(PERFIS_PRAGMA), default=list(PERFIS_PRAGMA))
+    parser.add_argument('--diretorio', default=None,
+                        help="diretório dos bancos temporários (use um disco real para medir fsync)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"  BENCHMARK DE PERFIS - {args.quantidade} inserções em autocommit")
+    print("=" * 60)
+    print(f"{'Perfil':<12} | {'Tempo (s)':>10} | {'Inserções/s':>12}")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory(dir=args.diretorio) as diretorio:
+        resultados = {}
+        for perfil in args.perfis:
+            vazao, duracao = medir_perfil(perfil, args.quantidade, diretorio)
+            resultados[perfil] = vazao
+            print(f"{perfil:<12} | {duracao:>10.3f} | {vazao:>12.0f}")
+
+    print("-" * 60)
+    if 'durable' in resultados:
+        base = resultados['durable']
+        for perfil, vazao in resultados.items():
+            if perfil != 'durable':
+                print(f"{perfil}: {vazao / base:.1f}x a vazão do perfil 'durable'")
+
+
+if __name__ == "__main__":
+    main()
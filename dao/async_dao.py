@@ -0,0 +1,173 @@
+"""
+Versões assíncronas dos DAOs, para uso em front ends asyncio
+
+Cada método tem o mesmo nome e os mesmos parâmetros do DAO síncrono e roda
+o SQL em um worker do ExecutorBanco. Os métodos iterar* não têm versão
+assíncrona: use listarPagina para percorrer tabelas grandes.
+"""
+from bd.executor_banco import ExecutorBanco
+from dao.categoria_dao import CategoriaDAO
+from dao.login_dao import LoginDAO
+from dao.nivel_dao import NivelDAO
+from dao.pessoa_dao import PessoaDAO
+from dao.sessao_dao import SessaoDAO
+from dao.turma_dao import TurmaDAO
+
+class AsyncDAO:
+    """Base dos DAOs assíncronos: delega cada chamada ao DAO síncrono em um worker"""
+    daoClass = None
+
+    def __init__(self, executor: ExecutorBanco):
+        self.executor = executor
+        # O DAO síncrono usa o pool do executor, que dá a cada worker sua conexão
+        self.dao = self.daoClass(executor.pool)
+
+    async def chamar(self, metodo: str, *args, **kwargs):
+        return await self.executor.executar(getattr(self.dao, metodo), *args, **kwargs)
+
+    async def salvar(self, entidade):
+        return await self.chamar('salvar', entidade)
+
+    async def deletar(self, entidade):
+        return await self.chamar('deletar', entidade)
+
+
+class AsyncCategoriaDAO(AsyncDAO):
+    daoClass = CategoriaDAO
+
+    async def salvarMuitos(self, categorias):
+        return await self.chamar('salvarMuitos', list(categorias))
+
+    async def buscarPorId(self, id: int):
+        return await self.chamar('buscarPorId', id)
+
+    async def buscarPorNome(self, nome: str):
+        return await self.chamar('buscarPorNome', nome)
+
+    async def listarTodas(self):
+        return await self.chamar('listarTodas')
+
+
+class AsyncNivelDAO(AsyncDAO):
+    daoClass = NivelDAO
+
+    async def salvarMuitos(self, niveis):
+        return await self.chamar('salvarMuitos', list(niveis))
+
+    async def buscarPorId(self, id: int):
+        return await self.chamar('buscarPorId', id)
+
+    async def buscarPorNome(self, nome: str):
+        return await self.chamar('buscarPorNome', nome)
+
+    async def listarTodas(self):
+        return await self.chamar('listarTodas')
+
+
+class AsyncPessoaDAO(AsyncDAO):
+    daoClass = PessoaDAO
+
+    async def salvarMuitos(self, pessoas):
+        return await self.chamar('salvarMuitos', list(pessoas))
+
+    async def buscarPorId(self, id: int):
+        return await self.chamar('buscarPorId', id)
+
+    async def buscarPorNome(self, nome: str):
+        return await self.chamar('buscarPorNome', nome)
+
+    async def emailEmUso(self, email: str, excetoId: int | None = None):
+        return await self.chamar('emailEmUso', email, excetoId)
+
+    async def pesquisar(self, termo: str, limite: int = 50):
+        return await self.chamar('pesquisar', termo, limite)
+
+    async def listarTodas(self):
+        return await self.chamar('listarTodas')
+
+    async def buscarPorCategoria(self, categoriaId: int):
+        return await self.chamar('buscarPorCategoria', categoriaId)
+
+    async def listarPagina(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        return await self.chamar('listarPagina', apos, antes, limite)
+
+    async def listarSemLogin(self):
+        return await self.chamar('listarSemLogin')
+
+    async def listarPaginaSemLogin(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        return await self.chamar('listarPaginaSemLogin', apos, antes, limite)
+
+    def chavePagina(self, pessoa):
+        return self.dao.chavePagina(pessoa)
+
+
+class AsyncTurmaDAO(AsyncDAO):
+    daoClass = TurmaDAO
+
+    async def salvarMuitos(self, turmas):
+        return await self.chamar('salvarMuitos', list(turmas))
+
+    async def buscarPorId(self, id: int):
+        return await self.chamar('buscarPorId', id)
+
+    async def buscarPorProfessor(self, professor: str):
+        return await self.chamar('buscarPorProfessor', professor)
+
+    async def buscarPorNivel(self, nivel_id: int):
+        return await self.chamar('buscarPorNivel', nivel_id)
+
+    async def listarTodas(self):
+        return await self.chamar('listarTodas')
+
+    async def listarPagina(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        return await self.chamar('listarPagina', apos, antes, limite)
+
+    def chavePagina(self, turma):
+        return self.dao.chavePagina(turma)
+
+
+class AsyncLoginDAO(AsyncDAO):
+    daoClass = LoginDAO
+
+    async def salvarMuitos(self, logins):
+        return await self.chamar('salvarMuitos', list(logins))
+
+    async def buscarPorId(self, id: int):
+        return await self.chamar('buscarPorId', id)
+
+    async def buscarPorEmail(self, email: str):
+        return await self.chamar('buscarPorEmail', email)
+
+    async def buscarPorUsuarioId(self, usuario_id: int):
+        return await self.chamar('buscarPorUsuarioId', usuario_id)
+
+    async def listarTodos(self):
+        return await self.chamar('listarTodos')
+
+    async def listarPagina(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        return await self.chamar('listarPagina', apos, antes, limite)
+
+    async def listarComUsuario(self):
+        return await self.chamar('listarComUsuario')
+
+    async def listarPaginaComUsuario(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        return await self.chamar('listarPaginaComUsuario', apos, antes, limite)
+
+    async def emailExiste(self, email: str):
+        return await self.chamar('emailExiste', email)
+
+    def chavePagina(self, login):
+        return self.dao.chavePagina(login)
+
+
+class AsyncSessaoDAO(AsyncDAO):
+    daoClass = SessaoDAO
+
+    async def buscarPorToken(self, token: str):
+        return await self.chamar('buscarPorToken', token)
+
+    async def deletarPorLogin(self, loginId: int):
+        return await self.chamar('deletarPorLogin', loginId)
+
+    async def deletarExpiradas(self, agora: float):
+        return await self.chamar('deletarExpiradas', agora)
@@ -1,12 +1,20 @@
 """
 DAO (Data Access Object) para operações do banco de dados da tabela categoria
 """
-from bd.database import DatabaseConnection
+from bd.cache_entidades import cacheDaTabela
+from bd.database import DatabaseConnection, TAMANHO_LOTE_PADRAO
+from dao.mapeador import Mapeador
 from model.categoria import Categoria
 
 class CategoriaDAO:
+    # Colunas na ordem dos campos do mapeador
+    SELECT_CATEGORIA = "SELECT id, nome FROM categoria"
+    MAPEADOR = Mapeador(Categoria, ('id', 'nome'))
+
     def __init__(self, db: DatabaseConnection):
         self.db = db
+        # Cache de linhas compartilhado por todas as CategoriaDAO do processo
+        self.cache = cacheDaTabela(db, 'categoria')
 
     def salvar(self, categoria: Categoria):
         cur = self.db.cursor()
@@ -18,42 +26,97 @@ class CategoriaDAO:
         else:
             # UPDATE
             cur.execute("UPDATE categoria SET nome = ? WHERE id = ?;", (categoria.nome, categoria.id))
+        self.invalidarCache()
 
         return categoria.id
 
-    def buscarPorId(self, id: int):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM categoria WHERE id = ?;", (id,))
-        row = cur.fetchone()
+    def salvarMuitos(self, categorias):
+        """Salva várias categorias em uma única transação usando executemany"""
+        categorias = list(categorias)
+        novas = [c for c in categorias if c.id is None]
+        existentes = [c for c in categorias if c.id is not None]
 
-        if row:
-            return self.criarDeRow(row)
-        return None
+        with self.db.transacao():
+            cur = self.db.cursor()
+            if novas:
+                cur.executemany("INSERT INTO categoria (nome) VALUES (?);",
+                                ((c.nome,) for c in novas))
+                novosIds = self.db.idsInseridos(len(novas))
+            if existentes:
+                cur.executemany("UPDATE categoria SET nome = ? WHERE id = ?;",
+                                ((c.nome, c.id) for c in existentes))
+
+        # Só com a transação concluída: se ela for desfeita, os objetos continuam sem id
+        if novas:
+            for categoria, novoId in zip(novas, novosIds):
+                categoria.id = novoId
+
+        self.invalidarCache()
+        return [c.id for c in categorias]
+
+    def buscarPorId(self, id: int):
+        return self.buscarComCache(('id', id), " WHERE id = ?;", (id,))
 
     def buscarPorNome(self, nome: str):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM categoria WHERE nome = ?;", (nome,))
+        return self.buscarComCache(('nome', nome), " WHERE nome = ?;", (nome,))
+
+    def buscarComCache(self, chave: tuple, where: str, parametros: tuple):
+        """Busca um registro passando pelo cache de linhas (leitura direta para bancos em memória)"""
+        cache = self.cache
+        if cache is not None:
+            row = cache.obter(self.db, chave)
+            if row is not None:
+                return self.criarDeRow(row)
+            geracao = cache.geracao
+
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_CATEGORIA + where, parametros)
         row = cur.fetchone()
+        if not row:
+            return None
 
-        if row:
-            return self.criarDeRow(row)
-        return None
+        if cache is not None:
+            # A linha é registrada também pelo id, para as buscas por id aproveitarem
+            cache.guardar(self.db, ('id', row[0]), row, geracao)
+            if chave[0] != 'id':
+                cache.guardar(self.db, chave, row, geracao)
+        return self.criarDeRow(row)
 
-    def listarTodas(self):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM categoria ORDER BY nome;")
-        rows = cur.fetchall()
+    def buscarPorIds(self, ids):
+        """Busca vários registros por id com consultas IN (...); retorna {id: Categoria}"""
+        encontrados = {}
+        cache = self.cache
+        if cache is not None:
+            geracao = cache.geracao
+            faltando = []
+            for id in ids:
+                row = cache.obter(self.db, ('id', id))
+                if row is None:
+                    faltando.append(id)
+                else:
+                    encontrados[id] = self.MAPEADOR.criar(row)
+            ids = faltando
+        else:
+            ids = list(ids)
 
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+        cur = self.db.cursor(tuplas=True)
+        for inicio in range(0, len(ids), TAMANHO_LOTE_PADRAO):
+            lote = ids[inicio:inicio + TAMANHO_LOTE_PADRAO]
+            marcadores = ", ".join("?" * len(lote))
+            cur.execute(self.SELECT_CATEGORIA + f" WHERE id IN ({marcadores});", lote)
+            for row in cur.fetchall():
+                if cache is not None:
+                    cache.guardar(self.db, ('id', row[0]), row, geracao)
+                encontrados[row[0]] = self.MAPEADOR.criar(row)
+        return encontrados
+
+    def listarTodas(self):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_CATEGORIA + " ORDER BY nome;")
+        return self.MAPEADOR.criarTodos(cur.fetchall())
 
     def criarDeRow(self, row):
-        return Categoria(
-            id=row['id'],
-            nome=row['nome']
-        )
+        return self.MAPEADOR.criar(row)
 
     def deletar(self, categoria: Categoria):
         if categoria.id is None:
@@ -61,6 +124,12 @@ class CategoriaDAO:
 
         cur = self.db.cursor()
         cur.execute("DELETE FROM categoria WHERE id = ?;", (categoria.id,))
+        self.invalidarCache()
 
         return cur.rowcount > 0
 
+    def invalidarCache(self):
+        """Descarta as categorias guardadas (a tabela é pequena, então invalida tudo)"""
+        if self.cache is not None:
+            # Depois do COMMIT: antes dele outras conexões ainda leem (e guardariam) os dados antigos
+            self.db.aposCommit(self.cache.invalidar)
@@ -1,10 +1,27 @@
 """
 DAO (Data Access Object) para operações de banco de dados da tabela login
 """
-from bd.database import DatabaseConnection
+from collections import namedtuple
+
+from bd.database import DatabaseConnection, TAMANHO_LOTE_PADRAO
+from dao.mapeador import Mapeador
 from model.Login import Login
 
+# Linha leve para listagens: dados do login e do dono, sem hash nem salt
+LoginResumo = namedtuple('LoginResumo', ['id', 'email', 'usuario_id', 'usuario_nome', 'usuario_email'])
+
 class LoginDAO:
+    # Colunas na ordem dos campos do mapeador. O Mapeador não chama o
+    # __init__, então a senha já hasheada no banco não é processada de novo
+    SELECT_LOGIN = "SELECT id, email, senha, salt, usuario_id FROM login"
+    MAPEADOR = Mapeador(Login, ('id', 'email', 'senha', 'salt', 'usuario_id'))
+
+    SELECT_RESUMO = """
+        SELECT l.id, l.email, l.usuario_id, p.nome AS usuario_nome, p.email AS usuario_email
+        FROM login l
+        LEFT JOIN pessoa p ON p.id = l.usuario_id
+    """
+
     def __init__(self, db: DatabaseConnection):
         self.db = db
 
@@ -29,10 +46,37 @@ class LoginDAO:
 
         return login.id
 
+    def salvarMuitos(self, logins):
+        """Salva vários logins em uma única transação usando executemany"""
+        logins = list(logins)
+        novos = [l for l in logins if l.id is None]
+        existentes = [l for l in logins if l.id is not None]
+
+        with self.db.transacao():
+            cur = self.db.cursor()
+            if novos:
+                cur.executemany("""
+                    INSERT INTO login (email, senha, salt, usuario_id)
+                    VALUES (?, ?, ?, ?);
+                """, ((l.email, l.senha, l.salt, l.usuario_id) for l in novos))
+                novosIds = self.db.idsInseridos(len(novos))
+            if existentes:
+                cur.executemany("""
+                    UPDATE login SET email = ?, senha = ?, salt = ?, usuario_id = ?
+                    WHERE id = ?;
+                """, ((l.email, l.senha, l.salt, l.usuario_id, l.id) for l in existentes))
+
+        # Só com a transação concluída: se ela for desfeita, os objetos continuam sem id
+        if novos:
+            for login, novoId in zip(novos, novosIds):
+                login.id = novoId
+
+        return [l.id for l in logins]
+
     def buscarPorId(self, id: int):
         """Busca um login por ID"""
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM login WHERE id = ?;", (id,))
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_LOGIN + " WHERE id = ?;", (id,))
         row = cur.fetchone()
 
         if row:
@@ -41,8 +85,8 @@ class LoginDAO:
 
     def buscarPorEmail(self, email: str):
         """Busca um login por email"""
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM login WHERE email = ?;", (email,))
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_LOGIN + " WHERE email = ?;", (email,))
         row = cur.fetchone()
 
         if row:
@@ -51,8 +95,8 @@ class LoginDAO:
 
     def buscarPorUsuarioId(self, usuario_id: int):
         """Busca um login pelo ID do usuário"""
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM login WHERE usuario_id = ?;", (usuario_id,))
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_LOGIN + " WHERE usuario_id = ?;", (usuario_id,))
         row = cur.fetchone()
 
         if row:
@@ -61,29 +105,82 @@ class LoginDAO:
 
     def listarTodos(self):
         """Lista todos os logins cadastrados"""
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM login ORDER BY email;")
-        rows = cur.fetchall()
-
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_LOGIN + " ORDER BY email;")
+        return self.MAPEADOR.criarTodos(cur.fetchall())
+
+    def listarPagina(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        """
+        Retorna uma página de logins em ORDER BY email usando paginação por chave.
+        `apos`/`antes` recebem a chave (email,) do último/primeiro login da página atual.
+        """
+        cur = self.db.cursor(tuplas=True)
+
+        if antes is not None:
+            cur.execute(self.SELECT_LOGIN + " WHERE email < ? ORDER BY email DESC LIMIT ?;",
+                        (antes[0], limite))
+            logins = self.MAPEADOR.criarTodos(cur.fetchall())
+            logins.reverse()
+            return logins
+
+        if apos is not None:
+            cur.execute(self.SELECT_LOGIN + " WHERE email > ? ORDER BY email LIMIT ?;", (apos[0], limite))
+        else:
+            cur.execute(self.SELECT_LOGIN + " ORDER BY email LIMIT ?;", (limite,))
+        return self.MAPEADOR.criarTodos(cur.fetchall())
+
+    def chavePagina(self, login: Login):
+        """Chave de paginação de um login (ou LoginResumo), para usar em listarPagina"""
+        return (login.email,)
+
+    def iterarTodos(self, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        """Percorre todos os logins lendo `tamanhoLote` linhas por vez com fetchmany"""
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_LOGIN + " ORDER BY email;")
+        criar = self.MAPEADOR.criar
+        while True:
+            rows = cur.fetchmany(tamanhoLote)
+            if not rows:
+                break
+            for row in rows:
+                yield criar(row)
+
+    def listarComUsuario(self):
+        """Lista todos os logins com nome e email do dono em uma única consulta"""
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_RESUMO + " ORDER BY l.email;")
+        return [LoginResumo(*row) for row in cur.fetchall()]
+
+    def iterarComUsuario(self, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_RESUMO + " ORDER BY l.email;")
+        while True:
+            rows = cur.fetchmany(tamanhoLote)
+            if not rows:
+                break
+            for row in rows:
+                yield LoginResumo(*row)
+
+    def listarPaginaComUsuario(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        """Como listarPagina, mas retorna LoginResumo com o nome e email do dono"""
+        cur = self.db.cursor(tuplas=True)
+
+        if antes is not None:
+            cur.execute(self.SELECT_RESUMO + " WHERE l.email < ? ORDER BY l.email DESC LIMIT ?;",
+                        (antes[0], limite))
+            resumos = [LoginResumo(*row) for row in cur.fetchall()]
+            resumos.reverse()
+            return resumos
+
+        if apos is not None:
+            cur.execute(self.SELECT_RESUMO + " WHERE l.email > ? ORDER BY l.email LIMIT ?;", (apos[0], limite))
+        else:
+            cur.execute(self.SELECT_RESUMO + " ORDER BY l.email LIMIT ?;", (limite,))
+        return [LoginResumo(*row) for row in cur.fetchall()]
 
     def criarDeRow(self, row):
-        """Cria um objeto Login a partir de uma row do banco"""
-        # Criar o login sem passar senha no construtor
-        # pois a senha já está hasheada no banco
-        login = object.__new__(Login)
-        
-        # Definir atributos privados diretamente
-        login._Login__id = row['id']
-        login._Login__email = row['email']
-        login._Login__senha = row['senha']
-        login._Login__salt = row['salt']
-        login._Login__usuario_id = row['usuario_id']
-        
-        return login
+        """Cria um objeto Login a partir de uma linha (tupla) do banco"""
+        return self.MAPEADOR.criar(row)
 
     def deletar(self, login: Login):
         """Deleta um login do banco"""
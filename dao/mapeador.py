@@ -0,0 +1,82 @@
+"""
+Conversão de linhas do banco (tuplas) em objetos do modelo
+"""
+
+class Mapeador:
+    """
+    Cria objetos de uma classe do modelo a partir de linhas em tupla.
+
+    `campos` são os atributos na ordem das colunas do SELECT. `relacao`,
+    opcional, é (atributo, ClasseRelacionada, campos) para as últimas colunas
+    da linha, vindas de um JOIN (ex.: categoria_id, categoria_nome); o objeto
+    relacionado é reaproveitado entre linhas pelo dicionário `cache`.
+
+    Com `referencia` (nome do atributo), a última coluna é só o id do objeto
+    relacionado e `cache` deve ser um LoteReferencias: o atributo recebe uma
+    ReferenciaPreguicosa, carregada no primeiro acesso.
+
+    Os modelos declaram __slots__: os atributos ficam em posições fixas, sem
+    um __dict__ por instância, o que deixa cada objeto menor e mais barato de
+    criar. O Mapeador preenche esses slots direto da tupla, sem consultar
+    nomes de coluna nem passar pelo __init__ (que no Login geraria um novo
+    hash de senha).
+    """
+
+    def __init__(self, classe, campos, relacao=None, referencia=None):
+        self.classe = classe
+        self.campos = tuple(campos)
+        self.relacao = relacao
+        self.referencia = referencia
+        self.criar = self._montarCriar()
+
+    def _montarCriar(self):
+        """
+        Gera, uma vez por mapeador, a função criar(row, cache=None) para o
+        formato de linha dele: desempacota a tupla e atribui cada slot direto
+        (obj.nome = ...), sem o laço de setattr por coluna
+        """
+        relacao = self.relacao or (None, None, ())
+        atributo, classeRelacao, camposRelacao = relacao
+        nomes = [*self.campos, *camposRelacao, atributo or '', self.referencia or '']
+        invalidos = [nome for nome in nomes if nome and not nome.isidentifier()]
+        if invalidos:
+            raise ValueError(f"Nomes de atributo inválidos no Mapeador de {self.classe.__name__}: {invalidos}")
+
+        variaveis = [f"_{campo}" for campo in self.campos]
+        corpo = ["    obj = _novo(_classe)"]
+        corpo += [f"    obj.{campo} = _{campo}" for campo in self.campos]
+        ambiente = {'_novo': object.__new__, '_classe': self.classe}
+
+        if self.relacao is not None:
+            # A primeira coluna da relação é o id do objeto relacionado
+            ambiente['_classeRelacao'] = classeRelacao
+            variaveis += [f"_rel_{campo}" for campo in camposRelacao]
+            chave = f"_rel_{camposRelacao[0]}"
+            corpo += [
+                f"    rel = cache.get({chave}) if cache is not None else None",
+                "    if rel is None:",
+                "        rel = _novo(_classeRelacao)",
+                *[f"        rel.{campo} = _rel_{campo}" for campo in camposRelacao],
+                "        if cache is not None:",
+                f"            cache[{chave}] = rel",
+                f"    obj.{atributo} = rel",
+            ]
+        elif self.referencia is not None:
+            variaveis.append("_ref_id")
+            corpo.append(f"    obj.{self.referencia} = cache.referencia(_ref_id)")
+
+        codigo = "\n".join([
+            "def criar(row, cache=None):",
+            f"    {', '.join(variaveis)}, = row",
+            *corpo,
+            "    return obj",
+        ])
+        exec(compile(codigo, f"<mapeador {self.classe.__name__}>", 'exec'), ambiente)
+        return ambiente['criar']
+
+    def criarTodos(self, rows, cache=None):
+        """Converte um resultado inteiro, compartilhando os objetos relacionados"""
+        criar = self.criar
+        if cache is None:
+            cache = {}
+        return [criar(row, cache) for row in rows]
@@ -1,12 +1,20 @@
 """
 DAO (Data Access Object) para operações do banco de dados da tabela nivel
 """
-from bd.database import DatabaseConnection
+from bd.cache_entidades import cacheDaTabela
+from bd.database import DatabaseConnection, TAMANHO_LOTE_PADRAO
+from dao.mapeador import Mapeador
 from model.nivel import Nivel
 
 class NivelDAO:
+    # Colunas na ordem dos campos do mapeador
+    SELECT_NIVEL = "SELECT id, nome FROM nivel"
+    MAPEADOR = Mapeador(Nivel, ('id', 'nome'))
+
     def __init__(self, db: DatabaseConnection):
         self.db = db
+        # Cache de linhas compartilhado por todas as NivelDAO do processo
+        self.cache = cacheDaTabela(db, 'nivel')
 
     def salvar(self, nivel: Nivel):
         cur = self.db.cursor()
@@ -18,42 +26,97 @@ class NivelDAO:
         else:
             # UPDATE
             cur.execute("UPDATE nivel SET nome = ? WHERE id = ?;", (nivel.nome, nivel.id))
+        self.invalidarCache()
 
         return nivel.id
 
-    def buscarPorId(self, id: int):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM nivel WHERE id = ?;", (id,))
-        row = cur.fetchone()
+    def salvarMuitos(self, niveis):
+        """Salva vários níveis em uma única transação usando executemany"""
+        niveis = list(niveis)
+        novos = [n for n in niveis if n.id is None]
+        existentes = [n for n in niveis if n.id is not None]
 
-        if row:
-            return self.criarDeRow(row)
-        return None
+        with self.db.transacao():
+            cur = self.db.cursor()
+            if novos:
+                cur.executemany("INSERT INTO nivel (nome) VALUES (?);",
+                                ((n.nome,) for n in novos))
+                novosIds = self.db.idsInseridos(len(novos))
+            if existentes:
+                cur.executemany("UPDATE nivel SET nome = ? WHERE id = ?;",
+                                ((n.nome, n.id) for n in existentes))
+
+        # Só com a transação concluída: se ela for desfeita, os objetos continuam sem id
+        if novos:
+            for nivel, novoId in zip(novos, novosIds):
+                nivel.id = novoId
+
+        self.invalidarCache()
+        return [n.id for n in niveis]
+
+    def buscarPorId(self, id: int):
+        return self.buscarComCache(('id', id), " WHERE id = ?;", (id,))
 
     def buscarPorNome(self, nome: str):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM nivel WHERE nome = ?;", (nome,))
+        return self.buscarComCache(('nome', nome), " WHERE nome = ?;", (nome,))
+
+    def buscarComCache(self, chave: tuple, where: str, parametros: tuple):
+        """Busca um registro passando pelo cache de linhas (leitura direta para bancos em memória)"""
+        cache = self.cache
+        if cache is not None:
+            row = cache.obter(self.db, chave)
+            if row is not None:
+                return self.criarDeRow(row)
+            geracao = cache.geracao
+
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_NIVEL + where, parametros)
         row = cur.fetchone()
+        if not row:
+            return None
 
-        if row:
-            return self.criarDeRow(row)
-        return None
+        if cache is not None:
+            # A linha é registrada também pelo id, para as buscas por id aproveitarem
+            cache.guardar(self.db, ('id', row[0]), row, geracao)
+            if chave[0] != 'id':
+                cache.guardar(self.db, chave, row, geracao)
+        return self.criarDeRow(row)
 
-    def listarTodas(self):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM nivel ORDER BY nome;")
-        rows = cur.fetchall()
+    def buscarPorIds(self, ids):
+        """Busca vários registros por id com consultas IN (...); retorna {id: Nivel}"""
+        encontrados = {}
+        cache = self.cache
+        if cache is not None:
+            geracao = cache.geracao
+            faltando = []
+            for id in ids:
+                row = cache.obter(self.db, ('id', id))
+                if row is None:
+                    faltando.append(id)
+                else:
+                    encontrados[id] = self.MAPEADOR.criar(row)
+            ids = faltando
+        else:
+            ids = list(ids)
 
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+        cur = self.db.cursor(tuplas=True)
+        for inicio in range(0, len(ids), TAMANHO_LOTE_PADRAO):
+            lote = ids[inicio:inicio + TAMANHO_LOTE_PADRAO]
+            marcadores = ", ".join("?" * len(lote))
+            cur.execute(self.SELECT_NIVEL + f" WHERE id IN ({marcadores});", lote)
+            for row in cur.fetchall():
+                if cache is not None:
+                    cache.guardar(self.db, ('id', row[0]), row, geracao)
+                encontrados[row[0]] = self.MAPEADOR.criar(row)
+        return encontrados
+
+    def listarTodas(self):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_NIVEL + " ORDER BY nome;")
+        return self.MAPEADOR.criarTodos(cur.fetchall())
 
     def criarDeRow(self, row):
-        return Nivel(
-            id=row['id'],
-            nome=row['nome']
-        )
+        return self.MAPEADOR.criar(row)
 
     def deletar(self, nivel: Nivel):
         if nivel.id is None:
@@ -61,6 +124,12 @@ class NivelDAO:
 
         cur = self.db.cursor()
         cur.execute("DELETE FROM nivel WHERE id = ?;", (nivel.id,))
+        self.invalidarCache()
 
         return cur.rowcount > 0
 
+    def invalidarCache(self):
+        """Descarta os níveis guardados (a tabela é pequena, então invalida tudo)"""
+        if self.cache is not None:
+            # Depois do COMMIT: antes dele outras conexões ainda leem (e guardariam) os dados antigos
+            self.db.aposCommit(self.cache.invalidar)
@@ -1,14 +1,62 @@
 """
 DAO (Data Access Object) para operações de banco de dados da tabela pessoa
 """
+import re
 
-from bd.database import DatabaseConnection
+from bd.database import DatabaseConnection, TAMANHO_LOTE_PADRAO
 from dao.categoria_dao import CategoriaDAO
+from dao.mapeador import Mapeador
+from dao.referencia_preguicosa import LoteReferencias, resolverReferencias
+from model.categoria import Categoria
 from model.pessoa import Pessoa
 
 class PessoaDAO:
-    def __init__(self, db: DatabaseConnection):
+    # Pessoa e categoria são lidas juntas em uma única consulta,
+    # evitando uma busca de categoria por linha (N+1)
+    # As colunas seguem a ordem dos campos do MAPEADOR (linhas lidas como tuplas)
+    COLUNAS = "p.id, p.nome, p.email, p.data_nascimento, p.telefone, p.categoria_id, c.nome AS categoria_nome"
+    JOIN_CATEGORIA = "JOIN categoria c ON p.categoria_id = c.id"
+    SELECT_COM_CATEGORIA = f"""
+        SELECT {COLUNAS}
+        FROM pessoa p
+        {JOIN_CATEGORIA}
+    """
+    MAPEADOR = Mapeador(
+        Pessoa,
+        ('id', 'nome', 'email', 'data_nascimento', 'telefone'),
+        relacao=('categoria', Categoria, ('id', 'nome'))
+    )
+
+    # Modo preguiçoso: sem o JOIN, a categoria é uma ReferenciaPreguicosa
+    # carregada só quando algum atributo além do id for usado
+    COLUNAS_PREGUICOSAS = "p.id, p.nome, p.email, p.data_nascimento, p.telefone, p.categoria_id"
+    SELECT_PREGUICOSO = f"""
+        SELECT {COLUNAS_PREGUICOSAS}
+        FROM pessoa p
+    """
+    MAPEADOR_PREGUICOSO = Mapeador(
+        Pessoa,
+        ('id', 'nome', 'email', 'data_nascimento', 'telefone'),
+        referencia='categoria'
+    )
+
+    # Pessoas que ainda não têm login: anti-join apoiado em idx_login_usuario_id
+    CONDICAO_SEM_LOGIN = "NOT EXISTS (SELECT 1 FROM login l WHERE l.usuario_id = p.id)"
+
+    def __init__(self, db: DatabaseConnection, relacoesPreguicosas: bool = False):
         self.db = db
+        self.relacoesPreguicosas = relacoesPreguicosas
+        if relacoesPreguicosas:
+            self.categoriaDao = CategoriaDAO(db)
+            self.colunas = self.COLUNAS_PREGUICOSAS
+            self.joinCategoria = ""
+            self.select = self.SELECT_PREGUICOSO
+            self.mapeador = self.MAPEADOR_PREGUICOSO
+        else:
+            self.colunas = self.COLUNAS
+            self.joinCategoria = self.JOIN_CATEGORIA
+            self.select = self.SELECT_COM_CATEGORIA
+            self.mapeador = self.MAPEADOR
 
     def salvar(self, pessoa: Pessoa):
         cur = self.db.cursor()
@@ -33,9 +81,37 @@ class PessoaDAO:
 
         return pessoa.id
 
+    def salvarMuitos(self, pessoas):
+        """Salva várias pessoas em uma única transação usando executemany"""
+        pessoas = list(pessoas)
+        novas = [p for p in pessoas if p.id is None]
+        existentes = [p for p in pessoas if p.id is not None]
+
+        with self.db.transacao():
+            cur = self.db.cursor()
+            if novas:
+                cur.executemany("""
+                    INSERT INTO pessoa (nome, email, data_nascimento, telefone, categoria_id)
+                    VALUES (?, ?, ?, ?, ?);
+                """, ((p.nome, p.email, p.data_nascimento, p.telefone, p.categoria.id) for p in novas))
+                novosIds = self.db.idsInseridos(len(novas))
+            if existentes:
+                cur.executemany("""
+                    UPDATE pessoa SET nome = ?, email = ?, data_nascimento = ?, telefone = ?, categoria_id = ?
+                    WHERE id = ?;
+                """, ((p.nome, p.email, p.data_nascimento, p.telefone, p.categoria.id, p.id)
+                      for p in existentes))
+
+        # Só com a transação concluída: se ela for desfeita, os objetos continuam sem id
+        if novas:
+            for pessoa, novoId in zip(novas, novosIds):
+                pessoa.id = novoId
+
+        return [p.id for p in pessoas]
+
     def buscarPorId(self, id: int):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM pessoa WHERE id = ?;", (id,))
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " WHERE p.id = ?;", (id,))
         row = cur.fetchone()
 
         if row:
@@ -43,58 +119,175 @@ class PessoaDAO:
         return None
 
     def buscarPorNome(self, nome: str):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " WHERE p.nome LIKE ?;", (f'%{nome}%',))
+        return self.criarDeRows(cur.fetchall())
+
+    def emailEmUso(self, email: str, excetoId: int | None = None):
+        """
+        Retorna o ID da pessoa que já usa o email (sem diferenciar maiúsculas
+        de minúsculas), ignorando a pessoa `excetoId`, ou None se estiver livre
+        """
         cur = self.db.cursor()
-        cur.execute("SELECT * FROM pessoa WHERE nome LIKE ?;", (f'%{nome}%',))
-        rows = cur.fetchall()
+        cur.execute("SELECT id FROM pessoa WHERE email = ? COLLATE NOCASE AND id IS NOT ? LIMIT 1;",
+                    (email, excetoId))
+        row = cur.fetchone()
+        return row['id'] if row else None
 
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+    def emailsEmUso(self, emails):
+        """Dos emails informados, retorna os já cadastrados (como estão no banco), via idx_pessoa_email_nocase"""
+        emails = list(emails)
+        encontrados = set()
+        cur = self.db.cursor(tuplas=True)
+        for inicio in range(0, len(emails), TAMANHO_LOTE_PADRAO):
+            lote = emails[inicio:inicio + TAMANHO_LOTE_PADRAO]
+            marcadores = ", ".join("?" * len(lote))
+            cur.execute(f"SELECT email FROM pessoa WHERE email COLLATE NOCASE IN ({marcadores});", lote)
+            encontrados.update(row[0] for row in cur.fetchall())
+        return encontrados
 
-    def listarTodas(self, comCategoria: bool = False):
-        cur = self.db.cursor()
+    def pesquisar(self, termo: str, limite: int = 50):
+        """
+        Busca pessoas por nome ou email no índice FTS5 (pessoa_fts).
+        Cada palavra do termo vale como prefixo ("mar sil" encontra "Maria Silva")
+        e o resultado vem ordenado por relevância (bm25).
+        """
+        consulta = self.montarConsultaFts(termo)
+        if not consulta:
+            return []
 
-        if comCategoria:
-            cur.execute("""
-                SELECT p.*, c.nome as categoria_nome
-                FROM pessoa p
-                JOIN categoria c ON p.categoria_id = c.id
-                ORDER BY p.nome;
-            """)
-        else:
-            cur.execute("SELECT * FROM pessoa ORDER BY nome;")
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(f"""
+            SELECT {self.colunas}
+            FROM pessoa_fts f
+            JOIN pessoa p ON p.id = f.rowid
+            {self.joinCategoria}
+            WHERE pessoa_fts MATCH ?
+            ORDER BY f.rank
+            LIMIT ?;
+        """, (consulta, limite))
+        return self.criarDeRows(cur.fetchall())
+
+    @staticmethod
+    def montarConsultaFts(termo: str):
+        """Converte o texto digitado em uma consulta FTS5 de prefixos (todas as palavras)"""
+        # Só letras e números viram tokens, então não há sintaxe FTS5 vinda do usuário
+        palavras = re.findall(r'\w+', termo)
+        return " ".join(f'"{palavra}"*' for palavra in palavras)
 
-        rows = cur.fetchall()
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+    def listarTodas(self):
+        """Lista todas as pessoas em ordem de nome, já com a categoria (mesma consulta)"""
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " ORDER BY p.nome;")
+        return self.criarDeRows(cur.fetchall())
 
     def buscarPorCategoria(self, categoriaId: int):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM pessoa WHERE categoria_id = ? ORDER BY nome;", (categoriaId,))
-        rows = cur.fetchall()
-
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
-
-    def criarDeRow(self, row):
-        # Buscar a categoria usando o CategoriaDAO
-        categoriaDao = CategoriaDAO(self.db)
-        categoria = categoriaDao.buscarPorId(row['categoria_id'])
-
-        return Pessoa(
-            id=row['id'],
-            nome=row['nome'],
-            email=row['email'],
-            data_nascimento=row['data_nascimento'],
-            telefone=row['telefone'],
-            categoria=categoria
-
-        )
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " WHERE p.categoria_id = ? ORDER BY p.nome;", (categoriaId,))
+        return self.criarDeRows(cur.fetchall())
+
+    def listarPagina(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        """
+        Retorna uma página de pessoas em ORDER BY nome, id usando paginação por chave.
+        `apos` é a chave (nome, id) da última pessoa da página atual (próxima página)
+        e `antes` a da primeira (página anterior). Cada busca custa O(limite),
+        independente de quão longe a página está do início.
+        """
+        return self.buscarPagina(None, apos, antes, limite)
+
+    def buscarPagina(self, condicao: str | None, apos: tuple | None, antes: tuple | None, limite: int):
+        """Paginação por chave (nome, id) com uma condição SQL extra opcional"""
+        filtros = [condicao] if condicao else []
+        parametros = []
+
+        if antes is not None:
+            filtros.append("(p.nome, p.id) < (?, ?)")
+            parametros.extend(antes)
+            ordem = "p.nome DESC, p.id DESC"
+        else:
+            if apos is not None:
+                filtros.append("(p.nome, p.id) > (?, ?)")
+                parametros.extend(apos)
+            ordem = "p.nome, p.id"
+
+        where = " WHERE " + " AND ".join(filtros) if filtros else ""
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + where + f" ORDER BY {ordem} LIMIT ?;", (*parametros, limite))
+        pessoas = self.criarDeRows(cur.fetchall())
+
+        if antes is not None:
+            pessoas.reverse()
+        return pessoas
+
+    def chavePagina(self, pessoa: Pessoa):
+        """Chave de paginação de uma pessoa, para usar em listarPagina"""
+        return (pessoa.nome, pessoa.id)
+
+    def iterarTodas(self, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        """Percorre todas as pessoas sem carregar a tabela inteira na memória"""
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " ORDER BY p.nome;")
+        return self.iterarRows(cur, tamanhoLote)
+
+    def iterarPorNome(self, nome: str, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " WHERE p.nome LIKE ?;", (f'%{nome}%',))
+        return self.iterarRows(cur, tamanhoLote)
+
+    def iterarPorCategoria(self, categoriaId: int, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " WHERE p.categoria_id = ? ORDER BY p.nome;", (categoriaId,))
+        return self.iterarRows(cur, tamanhoLote)
+
+    def listarSemLogin(self):
+        """Lista as pessoas sem login cadastrado em uma única consulta"""
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + f" WHERE {self.CONDICAO_SEM_LOGIN} ORDER BY p.nome;")
+        return self.criarDeRows(cur.fetchall())
+
+    def iterarSemLogin(self, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + f" WHERE {self.CONDICAO_SEM_LOGIN} ORDER BY p.nome;")
+        return self.iterarRows(cur, tamanhoLote)
+
+    def listarPaginaSemLogin(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        """Como listarPagina, mas apenas pessoas sem login"""
+        return self.buscarPagina(self.CONDICAO_SEM_LOGIN, apos, antes, limite)
+
+    def iterarRows(self, cur, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        """Gera as pessoas do cursor lendo `tamanhoLote` linhas por vez com fetchmany"""
+        criar = self.mapeador.criar
+        categorias = self.novoCache()
+        while True:
+            rows = cur.fetchmany(tamanhoLote)
+            if not rows:
+                break
+            for row in rows:
+                yield criar(row, categorias)
+
+    def novoCache(self):
+        """
+        Categorias compartilhadas pelas linhas de um resultado: um dicionário
+        para as lidas no JOIN ou um lote de referências preguiçosas
+        """
+        if self.relacoesPreguicosas:
+            return LoteReferencias(self.categoriaDao.buscarPorIds)
+        return {}
+
+    def criarDeRows(self, rows):
+        """Cria as pessoas de um resultado, compartilhando as instâncias de Categoria"""
+        return self.mapeador.criarTodos(rows, self.novoCache())
+
+    def criarDeRow(self, row, categorias=None):
+        # A categoria vem das colunas do JOIN; o dicionário permite
+        # reaproveitar a mesma instância entre linhas do mesmo resultado
+        if categorias is None and self.relacoesPreguicosas:
+            categorias = self.novoCache()
+        return self.mapeador.criar(row, categorias)
+
+    def carregarCategorias(self, pessoas):
+        """Resolve de uma vez as categorias ainda pendentes (modo preguiçoso)"""
+        return resolverReferencias(pessoas, 'categoria')
 
     def deletar(self, pessoa: Pessoa):
         cur = self.db.cursor()
@@ -0,0 +1,88 @@
+"""
+Referências preguiçosas para objetos relacionados (Pessoa.categoria, Turma.nivel)
+
+Nas consultas sem JOIN, o DAO guarda no atributo da relação uma
+ReferenciaPreguicosa com apenas o id. O objeto é lido do banco no primeiro
+acesso a qualquer outro atributo e, nesse momento, todas as referências
+pendentes do mesmo resultado são resolvidas juntas, em uma consulta IN (...).
+"""
+
+# Marca as referências cujo id não existe mais no banco
+_AUSENTE = object()
+
+
+class ReferenciaPreguicosa:
+    """Substituto do objeto relacionado; o id é conhecido sem consultar o banco"""
+    __slots__ = ('id', '_lote', '_alvo')
+
+    def __init__(self, id: int, lote: 'LoteReferencias'):
+        self.id = id
+        self._lote = lote
+        self._alvo = None
+
+    @property
+    def carregada(self):
+        return self._alvo is not None
+
+    def carregar(self):
+        """Retorna o objeto real, resolvendo antes todas as referências pendentes do lote"""
+        if self._alvo is None:
+            self._lote.resolver()
+        if self._alvo is _AUSENTE:
+            raise LookupError(f"Registro {self.id} referenciado não existe mais")
+        return self._alvo
+
+    def __getattr__(self, nome):
+        # Só é chamado para atributos que não são slots da referência (ex.: nome)
+        return getattr(self.carregar(), nome)
+
+    def __setattr__(self, nome, valor):
+        if nome in ReferenciaPreguicosa.__slots__:
+            object.__setattr__(self, nome, valor)
+        else:
+            setattr(self.carregar(), nome, valor)
+
+    def __str__(self):
+        return str(self.carregar())
+
+    def __repr__(self):
+        estado = "carregada" if self.carregada else "pendente"
+        return f"<ReferenciaPreguicosa id={self.id} {estado}>"
+
+
+class LoteReferencias:
+    """
+    Referências de um mesmo resultado, uma por id. `carregar(ids)` recebe os
+    ids pendentes e retorna {id: objeto} (ex.: CategoriaDAO.buscarPorIds).
+    """
+
+    def __init__(self, carregar):
+        self.carregar = carregar
+        self.referencias = {}
+
+    def referencia(self, id: int):
+        referencia = self.referencias.get(id)
+        if referencia is None:
+            referencia = self.referencias[id] = ReferenciaPreguicosa(id, self)
+        return referencia
+
+    def resolver(self):
+        """Carrega de uma vez todas as referências ainda pendentes"""
+        pendentes = [id for id, referencia in self.referencias.items() if referencia._alvo is None]
+        if not pendentes:
+            return
+        objetos = self.carregar(pendentes)
+        for id in pendentes:
+            self.referencias[id]._alvo = objetos.get(id, _AUSENTE)
+
+
+def resolverReferencias(objetos, atributo: str):
+    """Resolve as referências preguiçosas de `atributo` em uma lista de objetos (uma consulta por lote)"""
+    lotes = {}
+    for objeto in objetos:
+        referencia = getattr(objeto, atributo)
+        if isinstance(referencia, ReferenciaPreguicosa) and not referencia.carregada:
+            lotes[id(referencia._lote)] = referencia._lote
+    for lote in lotes.values():
+        lote.resolver()
+    return objetos
@@ -0,0 +1,57 @@
+"""
+DAO (Data Access Object) para operações de banco de dados da tabela sessao
+"""
+from bd.database import DatabaseConnection
+from dao.mapeador import Mapeador
+from model.sessao import Sessao, hashToken
+
+class SessaoDAO:
+    """
+    A tabela guarda só o SHA-256 do token (token_hash): quem lê o banco não
+    consegue se passar pelos usuários. As buscas recebem o token e o devolvem
+    na Sessao.
+    """
+    SELECT_SESSAO = "SELECT ?, login_id, usuario_id, criada_em, expira_em FROM sessao"
+    MAPEADOR = Mapeador(Sessao, ('token', 'login_id', 'usuario_id', 'criada_em', 'expira_em'))
+
+    def __init__(self, db: DatabaseConnection):
+        self.db = db
+
+    def salvar(self, sessao: Sessao):
+        """Grava a sessão (ou renova a expiração de uma já existente)"""
+        cur = self.db.cursor()
+        cur.execute("""
+            INSERT INTO sessao (token_hash, login_id, usuario_id, criada_em, expira_em)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (token_hash) DO UPDATE SET expira_em = excluded.expira_em;
+        """, (hashToken(sessao.token), sessao.login_id, sessao.usuario_id, sessao.criada_em, sessao.expira_em))
+        return sessao.token
+
+    def buscarPorToken(self, token: str):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.SELECT_SESSAO + " WHERE token_hash = ?;", (token, hashToken(token)))
+        row = cur.fetchone()
+
+        if row:
+            return self.criarDeRow(row)
+        return None
+
+    def criarDeRow(self, row):
+        return self.MAPEADOR.criar(row)
+
+    def deletar(self, token: str):
+        cur = self.db.cursor()
+        cur.execute("DELETE FROM sessao WHERE token_hash = ?;", (hashToken(token),))
+        return cur.rowcount > 0
+
+    def deletarPorLogin(self, loginId: int):
+        """Encerra todas as sessões de um login (ex.: após troca de senha)"""
+        cur = self.db.cursor()
+        cur.execute("DELETE FROM sessao WHERE login_id = ?;", (loginId,))
+        return cur.rowcount
+
+    def deletarExpiradas(self, agora: float):
+        """Remove as sessões vencidas usando o índice de expiração; retorna quantas"""
+        cur = self.db.cursor()
+        cur.execute("DELETE FROM sessao WHERE expira_em <= ?;", (agora,))
+        return cur.rowcount
@@ -1,14 +1,69 @@
 """
 DAO (Data Access Object) para operações de banco de dados da tabela turma
 """
-from bd.database import DatabaseConnection
+from bd.database import DatabaseConnection, TAMANHO_LOTE_PADRAO
+from dao.mapeador import Mapeador
 from dao.nivel_dao import NivelDAO
+from dao.referencia_preguicosa import LoteReferencias, resolverReferencias
+from model.nivel import Nivel
 from model.turma import Turma
 
 class TurmaDAO:
-    def __init__(self, db: DatabaseConnection):
+    # Turma e nível são lidos juntos em uma única consulta,
+    # evitando uma busca de nível por linha (N+1)
+    # As colunas seguem a ordem dos campos do MAPEADOR (linhas lidas como tuplas)
+    COLUNAS = "t.id, t.horario, t.professor, t.nivel_id, n.nome AS nivel_nome"
+    JOIN_NIVEL = "JOIN nivel n ON t.nivel_id = n.id"
+    SELECT_COM_NIVEL = f"""
+        SELECT {COLUNAS}
+        FROM turma t
+        {JOIN_NIVEL}
+    """
+
+    # Busca por substring do professor através do índice de trigramas.
+    # CROSS JOIN fixa o FTS como laço externo: com estatísticas do ANALYZE o
+    # planejador preferia varrer nivel/turma e repetir o LIKE a cada linha
+    SELECT_POR_PROFESSOR = f"""
+        SELECT {COLUNAS}
+        FROM turma_professor_fts f
+        CROSS JOIN turma t ON t.id = f.rowid
+        {JOIN_NIVEL}
+        WHERE f.professor LIKE ?;
+    """
+
+    MAPEADOR = Mapeador(
+        Turma,
+        ('id', 'horario', 'professor'),
+        relacao=('nivel', Nivel, ('id', 'nome'))
+    )
+
+    # Modo preguiçoso: sem o JOIN, o nível é uma ReferenciaPreguicosa
+    # carregada só quando algum atributo além do id for usado
+    COLUNAS_PREGUICOSAS = "t.id, t.horario, t.professor, t.nivel_id"
+    SELECT_PREGUICOSO = f"""
+        SELECT {COLUNAS_PREGUICOSAS}
+        FROM turma t
+    """
+    SELECT_POR_PROFESSOR_PREGUICOSO = f"""
+        SELECT {COLUNAS_PREGUICOSAS}
+        FROM turma_professor_fts f
+        CROSS JOIN turma t ON t.id = f.rowid
+        WHERE f.professor LIKE ?;
+    """
+    MAPEADOR_PREGUICOSO = Mapeador(Turma, ('id', 'horario', 'professor'), referencia='nivel')
+
+    def __init__(self, db: DatabaseConnection, relacoesPreguicosas: bool = False):
         self.db = db
-        self.nivelDao = NivelDAO(db)
+        self.relacoesPreguicosas = relacoesPreguicosas
+        if relacoesPreguicosas:
+            self.nivelDao = NivelDAO(db)
+            self.select = self.SELECT_PREGUICOSO
+            self.selectPorProfessor = self.SELECT_POR_PROFESSOR_PREGUICOSO
+            self.mapeador = self.MAPEADOR_PREGUICOSO
+        else:
+            self.select = self.SELECT_COM_NIVEL
+            self.selectPorProfessor = self.SELECT_POR_PROFESSOR
+            self.mapeador = self.MAPEADOR
 
     def salvar(self, turma: Turma):
         cur = self.db.cursor()
@@ -31,9 +86,36 @@ class TurmaDAO:
 
         return turma.id
 
+    def salvarMuitos(self, turmas):
+        """Salva várias turmas em uma única transação usando executemany"""
+        turmas = list(turmas)
+        novas = [t for t in turmas if t.id is None]
+        existentes = [t for t in turmas if t.id is not None]
+
+        with self.db.transacao():
+            cur = self.db.cursor()
+            if novas:
+                cur.executemany(
+                    "INSERT INTO turma (horario, nivel_id, professor) VALUES (?, ?, ?);",
+                    ((t.horario, t.nivel.id, t.professor) for t in novas)
+                )
+                novosIds = self.db.idsInseridos(len(novas))
+            if existentes:
+                cur.executemany(
+                    "UPDATE turma SET horario = ?, nivel_id = ?, professor = ? WHERE id = ?;",
+                    ((t.horario, t.nivel.id, t.professor, t.id) for t in existentes)
+                )
+
+        # Só com a transação concluída: se ela for desfeita, os objetos continuam sem id
+        if novas:
+            for turma, novoId in zip(novas, novosIds):
+                turma.id = novoId
+
+        return [t.id for t in turmas]
+
     def buscarPorId(self, id: int):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM turma WHERE id = ?;", (id,))
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " WHERE t.id = ?;", (id,))
         row = cur.fetchone()
 
         if row:
@@ -41,45 +123,100 @@ class TurmaDAO:
         return None
 
     def buscarPorProfessor(self, professor: str):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM turma WHERE professor LIKE ?;", (f'%{professor}%',))
-        rows = cur.fetchall()
-
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.selectPorProfessor, (f'%{professor}%',))
+        return self.criarDeRows(cur.fetchall())
 
     def buscarPorNivel(self, nivel_id: int):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM turma WHERE nivel_id = ?;", (nivel_id,))
-        rows = cur.fetchall()
-
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " WHERE t.nivel_id = ?;", (nivel_id,))
+        return self.criarDeRows(cur.fetchall())
 
     def listarTodas(self):
-        cur = self.db.cursor()
-        cur.execute("SELECT * FROM turma ORDER BY nivel_id, horario;")
-        rows = cur.fetchall()
-
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
-
-    def criarDeRow(self, row):
-        # Buscar o nível usando o NivelDAO
-        nivel = self.nivelDao.buscarPorId(row['nivel_id'])
-        
-        return Turma(
-            id=row['id'],
-            horario=row['horario'],
-            nivel=nivel,
-            professor=row['professor']
-        )
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " ORDER BY t.nivel_id, t.horario;")
+        return self.criarDeRows(cur.fetchall())
+
+    def listarPagina(self, apos: tuple | None = None, antes: tuple | None = None, limite: int = 50):
+        """
+        Retorna uma página de turmas em ORDER BY nivel_id, horario, id usando
+        paginação por chave. `apos`/`antes` recebem a chave (nivel_id, horario, id)
+        da última/primeira turma da página atual.
+        """
+        cur = self.db.cursor(tuplas=True)
+
+        if antes is not None:
+            cur.execute(self.select + """
+                WHERE (t.nivel_id, t.horario, t.id) < (?, ?, ?)
+                ORDER BY t.nivel_id DESC, t.horario DESC, t.id DESC LIMIT ?;
+            """, (*antes, limite))
+            turmas = self.criarDeRows(cur.fetchall())
+            turmas.reverse()
+            return turmas
+
+        if apos is not None:
+            cur.execute(self.select + """
+                WHERE (t.nivel_id, t.horario, t.id) > (?, ?, ?)
+                ORDER BY t.nivel_id, t.horario, t.id LIMIT ?;
+            """, (*apos, limite))
+        else:
+            cur.execute(self.select + " ORDER BY t.nivel_id, t.horario, t.id LIMIT ?;", (limite,))
+        return self.criarDeRows(cur.fetchall())
+
+    def chavePagina(self, turma: Turma):
+        """Chave de paginação de uma turma, para usar em listarPagina"""
+        return (turma.nivel.id, turma.horario, turma.id)
+
+    def iterarTodas(self, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        """Percorre todas as turmas sem carregar a tabela inteira na memória"""
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " ORDER BY t.nivel_id, t.horario;")
+        return self.iterarRows(cur, tamanhoLote)
+
+    def iterarPorProfessor(self, professor: str, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.selectPorProfessor, (f'%{professor}%',))
+        return self.iterarRows(cur, tamanhoLote)
+
+    def iterarPorNivel(self, nivel_id: int, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        cur = self.db.cursor(tuplas=True)
+        cur.execute(self.select + " WHERE t.nivel_id = ?;", (nivel_id,))
+        return self.iterarRows(cur, tamanhoLote)
+
+    def iterarRows(self, cur, tamanhoLote: int = TAMANHO_LOTE_PADRAO):
+        """Gera as turmas do cursor lendo `tamanhoLote` linhas por vez com fetchmany"""
+        criar = self.mapeador.criar
+        niveis = self.novoCache()
+        while True:
+            rows = cur.fetchmany(tamanhoLote)
+            if not rows:
+                break
+            for row in rows:
+                yield criar(row, niveis)
+
+    def novoCache(self):
+        """
+        Níveis compartilhados pelas linhas de um resultado: um dicionário
+        para os lidos no JOIN ou um lote de referências preguiçosas
+        """
+        if self.relacoesPreguicosas:
+            return LoteReferencias(self.nivelDao.buscarPorIds)
+        return {}
+
+    def criarDeRows(self, rows):
+        """Cria as turmas de um resultado, compartilhando as instâncias de Nivel"""
+        return self.mapeador.criarTodos(rows, self.novoCache())
+
+    def criarDeRow(self, row, niveis=None):
+        # O nível vem das colunas do JOIN; o dicionário permite
+        # reaproveitar a mesma instância entre linhas do mesmo resultado
+        if niveis is None and self.relacoesPreguicosas:
+            niveis = self.novoCache()
+        return self.mapeador.criar(row, niveis)
+
+    def carregarNiveis(self, turmas):
+        """Resolve de uma vez os níveis ainda pendentes (modo preguiçoso)"""
+        return resolverReferencias(turmas, 'nivel')
 
     def deletar(self, turma: Turma):
         if turma.id is None:
@@ -1,77 +1,49 @@
-import hashlib
 import os
 
+from model.senha_hasher import obterHasherPadrao, verificarSenha, precisaAtualizar
+
 class Login:
-    def __init__(self, id, email, senha, usuario_id):
-        self.__id = id
-        self.__email = email
-        self.__usuario_id = usuario_id
-        self.__salt = os.urandom(16)  # Gera um salt aleatório de 16 bytes 
-        self.__senha = self.gerar_hash_senha(senha) 
-    
-    @property
-    def id(self):
-        return self.__id
-    
-    @id.setter
-    def id(self, value):
-        self.__id = value
+    __slots__ = ('id', 'email', 'senha', 'salt', 'usuario_id')
 
-    @property
-    def email(self):
-        return self.__email
-    
-    @email.setter
-    def email(self, value):
-        self.__email = value
+    def __init__(self, id, email, senha, usuario_id, gerar_hash=None):
+        self.id = id
+        self.email = email
+        self.usuario_id = usuario_id
+        self.salt = os.urandom(16)  # Gera um salt aleatório de 16 bytes 
+        self.senha = self.gerar_hash_senha(senha, gerar_hash)
 
-    @property
-    def senha(self):
-        return self.__senha
-    
-    @senha.setter
-    def senha(self, value):
-        self.__senha = value
-    
-    @property
-    def salt(self):
-        return self.__salt
-    
-    @salt.setter
-    def salt(self, value):
-        self.__salt = value
-    
-    @property
-    def usuario_id(self):
-        return self.__usuario_id
-    
-    @usuario_id.setter
-    def usuario_id(self, value):
-        self.__usuario_id = value
-
-    # Método para gerar o hash da senha
-    def gerar_hash_senha(self, senha):
-        senha_salt = self.__salt + senha.encode('utf-8')
-        hash_senha = hashlib.sha256(senha_salt).hexdigest()
-        return hash_senha
-    
-    # Método para verificar a senha fornecida com o hash armazenado
+    # Método para gerar o hash da senha com o algoritmo padrão (ver model/senha_hasher.py).
+    # gerar_hash(senha, salt) permite calcular o KDF em outro lugar, ex.: VerificadorSenhas.gerarHash
+    def gerar_hash_senha(self, senha, gerar_hash=None):
+        if gerar_hash is not None:
+            return gerar_hash(senha, self.salt)
+        return obterHasherPadrao().gerar(senha, self.salt)
+    
+    # Método para verificar a senha fornecida com o hash armazenado,
+    # usando o algoritmo e o custo com que ele foi gerado
     def verificar_senha(self, senha_digitada):
-        senha_salt = self.__salt + senha_digitada.encode('utf-8')
-        hash_digitado = hashlib.sha256(senha_salt).hexdigest()
-        return hash_digitado == self.__senha
+        return verificarSenha(self.senha, self.salt, senha_digitada)
+
+    # Indica se o hash é legado ou usa parâmetros diferentes do padrão atual
+    def precisa_rehash(self):
+        return precisaAtualizar(self.senha)
+
+    # Regera salt e hash com o algoritmo padrão (atualização silenciosa após um login válido)
+    def atualizar_hash(self, senha, gerar_hash=None):
+        self.salt = os.urandom(16)
+        self.senha = self.gerar_hash_senha(senha, gerar_hash)
     
     def autenticar_login(self, email_digitado, senha_digitada):
-        if self.__email == email_digitado and self.verificar_senha(senha_digitada):
+        if self.email == email_digitado and self.verificar_senha(senha_digitada):
             print("Login realizado com sucesso!")
             return True
         else:
             print("Erro ao fazer login. Tente novamente.")
             return False
     
-    def trocar_senha(self, nova_senha):
-        self.__salt = os.urandom(16)  # Gerar novo salt ao trocar senha
-        self.__senha = self.gerar_hash_senha(nova_senha)
+    def trocar_senha(self, nova_senha, gerar_hash=None):
+        self.salt = os.urandom(16)  # Gerar novo salt ao trocar senha
+        self.senha = self.gerar_hash_senha(nova_senha, gerar_hash)
         print("Senha alterada com sucesso!")
 
     def __str__(self):
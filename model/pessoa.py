@@ -1,68 +1,33 @@
 """
 Classe modelo para a tabela pessoa
 """
+import re
+
 from model.categoria import Categoria
 
+# nome@dominio.tld, sem espaços; o mesmo critério vale na CLI, na API e na importação
+_EMAIL_VALIDO = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def emailValido(email) -> bool:
+    """Indica se o email tem a forma nome@dominio.tld"""
+    return isinstance(email, str) and _EMAIL_VALIDO.fullmatch(email) is not None
+
+
 class Pessoa:
+    __slots__ = ('id', 'nome', 'email', 'data_nascimento', 'telefone', 'categoria')
+
     def __init__(self, id: int, nome: str, categoria: Categoria, email: str,
                  data_nascimento: str | None = None,
                  telefone: str | None = None):
-        self.__id = id
-        self.__nome = nome
-        self.__email = email
-        self.__data_nascimento = data_nascimento
-        self.__telefone = telefone
-        self.__categoria = categoria
-
-    @property
-    def id(self):
-        return self.__id
-    
-    @id.setter
-    def id(self, value):
-        self.__id = value
-
-    @property
-    def nome(self):
-        return self.__nome
-    
-    @nome.setter
-    def nome(self, value):
-        self.__nome = value
-    
-    @property
-    def email(self):
-        return self.__email
-    
-    @email.setter
-    def email(self, value):
-        self.__email = value
-
-    @property
-    def data_nascimento(self):
-        return self.__data_nascimento
-    
-    @data_nascimento.setter
-    def data_nascimento(self, value):
-        self.__data_nascimento = value
+        self.id = id
+        self.nome = nome
+        self.email = email
+        self.data_nascimento = data_nascimento
+        self.telefone = telefone
+        self.categoria = categoria
 
-    @property
-    def telefone(self):
-        return self.__telefone
-    
-    @telefone.setter
-    def telefone(self, value):
-        self.__telefone = value
-    
-    @property
-    def categoria(self):
-        return self.__categoria
-    
-    @categoria.setter
-    def categoria(self, value):
-        self.__categoria = value
-    
     def __str__(self):
         return (f"Pessoa(id={self.id}, nome='{self.nome}', "
                 f"email='{self.email}', "
-                f"categoria_id={self.categoria.id})")
\ No newline at end of file
+                f"categoria_id={self.categoria.id})")
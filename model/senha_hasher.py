@@ -0,0 +1,124 @@
+"""
+Algoritmos de hash de senha (KDF) usados pelo modelo Login
+
+Os hashes são gravados em login.senha no formato 'algoritmo$parametros$hash',
+então cada login sabe com qual algoritmo e custo foi gerado. Hashes antigos
+(sha256 de uma rodada, só o hex) continuam sendo verificados e são
+identificados como legados para serem atualizados no próximo login.
+"""
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+
+
+class SenhaHasher(ABC):
+    """Interface dos algoritmos de hash de senha"""
+    algoritmo = None
+
+    def parametros(self):
+        """Parâmetros de custo no formato 'chave=valor,...'"""
+        return ""
+
+    def prefixo(self):
+        return f"{self.algoritmo}${self.parametros()}$"
+
+    @abstractmethod
+    def derivar(self, senha: str, salt: bytes):
+        """Bytes derivados da senha com o salt"""
+
+    def gerar(self, senha: str, salt: bytes):
+        """Gera o hash codificado da senha"""
+        return self.prefixo() + self.derivar(senha, salt).hex()
+
+    def verificar(self, senha: str, salt: bytes, codificado: str):
+        # compare_digest evita vazar, pelo tempo de resposta, quantos caracteres bateram
+        return hmac.compare_digest(self.gerar(senha, salt), codificado)
+
+    @classmethod
+    def deParametros(cls, parametros: str):
+        """Cria o hasher a partir da parte de parâmetros de um hash codificado"""
+        valores = dict(item.split('=', 1) for item in parametros.split(',') if item)
+        return cls(**{chave: int(valor) for chave, valor in valores.items()})
+
+
+class Pbkdf2Hasher(SenhaHasher):
+    algoritmo = 'pbkdf2_sha256'
+
+    def __init__(self, iteracoes: int = 600_000):
+        self.iteracoes = iteracoes
+
+    def parametros(self):
+        return f"iteracoes={self.iteracoes}"
+
+    def derivar(self, senha: str, salt: bytes):
+        return hashlib.pbkdf2_hmac('sha256', senha.encode('utf-8'), salt, self.iteracoes)
+
+
+class ScryptHasher(SenhaHasher):
+    algoritmo = 'scrypt'
+
+    def __init__(self, n: int = 2 ** 14, r: int = 8, p: int = 1):
+        self.n = n
+        self.r = r
+        self.p = p
+
+    def parametros(self):
+        return f"n={self.n},r={self.r},p={self.p}"
+
+    def derivar(self, senha: str, salt: bytes):
+        # maxmem precisa cobrir 128 * n * r bytes, senão o OpenSSL recusa
+        return hashlib.scrypt(senha.encode('utf-8'), salt=salt, n=self.n, r=self.r, p=self.p,
+                              maxmem=256 * self.n * self.r, dklen=32)
+
+
+class Sha256LegadoHasher(SenhaHasher):
+    """Formato antigo: sha256(salt + senha) em hex, sem prefixo"""
+    algoritmo = 'sha256'
+
+    def prefixo(self):
+        return ""
+
+    def derivar(self, senha: str, salt: bytes):
+        return hashlib.sha256(salt + senha.encode('utf-8')).digest()
+
+
+HASHERS = {
+    Pbkdf2Hasher.algoritmo: Pbkdf2Hasher,
+    ScryptHasher.algoritmo: ScryptHasher,
+}
+
+_hasherPadrao = ScryptHasher()
+
+
+def obterHasherPadrao():
+    """Hasher usado para gerar novos hashes"""
+    return _hasherPadrao
+
+
+def definirHasherPadrao(hasher: SenhaHasher):
+    """Troca o algoritmo/custo dos novos hashes; os antigos são atualizados no próximo login"""
+    global _hasherPadrao
+    _hasherPadrao = hasher
+
+
+def hasherDe(codificado: str):
+    """Retorna o hasher que gerou um hash codificado"""
+    if '$' not in codificado:
+        return Sha256LegadoHasher()
+
+    algoritmo, parametros, _ = codificado.split('$', 2)
+    if algoritmo not in HASHERS:
+        raise ValueError(f"Algoritmo de hash de senha desconhecido: '{algoritmo}'")
+    return HASHERS[algoritmo].deParametros(parametros)
+
+
+def verificarSenha(codificado: str, salt: bytes, senha: str):
+    """Verifica a senha contra o hash codificado (função de módulo para rodar em workers)"""
+    return hasherDe(codificado).verificar(senha, salt, codificado)
+
+
+def precisaAtualizar(codificado: str):
+    """Indica se o hash foi gerado com outro algoritmo ou custo que não o padrão atual"""
+    if '$' not in codificado:
+        return True
+    return not codificado.startswith(_hasherPadrao.prefixo())
@@ -0,0 +1,30 @@
+"""
+Classe modelo para a tabela sessao
+"""
+import hashlib
+import time
+
+
+def hashToken(token: str):
+    """SHA-256 do token: o banco nunca guarda o token que dá acesso à sessão"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class Sessao:
+    __slots__ = ('token', 'login_id', 'usuario_id', 'criada_em', 'expira_em')
+
+    def __init__(self, token: str, login_id: int, usuario_id: int, criada_em: float, expira_em: float):
+        self.token = token
+        self.login_id = login_id
+        self.usuario_id = usuario_id
+        self.criada_em = criada_em
+        self.expira_em = expira_em
+
+    def expirada(self, agora: float | None = None):
+        if agora is None:
+            agora = time.time()
+        return agora >= self.expira_em
+
+    def __str__(self):
+        return (f"Sessao(login_id={self.login_id}, usuario_id={self.usuario_id}, "
+                f"expira_em={time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.expira_em))})")
@@ -0,0 +1,46 @@
+"""
+Fixtures comuns: cada teste usa um banco novo em tmp_path
+"""
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Os módulos de app/ importam uns aos outros pelo nome (ex.: from verificador_senhas import ...)
+sys.path.insert(0, os.path.join(RAIZ, 'app'))
+sys.path.insert(0, RAIZ)
+
+from bd.connection_pool import ConnectionPool
+from bd.database import DatabaseConnection
+from dao.categoria_dao import CategoriaDAO
+from model.categoria import Categoria
+
+
+@pytest.fixture
+def caminhoBanco(tmp_path):
+    return str(tmp_path / 'teste.db')
+
+
+@pytest.fixture
+def db(caminhoBanco):
+    db = DatabaseConnection(caminhoBanco)
+    db.criarTabelas()
+    yield db
+    db.fechar()
+
+
+@pytest.fixture
+def pool(caminhoBanco):
+    pool = ConnectionPool(caminhoBanco, tamanho=4, timeout=5)
+    with pool.conexao():
+        pool.criarTabelas()
+    yield pool
+    pool.fechar()
+
+
+@pytest.fixture
+def categoria(db):
+    categoria = Categoria(id=None, nome="Aluno")
+    CategoriaDAO(db).salvar(categoria)
+    return categoria
@@ -0,0 +1,70 @@
+"""
+DAOs assíncronos sobre o ExecutorBanco
+"""
+import asyncio
+
+import pytest
+
+from bd.executor_banco import ExecutorBanco
+from dao.async_dao import AsyncCategoriaDAO, AsyncPessoaDAO, AsyncNivelDAO, AsyncTurmaDAO
+from dao.categoria_dao import CategoriaDAO
+from model.categoria import Categoria
+from model.nivel import Nivel
+from model.pessoa import Pessoa
+from model.turma import Turma
+
+
+def test_operacoes_concorrentes(caminhoBanco):
+    async def cenario():
+        async with ExecutorBanco(caminhoBanco, maxWorkers=3) as executor:
+            executor.criarTabelas()
+            categoriaDao = AsyncCategoriaDAO(executor)
+            pessoaDao = AsyncPessoaDAO(executor)
+
+            categoria = Categoria(id=None, nome="Aluno")
+            await categoriaDao.salvar(categoria)
+            pessoas = [Pessoa(id=None, nome=f"Pessoa {i}", email=f"p{i}@escola.com", categoria=categoria)
+                       for i in range(6)]
+            ids = await asyncio.gather(*(pessoaDao.salvar(p) for p in pessoas))
+            encontradas = await asyncio.gather(*(pessoaDao.buscarPorId(id) for id in ids))
+            pagina = await pessoaDao.listarPagina(limite=4)
+            return ids, encontradas, pagina
+
+    ids, encontradas, pagina = asyncio.run(cenario())
+    assert len(set(ids)) == 6
+    assert [p.id for p in encontradas] == list(ids)
+    assert all(p.categoria.nome == "Aluno" for p in encontradas)
+    assert [p.nome for p in pagina] == [f"Pessoa {i}" for i in range(4)]
+
+
+def test_salvar_muitos_e_relacoes(caminhoBanco):
+    async def cenario():
+        async with ExecutorBanco(caminhoBanco, maxWorkers=2) as executor:
+            executor.criarTabelas()
+            nivel = Nivel(id=None, nome="Básico")
+            await AsyncNivelDAO(executor).salvar(nivel)
+            turmaDao = AsyncTurmaDAO(executor)
+            turmas = [Turma(id=None, horario=f"Seg {h}h", nivel=nivel, professor="Carlos") for h in (18, 19, 20)]
+            await turmaDao.salvarMuitos(turmas)
+            return turmas, await turmaDao.buscarPorNivel(nivel.id)
+
+    turmas, porNivel = asyncio.run(cenario())
+    assert all(t.id is not None for t in turmas)
+    assert sorted(t.id for t in porNivel) == sorted(t.id for t in turmas)
+    assert {t.nivel.nome for t in porNivel} == {"Básico"}
+
+
+def test_executar_em_transacao_desfaz_tudo_na_falha(caminhoBanco):
+    def salvarDuas(pool):
+        dao = CategoriaDAO(pool)
+        dao.salvar(Categoria(id=None, nome="Aluno"))
+        dao.salvar(Categoria(id=None, nome="Aluno"))
+
+    async def cenario():
+        async with ExecutorBanco(caminhoBanco, maxWorkers=2) as executor:
+            executor.criarTabelas()
+            with pytest.raises(Exception):
+                await executor.executarEmTransacao(salvarDuas, executor.pool)
+            return await AsyncCategoriaDAO(executor).listarTodas()
+
+    assert asyncio.run(cenario()) == []
@@ -0,0 +1,86 @@
+"""
+Cache de linhas de categoria/nivel: acertos e invalidação
+"""
+import pytest
+
+from bd.database import DatabaseConnection
+from dao.categoria_dao import CategoriaDAO
+from dao.nivel_dao import NivelDAO
+from model.categoria import Categoria
+from model.nivel import Nivel
+
+
+def test_busca_repetida_vem_do_cache_com_objeto_novo(db, categoria):
+    dao = CategoriaDAO(db)
+    primeira = dao.buscarPorId(categoria.id)
+    acertos = dao.cache.acertos
+    segunda = dao.buscarPorId(categoria.id)
+
+    assert dao.cache.acertos == acertos + 1
+    assert segunda.nome == "Aluno"
+    assert segunda is not primeira
+
+
+def test_salvar_invalida_o_cache(db, categoria):
+    dao = CategoriaDAO(db)
+    categoria = dao.buscarPorId(categoria.id)
+    assert dao.buscarPorNome("Aluno") is not None
+
+    categoria.nome = "Estudante"
+    dao.salvar(categoria)
+    assert dao.buscarPorId(categoria.id).nome == "Estudante"
+    assert dao.buscarPorNome("Aluno") is None
+
+
+def test_deletar_invalida_o_cache(db):
+    dao = NivelDAO(db)
+    nivel = Nivel(id=None, nome="Básico")
+    dao.salvar(nivel)
+    assert dao.buscarPorId(nivel.id) is not None
+
+    dao.deletar(nivel)
+    assert dao.buscarPorId(nivel.id) is None
+
+
+def test_commit_de_outra_conexao_invalida_o_cache(db, categoria, caminhoBanco, monkeypatch):
+    dao = CategoriaDAO(db)
+    # Sem o intervalo mínimo entre verificações de PRAGMA data_version
+    monkeypatch.setattr(dao.cache, 'intervaloVerificacao', 0)
+    assert dao.buscarPorId(categoria.id).nome == "Aluno"
+
+    outro = DatabaseConnection(caminhoBanco)
+    try:
+        outro.cursor().execute("UPDATE categoria SET nome = 'Estudante' WHERE id = ?;", (categoria.id,))
+    finally:
+        outro.fechar()
+    assert dao.buscarPorId(categoria.id).nome == "Estudante"
+
+
+def test_leitura_dentro_de_transacao_nao_vai_para_o_cache(db, categoria):
+    dao = CategoriaDAO(db)
+    with pytest.raises(RuntimeError):
+        with db.transacao():
+            db.cursor().execute("UPDATE categoria SET nome = 'Rascunho' WHERE id = ?;", (categoria.id,))
+            assert dao.buscarPorId(categoria.id).nome == "Rascunho"
+            raise RuntimeError("falha")
+    assert dao.buscarPorId(categoria.id).nome == "Aluno"
+
+
+def test_limpar_dados_invalida_o_cache(db, categoria):
+    dao = CategoriaDAO(db)
+    assert dao.buscarPorId(categoria.id) is not None
+    db.limparDados()
+    assert dao.buscarPorId(categoria.id) is None
+    assert dao.listarTodas() == []
+
+
+def test_banco_em_memoria_nao_usa_cache():
+    db = DatabaseConnection(':memory:')
+    try:
+        db.criarTabelas()
+        dao = CategoriaDAO(db)
+        dao.salvar(Categoria(id=None, nome="Aluno"))
+        assert dao.cache is None
+        assert dao.buscarPorNome("Aluno").nome == "Aluno"
+    finally:
+        db.fechar()
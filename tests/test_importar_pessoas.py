@@ -0,0 +1,107 @@
+"""
+ImportadorPessoas: validação das linhas, lotes e gravação uma a uma
+"""
+import json
+
+import pytest
+
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+from importar_pessoas import ImportadorPessoas
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+
+
+@pytest.fixture
+def rejeicoes():
+    return []
+
+
+@pytest.fixture
+def importador(db, categoria, rejeicoes):
+    return ImportadorPessoas(db, tamanhoLote=3, aoRejeitar=lambda numero, mensagem: rejeicoes.append(numero))
+
+
+def escreverCsv(caminho, linhas):
+    caminho.write_text("nome,email,categoria\n" + "".join(f"{linha}\n" for linha in linhas), encoding='utf-8')
+    return str(caminho)
+
+
+def test_importa_em_lotes_e_rejeita_linhas_invalidas(importador, rejeicoes, tmp_path, db):
+    arquivo = escreverCsv(tmp_path / 'pessoas.csv', [
+        "Ana,ana@escola.com,Aluno",
+        "Bia,bia@escola.com,aluno",          # categoria sem diferenciar maiúsculas
+        ",sem.nome@escola.com,Aluno",        # linha 4: nome vazio
+        "Caio,email-invalido,Aluno",         # linha 5
+        "Duda,duda@escola.com,Inexistente",  # linha 6
+        "Eva,ANA@escola.com,Aluno",          # linha 7: email repetido no arquivo
+        "Fabi,fabi@escola.com,Aluno",
+    ])
+    resultado = importador.importar(arquivo)
+
+    assert (resultado.lidas, resultado.importadas, resultado.rejeitadas) == (7, 3, 4)
+    assert rejeicoes == [4, 5, 6, 7]
+    assert sorted(p.nome for p in PessoaDAO(db).listarTodas()) == ["Ana", "Bia", "Fabi"]
+
+
+def test_jsonl(importador, tmp_path, db):
+    arquivo = tmp_path / 'pessoas.jsonl'
+    arquivo.write_text("\n".join(json.dumps(r) for r in [
+        {'nome': "Ana", 'email': "ana@escola.com", 'categoria': "Aluno", 'data_nascimento': "2000-01-31"},
+        {'nome': "Bia", 'email': "bia@escola.com", 'categoria': "Aluno", 'data_nascimento': "31/01/2000"},
+    ]), encoding='utf-8')
+    resultado = importador.importar(str(arquivo))
+
+    assert (resultado.importadas, resultado.rejeitadas) == (1, 1)
+    assert PessoaDAO(db).buscarPorNome("Ana")[0].data_nascimento == "2000-01-31"
+
+
+def test_categorias_que_so_diferem_na_caixa(importador, rejeicoes, tmp_path, db, categoria):
+    outra = Categoria(id=None, nome="aluno")
+    CategoriaDAO(db).salvar(outra)
+    CategoriaDAO(db).salvar(Categoria(id=None, nome="Professor"))
+    arquivo = escreverCsv(tmp_path / 'pessoas.csv', [
+        "Ana,ana@escola.com,Aluno",
+        "Bia,bia@escola.com,aluno",
+        "Caio,caio@escola.com,ALUNO",          # linha 4: ambígua
+        "Duda,duda@escola.com,professor",
+    ])
+    resultado = importador.importar(arquivo)
+
+    assert (resultado.importadas, rejeicoes) == (3, [4])
+    dao = PessoaDAO(db)
+    assert dao.buscarPorNome("Ana")[0].categoria.id == categoria.id
+    assert dao.buscarPorNome("Bia")[0].categoria.id == outra.id
+    assert dao.buscarPorNome("Duda")[0].categoria.nome == "Professor"
+
+
+def test_conflito_no_lote_grava_uma_a_uma(importador, rejeicoes, tmp_path, db, categoria, monkeypatch):
+    # Outra conexão grava um dos emails depois da verificação do lote
+    PessoaDAO(db).salvar(Pessoa(id=None, nome="Bia", email="bia@escola.com", categoria=categoria))
+    monkeypatch.setattr(importador.pessoaDao, 'emailsEmUso', lambda emails: [])
+
+    arquivo = escreverCsv(tmp_path / 'pessoas.csv', [
+        "Ana,ana@escola.com,Aluno",
+        "Outra Bia,bia@escola.com,Aluno",  # linha 3
+        "Caio,caio@escola.com,Aluno",
+    ])
+    resultado = importador.importar(arquivo)
+
+    assert (resultado.importadas, resultado.rejeitadas) == (2, 1)
+    assert rejeicoes == [3]
+    assert sorted(p.nome for p in PessoaDAO(db).listarTodas()) == ["Ana", "Bia", "Caio"]
+
+
+def test_indexar_no_fim_reconstroi_a_busca(db, categoria, tmp_path):
+    PessoaDAO(db).salvar(Pessoa(id=None, nome="Zeca Antigo", email="zeca@escola.com", categoria=categoria))
+    arquivo = escreverCsv(tmp_path / 'pessoas.csv', [f"Aluno {i},aluno{i}@escola.com,Aluno" for i in range(10)])
+
+    resultado = ImportadorPessoas(db, tamanhoLote=4, indexarNoFim=True).importar(arquivo)
+
+    dao = PessoaDAO(db)
+    assert resultado.importadas == 10
+    assert [p.nome for p in dao.pesquisar("aluno7")] == ["Aluno 7"]
+    assert [p.nome for p in dao.pesquisar("zeca")] == ["Zeca Antigo"]
+    # Os triggers voltaram: uma pessoa nova entra no índice na hora
+    dao.salvar(Pessoa(id=None, nome="Nova", email="nova@escola.com", categoria=categoria))
+    assert [p.nome for p in dao.pesquisar("nova")] == ["Nova"]
@@ -0,0 +1,49 @@
+"""
+salvarMuitos: ids atribuídos só depois do COMMIT
+"""
+import sqlite3
+
+import pytest
+
+from dao.pessoa_dao import PessoaDAO
+from model.pessoa import Pessoa
+
+
+def novaPessoa(categoria, i):
+    return Pessoa(id=None, nome=f"Pessoa {i}", email=f"pessoa{i}@escola.com", categoria=categoria)
+
+
+def test_ids_seguem_a_ordem_da_lista(db, categoria):
+    dao = PessoaDAO(db)
+    pessoas = [novaPessoa(categoria, i) for i in range(5)]
+    ids = dao.salvarMuitos(pessoas)
+
+    assert ids == [p.id for p in pessoas]
+    assert len(set(ids)) == 5
+    for pessoa in pessoas:
+        assert dao.buscarPorId(pessoa.id).email == pessoa.email
+
+
+def test_novas_e_existentes_na_mesma_chamada(db, categoria):
+    dao = PessoaDAO(db)
+    existente = novaPessoa(categoria, 0)
+    dao.salvar(existente)
+    existente.nome = "Nome novo"
+    nova = novaPessoa(categoria, 1)
+
+    dao.salvarMuitos([existente, nova])
+    assert nova.id is not None and nova.id != existente.id
+    assert dao.buscarPorId(existente.id).nome == "Nome novo"
+
+
+def test_falha_deixa_os_objetos_sem_id(db, categoria):
+    dao = PessoaDAO(db)
+    dao.salvar(novaPessoa(categoria, 0))
+    # A última repete o email da pessoa já gravada
+    pessoas = [novaPessoa(categoria, 1), novaPessoa(categoria, 2), novaPessoa(categoria, 0)]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        dao.salvarMuitos(pessoas)
+    assert [p.id for p in pessoas] == [None, None, None]
+    assert len(dao.listarTodas()) == 1
+
@@ -0,0 +1,136 @@
+"""
+API HTTP/JSON: autenticação, CRUD, paginação e limites do corpo
+"""
+import http.client
+import threading
+
+import pytest
+
+from carga_http import ClienteApi, criarLoginCarga
+from servidor_http import TAMANHO_CORPO_MAXIMO, criarServidor
+
+
+@pytest.fixture
+def servidor(pool):
+    with pool.conexao():
+        credenciais = criarLoginCarga(pool)
+    servidor = criarServidor(pool, porta=0, silencioso=True)
+    servidor.credenciais = credenciais
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+    servidor.api.verificador.fechar()
+
+
+@pytest.fixture
+def cliente(servidor):
+    cliente = ClienteApi(*servidor.server_address[:2])
+    cliente.autenticar(*servidor.credenciais)
+    yield cliente
+    cliente.fechar()
+
+
+def requisicaoCrua(servidor, metodo, caminho, cabecalhos):
+    conexao = http.client.HTTPConnection(*servidor.server_address[:2], timeout=10)
+    try:
+        conexao.putrequest(metodo, caminho)
+        for nome, valor in cabecalhos.items():
+            conexao.putheader(nome, valor)
+        conexao.endheaders()
+        resposta = conexao.getresponse()
+        resposta.read()
+        return resposta
+    finally:
+        conexao.close()
+
+
+def test_escrita_sem_sessao_e_recusada(servidor):
+    anonimo = ClienteApi(*servidor.server_address[:2])
+    try:
+        status, dados = anonimo.requisitar('POST', '/categorias', {'nome': "Aluno"})
+        assert status == 401
+        # Leituras públicas continuam abertas
+        assert anonimo.requisitar('GET', '/categorias')[0] == 200
+    finally:
+        anonimo.fechar()
+
+    resposta = requisicaoCrua(servidor, 'POST', '/categorias', {'Content-Length': '0'})
+    assert resposta.status == 401
+    assert resposta.getheader('WWW-Authenticate') == 'Bearer'
+
+
+def test_senha_errada(servidor):
+    email, _ = servidor.credenciais
+    anonimo = ClienteApi(*servidor.server_address[:2])
+    try:
+        assert anonimo.requisitar('POST', '/sessoes', {'email': email, 'senha': "errada"})[0] == 401
+    finally:
+        anonimo.fechar()
+
+
+def test_crud_de_categoria(cliente):
+    status, categoria = cliente.requisitar('POST', '/categorias', {'nome': "Aluno"})
+    assert status == 201
+    caminho = f"/categorias/{categoria['id']}"
+
+    assert cliente.requisitar('POST', '/categorias', {'nome': "Aluno"})[0] == 409
+    assert cliente.requisitar('PUT', caminho, {'nome': "Estudante"}) == (200, {'id': categoria['id'], 'nome': "Estudante"})
+    assert cliente.requisitar('GET', caminho)[1]['nome'] == "Estudante"
+    assert cliente.requisitar('DELETE', caminho)[0] == 204
+    assert cliente.requisitar('GET', caminho)[0] == 404
+
+
+def test_paginacao_de_pessoas(cliente):
+    _, categoria = cliente.requisitar('POST', '/categorias', {'nome': "Aluno"})
+    for i in range(5):
+        status, _ = cliente.requisitar('POST', '/pessoas', {
+            'nome': f"Pessoa {i}", 'email': f"pessoa{i}@escola.com", 'categoria_id': categoria['id'],
+        })
+        assert status == 201
+
+    nomes = []
+    status, pagina = cliente.requisitar('GET', '/pessoas?limite=2')
+    paginas = [pagina]
+    while pagina['proxima']:
+        status, pagina = cliente.requisitar('GET', f"/pessoas?limite=2&apos={pagina['proxima']}")
+        paginas.append(pagina)
+    for pagina in paginas:
+        nomes += [p['nome'] for p in pagina['itens']]
+
+    # 5 pessoas e o dono do login da carga, em ordem de nome
+    assert len(nomes) == 6 and nomes == sorted(nomes)
+    assert paginas[0]['anterior'] is None
+
+    status, voltando = cliente.requisitar('GET', f"/pessoas?limite=2&antes={paginas[-1]['anterior']}")
+    assert voltando['itens'] == paginas[-2]['itens']
+
+
+def test_login_criado_pela_api_abre_sessao(cliente, servidor):
+    _, categoria = cliente.requisitar('POST', '/categorias', {'nome': "Aluno"})
+    _, pessoa = cliente.requisitar('POST', '/pessoas', {
+        'nome': "Bia", 'email': "bia@escola.com", 'categoria_id': categoria['id'],
+    })
+    status, login = cliente.requisitar('POST', '/logins', {'usuario_id': pessoa['id'], 'senha': "segredo"})
+    assert status == 201
+    assert cliente.requisitar('POST', '/logins', {'usuario_id': pessoa['id'], 'senha': "outra"})[0] == 409
+
+    novo = ClienteApi(*servidor.server_address[:2])
+    try:
+        token = novo.autenticar("bia@escola.com", "segredo")
+        assert novo.requisitar('GET', f"/sessoes/{token}")[1]['login_id'] == login['id']
+        assert novo.requisitar('DELETE', f"/sessoes/{token}")[0] == 204
+        assert novo.requisitar('POST', '/categorias', {'nome': "Professor"})[0] == 401
+    finally:
+        novo.fechar()
+
+
+@pytest.mark.parametrize('contentLength, status', [
+    ('abc', 400),
+    ('-1', 400),
+    (str(TAMANHO_CORPO_MAXIMO + 1), 413),
+])
+def test_content_length_invalido(servidor, contentLength, status):
+    resposta = requisicaoCrua(servidor, 'POST', '/sessoes', {'Content-Length': contentLength})
+    assert resposta.status == status
+    assert resposta.getheader('Connection') == 'close'
@@ -0,0 +1,88 @@
+"""
+GerenciadorSessoes: expiração, revogação e token guardado só como hash
+"""
+import time
+
+import pytest
+
+from bd.database import DatabaseConnection
+from dao.login_dao import LoginDAO
+from dao.pessoa_dao import PessoaDAO
+from gerenciador_sessoes import GerenciadorSessoes
+from model.Login import Login
+from model.pessoa import Pessoa
+from model.sessao import hashToken
+
+
+@pytest.fixture
+def login(db, categoria):
+    pessoa = Pessoa(id=None, nome="Ana", email="ana@escola.com", categoria=categoria)
+    PessoaDAO(db).salvar(pessoa)
+    login = Login(id=None, email=pessoa.email, senha="segredo", usuario_id=pessoa.id)
+    LoginDAO(db).salvar(login)
+    return login
+
+
+def test_sessao_valida_ate_expirar(db, login):
+    sessoes = GerenciadorSessoes(db, ttl=0.2)
+    sessao = sessoes.criarSessao(login)
+
+    validada = sessoes.validarSessao(sessao.token)
+    assert validada is not None and validada.login_id == login.id
+    time.sleep(0.25)
+    assert sessoes.validarSessao(sessao.token) is None
+    assert sessoes.validarSessao("token-desconhecido") is None
+
+
+def test_banco_guarda_so_o_hash_do_token(db, login):
+    sessao = GerenciadorSessoes(db).criarSessao(login)
+    guardados = [row[0] for row in db.cursor().execute("SELECT token_hash FROM sessao;")]
+
+    assert guardados == [hashToken(sessao.token)]
+    # Outro gerenciador (sem cache) encontra a sessão pelo token apresentado
+    validada = GerenciadorSessoes(db).validarSessao(sessao.token)
+    assert validada.token == sessao.token
+
+
+def test_encerrar_sessao(db, login):
+    sessoes = GerenciadorSessoes(db)
+    sessao = sessoes.criarSessao(login)
+    assert sessoes.encerrarSessao(sessao.token)
+    assert sessoes.validarSessao(sessao.token) is None
+
+
+def test_revogacao_por_outro_processo_vale_depois_de_revalidar(db, login, caminhoBanco):
+    sessoes = GerenciadorSessoes(db, revalidarApos=0.2)
+    sessao = sessoes.criarSessao(login)
+    assert sessoes.validarSessao(sessao.token) is not None
+
+    # Ex.: troca de senha pela CLI, com outra conexão e outro cache
+    outro = DatabaseConnection(caminhoBanco)
+    try:
+        assert GerenciadorSessoes(outro).encerrarSessoesDoLogin(login.id) == 1
+    finally:
+        outro.fechar()
+
+    time.sleep(0.25)
+    assert sessoes.validarSessao(sessao.token) is None
+
+
+def test_varredura_remove_as_expiradas(db, login):
+    sessoes = GerenciadorSessoes(db, ttl=0.1)
+    sessoes.criarSessao(login)
+    time.sleep(0.15)
+    GerenciadorSessoes(db).criarSessao(login)
+
+    assert sessoes.varrerExpiradas() == 1
+    assert db.cursor().execute("SELECT count(*) FROM sessao;").fetchone()[0] == 1
+
+
+def test_tabela_no_formato_antigo_e_recriada(caminhoBanco):
+    db = DatabaseConnection(caminhoBanco)
+    try:
+        db.cursor().execute("CREATE TABLE sessao (token TEXT PRIMARY KEY, login_id INTEGER);")
+        db.criarTabelas()
+        colunas = [row[1] for row in db.cursor().execute("PRAGMA table_info(sessao);")]
+        assert 'token_hash' in colunas and 'token' not in colunas
+    finally:
+        db.fechar()
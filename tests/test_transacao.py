@@ -0,0 +1,89 @@
+"""
+DatabaseConnection.transacao(): commit, rollback, savepoints e aposCommit
+"""
+import sqlite3
+
+import pytest
+
+from dao.categoria_dao import CategoriaDAO
+from model.categoria import Categoria
+
+
+def nomesCategorias(db):
+    return sorted(c.nome for c in CategoriaDAO(db).listarTodas())
+
+
+def test_transacao_commita_no_fim_do_bloco(db):
+    with db.transacao():
+        CategoriaDAO(db).salvar(Categoria(id=None, nome="Aluno"))
+        CategoriaDAO(db).salvar(Categoria(id=None, nome="Professor"))
+    assert nomesCategorias(db) == ["Aluno", "Professor"]
+    assert not db.conectar().in_transaction
+
+
+def test_excecao_desfaz_a_transacao_inteira(db):
+    with pytest.raises(RuntimeError):
+        with db.transacao():
+            CategoriaDAO(db).salvar(Categoria(id=None, nome="Aluno"))
+            raise RuntimeError("falha")
+    assert nomesCategorias(db) == []
+    assert not db.conectar().in_transaction
+
+
+def test_savepoint_desfaz_so_o_bloco_interno(db):
+    dao = CategoriaDAO(db)
+    with db.transacao():
+        dao.salvar(Categoria(id=None, nome="Aluno"))
+        with pytest.raises(sqlite3.IntegrityError):
+            with db.transacao():
+                dao.salvar(Categoria(id=None, nome="Professor"))
+                # nome é UNIQUE: o SAVEPOINT é desfeito, o bloco externo continua
+                dao.salvar(Categoria(id=None, nome="Aluno"))
+        dao.salvar(Categoria(id=None, nome="Administrador"))
+    assert nomesCategorias(db) == ["Administrador", "Aluno"]
+
+
+def test_excecao_no_bloco_interno_nao_tratada_desfaz_tudo(db):
+    with pytest.raises(RuntimeError):
+        with db.transacao():
+            CategoriaDAO(db).salvar(Categoria(id=None, nome="Aluno"))
+            with db.transacao():
+                raise RuntimeError("falha")
+    assert nomesCategorias(db) == []
+
+
+def test_apos_commit_roda_so_depois_do_commit_externo(db):
+    chamadas = []
+    with db.transacao():
+        with db.transacao():
+            db.aposCommit(lambda: chamadas.append(db.conectar().in_transaction))
+        assert chamadas == []
+    assert chamadas == [False]
+
+    with pytest.raises(RuntimeError):
+        with db.transacao():
+            db.aposCommit(lambda: chamadas.append("desfeita"))
+            raise RuntimeError("falha")
+    assert chamadas == [False]
+
+
+def test_commit_que_falha_desfaz_e_libera_a_conexao(db, caminhoBanco):
+    conn = db.conectar()
+    conn.execute("PRAGMA busy_timeout = 50;")
+    # Um leitor com a transação aberta impede o COMMIT no journal_mode DELETE
+    leitor = sqlite3.connect(caminhoBanco, isolation_level=None)
+    try:
+        leitor.execute("BEGIN;")
+        leitor.execute("SELECT count(*) FROM categoria;").fetchone()
+        with pytest.raises(sqlite3.OperationalError):
+            with db.transacao():
+                CategoriaDAO(db).salvar(Categoria(id=None, nome="Aluno"))
+        assert not conn.in_transaction
+        leitor.execute("COMMIT;")
+    finally:
+        leitor.close()
+
+    # A conexão volta a aceitar transações, e nada da que falhou foi gravado
+    with db.transacao():
+        CategoriaDAO(db).salvar(Categoria(id=None, nome="Professor"))
+    assert nomesCategorias(db) == ["Professor"]